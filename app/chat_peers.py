@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, FrozenSet, Optional, Set
+
+from app.db import list_users
+from app.match_graph import MatchGraph
+
+
+class ChatPeerAllowlist:
+    """Which users may chat with each other: a pair qualifies when either profile
+    has the other in its top-k matches.
+
+    The table is rebuilt only when the graph version moves, in two steps:
+    refresh() derives profile neighbours from the graph (no database access,
+    so callers can run it off the DB executor), and the first lookup after it
+    maps them to user ids with one list_users() query. Registration always
+    upserts a profile, so new users bump the graph version too. Authorizing a
+    message is then a set membership check.
+    """
+
+    def __init__(self, top_k: int = 4) -> None:
+        self.top_k = top_k
+        self._lock = threading.Lock()
+        self._graph_version: Optional[int] = None
+        self._users_version: Optional[int] = None
+        self._neighbours: Dict[str, Set[str]] = {}
+        self._by_profile: Dict[str, FrozenSet[str]] = {}
+        self.rebuilds = 0
+
+    def _refresh_neighbours(self, graph: MatchGraph) -> None:
+        version, ranked = graph.matches(top_k=self.top_k)
+        neighbours: Dict[str, Set[str]] = {}
+        for source_id, rows in ranked.items():
+            for row in rows:
+                neighbours.setdefault(source_id, set()).add(row["target_id"])
+                neighbours.setdefault(row["target_id"], set()).add(source_id)
+        self._neighbours = neighbours
+        self._graph_version = version
+        self._users_version = None
+        self.rebuilds += 1
+
+    def refresh(self, graph: MatchGraph) -> None:
+        """Recompute match neighbours if the graph version moved."""
+        with self._lock:
+            if self._graph_version != graph.version:
+                self._refresh_neighbours(graph)
+
+    def _peers_of_profile(self, graph: MatchGraph, profile_id: str) -> FrozenSet[str]:
+        with self._lock:
+            if self._graph_version != graph.version:
+                self._refresh_neighbours(graph)
+            if self._users_version != self._graph_version:
+                profile_to_user = {u["profile_id"]: u["id"] for u in list_users()}
+                self._by_profile = {
+                    profile_id: frozenset(profile_to_user[peer] for peer in peers if peer in profile_to_user)
+                    for profile_id, peers in self._neighbours.items()
+                }
+                self._users_version = self._graph_version
+            return self._by_profile.get(profile_id, frozenset())
+
+    def allowed_peer_ids(self, graph: MatchGraph, user: Dict[str, Any]) -> Set[str]:
+        profile_id = user.get("profile_id", "")
+        if not profile_id:
+            return set()
+        return set(self._peers_of_profile(graph, profile_id) - {user["id"]})
+
+    def is_allowed(self, graph: MatchGraph, user: Dict[str, Any], peer_user_id: str) -> bool:
+        profile_id = user.get("profile_id", "")
+        if not profile_id or peer_user_id == user["id"]:
+            return False
+        return peer_user_id in self._peers_of_profile(graph, profile_id)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._graph_version = None
+            self._users_version = None
@@ -3,7 +3,10 @@ from __future__ import annotations
 import json
 import os
 import re
-from typing import Any, Dict, List, Optional
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, List, Optional, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.parse import quote, urlparse
 from urllib.request import Request, urlopen
@@ -44,15 +47,30 @@ def _result(
     }
 
 
-def _http_get_json(url: str, headers: Optional[Dict[str, str]] = None, timeout_seconds: int = 5) -> Any:
+# Absolute time.monotonic() deadline of the connector running on this thread.
+_DEADLINE = threading.local()
+
+
+def _request_timeout(timeout_seconds: float) -> float:
+    """timeout_seconds, cut to what is left of the running connector's deadline."""
+    deadline_at = getattr(_DEADLINE, "at", None)
+    if deadline_at is None:
+        return timeout_seconds
+    remaining = deadline_at - time.monotonic()
+    if remaining <= 0:
+        raise TimeoutError("connector deadline exceeded")
+    return min(timeout_seconds, remaining)
+
+
+def _http_get_json(url: str, headers: Optional[Dict[str, str]] = None, timeout_seconds: float = 5) -> Any:
     req = Request(url=url, headers=headers or {"User-Agent": "ProofOfTalk-Matchmaker/0.4"})
-    with urlopen(req, timeout=timeout_seconds) as response:
+    with urlopen(req, timeout=_request_timeout(timeout_seconds)) as response:
         return json.loads(response.read().decode("utf-8"))
 
 
-def _download_text(url: str, timeout_seconds: int = 4) -> str:
+def _download_text(url: str, timeout_seconds: float = 4) -> str:
     req = Request(url=url, headers={"User-Agent": "ProofOfTalk-Matchmaker/0.4"})
-    with urlopen(req, timeout=timeout_seconds) as response:
+    with urlopen(req, timeout=_request_timeout(timeout_seconds)) as response:
         raw = response.read().decode("utf-8", errors="ignore")
     text = re.sub(r"<[^>]+>", " ", raw)
     text = re.sub(r"\s+", " ", text)
@@ -315,16 +333,96 @@ def _enabled_connectors() -> List[str]:
     return valid or ["website", "structured_funding", "social_profiles"]
 
 
-def run_live_connectors(profile: Dict[str, Any], connectors: Optional[List[str]] = None) -> Dict[str, Any]:
+def _connector_deadline_seconds() -> float:
+    try:
+        return max(0.1, float(os.getenv("LIVE_CONNECTOR_DEADLINE_SECONDS", "8")))
+    except ValueError:
+        return 8.0
+
+
+def _connector_worker_count() -> int:
+    try:
+        return max(1, int(os.getenv("LIVE_CONNECTOR_WORKERS", "16")))
+    except ValueError:
+        return 16
+
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _connector_executor() -> ThreadPoolExecutor:
+    """Process-wide pool for connector calls, created on first use and bounded by LIVE_CONNECTOR_WORKERS."""
+    global _EXECUTOR
+    if _EXECUTOR is None:
+        with _EXECUTOR_LOCK:
+            if _EXECUTOR is None:
+                _EXECUTOR = ThreadPoolExecutor(
+                    max_workers=_connector_worker_count(), thread_name_prefix="live-connector"
+                )
+    return _EXECUTOR
+
+
+def _run_connector(connector_name: str, profile: Dict[str, Any], deadline_at: float) -> Tuple[Dict[str, Any], float]:
+    started = time.perf_counter()
+    if time.monotonic() >= deadline_at:
+        # Queued behind other work until the caller had already given up.
+        return _result(connector_name, errors=[f"{connector_name}_deadline_exceeded"]), 0.0
+    _DEADLINE.at = deadline_at
+    try:
+        result = CONNECTOR_REGISTRY[connector_name](profile)
+    except Exception as exc:
+        result = _result(connector_name, errors=[f"{connector_name}_failed:{type(exc).__name__}"])
+    finally:
+        _DEADLINE.at = None
+    return result, (time.perf_counter() - started) * 1000
+
+
+def run_live_connectors(
+    profile: Dict[str, Any],
+    connectors: Optional[List[str]] = None,
+    deadline_seconds: Optional[float] = None,
+) -> Dict[str, Any]:
+    """Run the selected connectors concurrently and merge whatever finishes before the deadline.
+
+    Connectors run on the shared connector pool. HTTP calls made by a connector
+    get socket timeouts cut to the time left before the deadline, so a
+    connector still running at the deadline is reported as a
+    "<name>_deadline_exceeded" error and its worker frees up shortly after;
+    one still queued is cancelled.
+    """
     selected = [c for c in (connectors or _enabled_connectors()) if c in CONNECTOR_REGISTRY]
     if not selected:
         selected = ["website", "structured_funding", "social_profiles"]
+    deadline = _connector_deadline_seconds() if deadline_seconds is None else deadline_seconds
+
+    started = time.perf_counter()
+    deadline_at = time.monotonic() + deadline
+    executor = _connector_executor()
+    futures = {name: executor.submit(_run_connector, name, profile, deadline_at) for name in selected}
+    wait(futures.values(), timeout=deadline)
+    for future in futures.values():
+        future.cancel()
 
     connector_results = []
+    timings_ms: Dict[str, float] = {}
     for connector_name in selected:
-        handler = CONNECTOR_REGISTRY[connector_name]
-        connector_results.append(handler(profile))
-
+        future = futures[connector_name]
+        if future.done():
+            result, elapsed_ms = future.result()
+        else:
+            result = _result(connector_name, errors=[f"{connector_name}_deadline_exceeded"])
+            elapsed_ms = deadline * 1000
+        connector_results.append(result)
+        timings_ms[connector_name] = round(elapsed_ms, 1)
+
+    merged = merge_connector_results(connector_results)
+    merged["timings_ms"] = timings_ms
+    merged["elapsed_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return merged
+
+
+def merge_connector_results(connector_results: List[Dict[str, Any]]) -> Dict[str, Any]:
     all_tags: List[str] = []
     all_sources: List[str] = []
     all_errors: List[str] = []
@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+def _max_age_seconds() -> float:
+    try:
+        return float(os.getenv("DASHBOARD_CACHE_MAX_AGE_SECONDS", "300"))
+    except ValueError:
+        return 300.0
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match comparison (weak, comma-separated list or *)."""
+    if not if_none_match:
+        return False
+    wanted = etag.removeprefix("W/")
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == wanted:
+            return True
+    return False
+
+
+def variant_etag(etag: str, params: Any) -> str:
+    """ETag of a view derived from a snapshot (page, projection) by request params."""
+    digest = hashlib.sha1(repr(params).encode("utf-8")).hexdigest()
+    return f'{etag[:-1]}-{digest[:10]}"'
+
+
+class DashboardCache:
+    """Versioned /api/dashboard snapshots, one per variant.
+
+    A snapshot has two layers. The match part (ranked rows, top pairs, risk
+    counts) is keyed by the caller's match key (match graph
+    version plus enrichment revision); the action overlay by the action revision
+    counter. A profile change rebuilds the match part, an action write only
+    re-applies the overlay to the cached match part. The match part is also
+    rebuilt after max_age_seconds so enrichment TTL expiry shows up.
+
+    build_match returns the key it actually built against, so a write that
+    lands during a build is picked up by the next request. Snapshots are
+    shared between requests and must not be changed by callers.
+    """
+
+    def __init__(self, max_age_seconds: Optional[float] = None) -> None:
+        self.max_age_seconds = _max_age_seconds() if max_age_seconds is None else max_age_seconds
+        self._lock = threading.Lock()
+        self._match: Dict[Hashable, Tuple[Hashable, int, float, Any]] = {}
+        self._full: Dict[Hashable, Tuple[Hashable, int, Hashable, str, Dict[str, Any]]] = {}
+        self._generation = 0
+        self.hits = 0
+        self.match_builds = 0
+        self.overlay_builds = 0
+
+    @staticmethod
+    def _etag(variant: Hashable, match_key: Hashable, generation: int, action_key: Hashable) -> str:
+        digest = hashlib.sha1(repr((variant, match_key, generation, action_key)).encode("utf-8")).hexdigest()
+        return f'"dash-{digest[:20]}"'
+
+    def snapshot(
+        self,
+        variant: Hashable,
+        match_key: Hashable,
+        action_key: Hashable,
+        build_match: Callable[[], Tuple[Hashable, Any]],
+        apply_actions: Callable[[Any], Dict[str, Any]],
+    ) -> Tuple[str, Dict[str, Any]]:
+        """Return (etag, payload), rebuilding only the layers whose key moved."""
+        with self._lock:
+            now = time.monotonic()
+            match = self._match.get(variant)
+            if match is None or match[0] != match_key or now - match[2] > self.max_age_seconds:
+                built_key, part = build_match()
+                self._generation += 1
+                match = (built_key, self._generation, now, part)
+                self._match[variant] = match
+                self.match_builds += 1
+
+            full = self._full.get(variant)
+            if full is not None and full[:3] == (match[0], match[1], action_key):
+                self.hits += 1
+                return full[3], full[4]
+
+            payload = apply_actions(match[3])
+            etag = self._etag(variant, match[0], match[1], action_key)
+            self._full[variant] = (match[0], match[1], action_key, etag, payload)
+            self.overlay_builds += 1
+            return etag, payload
+
+    def clear(self) -> None:
+        with self._lock:
+            self._match.clear()
+            self._full.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "match_builds": self.match_builds,
+                "overlay_builds": self.overlay_builds,
+                "max_age_seconds": self.max_age_seconds,
+            }
@@ -2,9 +2,12 @@ from __future__ import annotations
 
 import os
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.parse import parse_qs, unquote, urlparse
 
 
@@ -55,7 +58,9 @@ def _sqlite_db_path(sqlite_url: str) -> str:
 def _connect_sqlite(cfg: DbConfig) -> sqlite3.Connection:
     db_path = _sqlite_db_path(cfg.url)
     Path(db_path).parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(db_path)
+    # The pool hands a connection to one thread at a time; allowing other threads
+    # lets it close connections left behind by threads that have exited.
+    conn = sqlite3.connect(db_path, check_same_thread=False)
     conn.row_factory = sqlite3.Row
     return conn
 
@@ -97,15 +102,331 @@ def _connect_mysql(cfg: DbConfig):
     return pymysql.connect(**connect_kwargs)
 
 
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+@dataclass
+class PoolSettings:
+    size: int
+    timeout_seconds: float
+    recycle_seconds: float
+    ping_after_seconds: float
+
+
+def _pool_settings() -> PoolSettings:
+    return PoolSettings(
+        size=max(1, int(_env_float("DB_POOL_SIZE", 5))),
+        timeout_seconds=_env_float("DB_POOL_TIMEOUT_SECONDS", 10),
+        recycle_seconds=_env_float("DB_POOL_RECYCLE_SECONDS", 1800),
+        ping_after_seconds=_env_float("DB_POOL_PRE_PING_SECONDS", 30),
+    )
+
+
+class PooledConnection:
+    """Proxy returned by _connect(); close() hands the connection back to its pool."""
+
+    def __init__(self, pool: Any, raw: Any) -> None:
+        self._pool = pool
+        self._raw = raw
+        self._released = False
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._raw, name)
+
+    def close(self) -> None:
+        if not self._released:
+            self._released = True
+            self._pool.release(self._raw)
+
+
+def _reset_session(kind: str, conn: Any) -> bool:
+    """Roll back anything a caller left open; False when the connection is unusable."""
+    try:
+        if kind == "sqlite":
+            if conn.in_transaction:
+                conn.rollback()
+            return True
+        if kind == "postgres":
+            if conn.closed or conn.broken:
+                return False
+            if conn.info.transaction_status != 0:
+                conn.rollback()
+            return True
+        if not conn.open:
+            return False
+        if conn.server_status & 1:
+            conn.rollback()
+        return True
+    except Exception:
+        return False
+
+
+def _ping(kind: str, conn: Any) -> bool:
+    try:
+        if kind == "postgres":
+            conn.execute("SELECT 1")
+        elif kind == "mysql":
+            conn.ping(reconnect=False)
+        return True
+    except Exception:
+        return False
+
+
+def _close_quietly(conn: Any) -> None:
+    try:
+        conn.close()
+    except Exception:
+        pass
+
+
+class ConnectionPool:
+    """Bounded, thread-safe pool of server connections (postgres, mysql).
+
+    Checkout reuses the most recently returned connection. Connections older than
+    recycle_seconds are replaced, and connections idle longer than
+    ping_after_seconds are pinged before reuse. When all connections are in use,
+    callers wait up to timeout_seconds and the wait is counted.
+    """
+
+    def __init__(self, cfg: DbConfig, factory: Any, settings: PoolSettings) -> None:
+        self.cfg = cfg
+        self.factory = factory
+        self.settings = settings
+        self._cond = threading.Condition()
+        self._idle: List[Tuple[Any, float, float]] = []
+        self._created_at: Dict[int, float] = {}
+        self.in_use = 0
+        self.created = 0
+        self.waits = 0
+        self.recycled = 0
+        self.discarded = 0
+
+    def _total(self) -> int:
+        return self.in_use + len(self._idle)
+
+    def acquire(self) -> PooledConnection:
+        deadline = time.monotonic() + self.settings.timeout_seconds
+        while True:
+            with self._cond:
+                while not self._idle and self._total() >= self.settings.size:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise RuntimeError(
+                            f"Database pool exhausted: {self.settings.size} connections in use "
+                            f"after waiting {self.settings.timeout_seconds}s"
+                        )
+                    self.waits += 1
+                    self._cond.wait(remaining)
+                candidate = self._idle.pop() if self._idle else None
+                self.in_use += 1
+
+            if candidate is None:
+                try:
+                    raw = self.factory(self.cfg)
+                except Exception:
+                    self._forget(None)
+                    raise
+                with self._cond:
+                    self.created += 1
+                    self._created_at[id(raw)] = time.monotonic()
+                return PooledConnection(self, raw)
+
+            raw, created_at, last_used = candidate
+            now = time.monotonic()
+            if now - created_at > self.settings.recycle_seconds:
+                self._forget(raw, recycled=True)
+                continue
+            if now - last_used > self.settings.ping_after_seconds and not _ping(self.cfg.kind, raw):
+                self._forget(raw, discarded=True)
+                continue
+            return PooledConnection(self, raw)
+
+    def _forget(self, raw: Any, recycled: bool = False, discarded: bool = False) -> None:
+        if raw is not None:
+            _close_quietly(raw)
+        with self._cond:
+            if raw is not None:
+                self._created_at.pop(id(raw), None)
+            self.recycled += recycled
+            self.discarded += discarded
+            self.in_use -= 1
+            self._cond.notify()
+
+    def release(self, raw: Any) -> None:
+        if not _reset_session(self.cfg.kind, raw):
+            self._forget(raw, discarded=True)
+            return
+        with self._cond:
+            self.in_use -= 1
+            self._idle.append((raw, self._created_at.get(id(raw), time.monotonic()), time.monotonic()))
+            self._cond.notify()
+
+    def close_all(self) -> None:
+        with self._cond:
+            idle, self._idle = self._idle, []
+        for raw, _created, _used in idle:
+            _close_quietly(raw)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            return {
+                "backend": self.cfg.kind,
+                "size": self.settings.size,
+                "in_use": self.in_use,
+                "idle": len(self._idle),
+                "created": self.created,
+                "waits": self.waits,
+                "recycled": self.recycled,
+                "discarded": self.discarded,
+            }
+
+
+class SqliteConnectionPool:
+    """One SQLite connection per thread, reopened if the database file was replaced.
+
+    Nested checkouts on the same thread share the connection; uncommitted work is
+    rolled back when the outermost checkout is released. Each connection is
+    tracked with its owning thread, and whenever a new connection is opened the
+    ones owned by threads that have exited are closed, so threadpool churn does
+    not leak file handles.
+    """
+
+    def __init__(self, cfg: DbConfig) -> None:
+        self.cfg = cfg
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._all: Dict[sqlite3.Connection, threading.Thread] = {}
+        self.in_use = 0
+        self.created = 0
+        self.recycled = 0
+        self.reaped = 0
+
+    def _file_id(self) -> Optional[Tuple[int, int]]:
+        try:
+            stat = os.stat(_sqlite_db_path(self.cfg.url))
+        except OSError:
+            return None
+        return (stat.st_dev, stat.st_ino)
+
+    def acquire(self) -> PooledConnection:
+        local = self._local
+        raw = getattr(local, "conn", None)
+        if raw is not None and getattr(local, "depth", 0) == 0 and local.file_id != self._file_id():
+            self._discard(raw, recycled=True)
+            raw = None
+        if raw is None:
+            self._reap_dead_threads()
+            raw = _connect_sqlite(self.cfg)
+            local.conn, local.depth, local.file_id = raw, 0, self._file_id()
+            with self._lock:
+                self.created += 1
+                self._all[raw] = threading.current_thread()
+        local.depth += 1
+        with self._lock:
+            self.in_use += 1
+        return PooledConnection(self, raw)
+
+    def _discard(self, raw: sqlite3.Connection, recycled: bool = False) -> None:
+        self._local.conn = None
+        with self._lock:
+            self.recycled += recycled
+            self._all.pop(raw, None)
+        _close_quietly(raw)
+
+    def _reap_dead_threads(self) -> None:
+        with self._lock:
+            dead = [raw for raw, owner in self._all.items() if not owner.is_alive()]
+            for raw in dead:
+                del self._all[raw]
+            self.reaped += len(dead)
+        for raw in dead:
+            _close_quietly(raw)
+
+    def release(self, raw: sqlite3.Connection) -> None:
+        local = self._local
+        local.depth -= 1
+        with self._lock:
+            self.in_use -= 1
+        if local.depth == 0 and not _reset_session("sqlite", raw):
+            self._discard(raw)
+
+    def close_all(self) -> None:
+        # Connections belong to their threads; closing from here is only safe at shutdown.
+        with self._lock:
+            conns, self._all = list(self._all), {}
+        for raw in conns:
+            try:
+                raw.close()
+            except sqlite3.ProgrammingError:
+                pass
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "backend": "sqlite",
+                "in_use": self.in_use,
+                "open": len(self._all),
+                "created": self.created,
+                "waits": 0,
+                "recycled": self.recycled,
+                "reaped": self.reaped,
+            }
+
+
+_POOLS: Dict[str, Any] = {}
+_POOLS_LOCK = threading.Lock()
+
+
+def _pool_for(cfg: DbConfig) -> Any:
+    pool = _POOLS.get(cfg.url)
+    if pool is not None:
+        return pool
+    with _POOLS_LOCK:
+        pool = _POOLS.get(cfg.url)
+        if pool is None:
+            if cfg.kind == "sqlite":
+                pool = SqliteConnectionPool(cfg)
+            elif cfg.kind == "postgres":
+                pool = ConnectionPool(cfg, _connect_postgres, _pool_settings())
+            elif cfg.kind == "mysql":
+                pool = ConnectionPool(cfg, _connect_mysql, _pool_settings())
+            else:
+                raise ValueError(f"Unsupported database backend: {cfg.kind}")
+            _POOLS[cfg.url] = pool
+    return pool
+
+
+def pool_stats() -> Dict[str, Any]:
+    return _pool_for(_parse_database_url()).stats()
+
+
+def reset_pools() -> None:
+    """Close idle pooled connections and forget every pool (tests, shutdown, URL changes)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+        _POOLS.clear()
+    for pool in pools:
+        pool.close_all()
+
+
 def _connect():
     cfg = _parse_database_url()
-    if cfg.kind == "sqlite":
-        return cfg.kind, _connect_sqlite(cfg)
-    if cfg.kind == "postgres":
-        return cfg.kind, _connect_postgres(cfg)
-    if cfg.kind == "mysql":
-        return cfg.kind, _connect_mysql(cfg)
-    raise ValueError(f"Unsupported database backend: {cfg.kind}")
+    return cfg.kind, _pool_for(cfg).acquire()
+
+
+CHAT_MESSAGE_INDEXES = (
+    ("idx_chat_messages_from_to", "from_user_id, to_user_id, id"),
+    ("idx_chat_messages_to_from", "to_user_id, from_user_id, id"),
+)
+
+
+# Tables whose writers bump a counter in table_revisions, so caches can check
+# for changes by reading one row instead of scanning the table.
+REVISIONED_TABLES = ("intro_actions", "enrichment_results")
 
 
 def _init_sqlite(conn) -> None:
@@ -147,6 +468,78 @@ def _init_sqlite(conn) -> None:
         )
         """
     )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS rationale_cache (
+            cache_key TEXT PRIMARY KEY,
+            rationale TEXT NOT NULL,
+            last_used_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS enrichment_results (
+            profile_id TEXT NOT NULL,
+            connector TEXT NOT NULL,
+            content_hash TEXT NOT NULL,
+            result TEXT NOT NULL,
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (profile_id, connector)
+        )
+        """
+    )
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS chat_conversations (
+            user_low TEXT NOT NULL,
+            user_high TEXT NOT NULL,
+            last_message_id INTEGER NOT NULL,
+            last_from_user_id TEXT NOT NULL,
+            last_body TEXT NOT NULL,
+            last_at TEXT NOT NULL,
+            unread_low INTEGER NOT NULL DEFAULT 0,
+            unread_high INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (user_low, user_high)
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_chat_conversations_high ON chat_conversations (user_high, user_low)")
+    for name, columns in CHAT_MESSAGE_INDEXES:
+        conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON chat_messages ({columns})")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS profiles (
+            id TEXT PRIMARY KEY,
+            position INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            version INTEGER NOT NULL DEFAULT 1,
+            updated_at TEXT NOT NULL
+        )
+        """
+    )
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_profiles_position ON profiles (position)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS profile_store (
+            id INTEGER PRIMARY KEY,
+            revision INTEGER NOT NULL DEFAULT 0,
+            active INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.execute("INSERT OR IGNORE INTO profile_store (id, revision, active) VALUES (1, 0, 0)")
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS table_revisions (
+            name TEXT PRIMARY KEY,
+            revision INTEGER NOT NULL DEFAULT 0
+        )
+        """
+    )
+    conn.executemany(
+        "INSERT OR IGNORE INTO table_revisions (name, revision) VALUES (?, 0)", [(n,) for n in REVISIONED_TABLES]
+    )
     conn.commit()
 
 
@@ -190,6 +583,79 @@ def _init_postgres(conn) -> None:
             )
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rationale_cache (
+                cache_key TEXT PRIMARY KEY,
+                rationale TEXT NOT NULL,
+                last_used_at TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS enrichment_results (
+                profile_id TEXT NOT NULL,
+                connector TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                result TEXT NOT NULL,
+                fetched_at TEXT NOT NULL,
+                PRIMARY KEY (profile_id, connector)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_conversations (
+                user_low TEXT NOT NULL,
+                user_high TEXT NOT NULL,
+                last_message_id BIGINT NOT NULL,
+                last_from_user_id TEXT NOT NULL,
+                last_body TEXT NOT NULL,
+                last_at TEXT NOT NULL,
+                unread_low INTEGER NOT NULL DEFAULT 0,
+                unread_high INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_low, user_high)
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_chat_conversations_high ON chat_conversations (user_high, user_low)")
+        for name, columns in CHAT_MESSAGE_INDEXES:
+            cur.execute(f"CREATE INDEX IF NOT EXISTS {name} ON chat_messages ({columns})")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                id TEXT PRIMARY KEY,
+                position BIGINT NOT NULL,
+                data TEXT NOT NULL,
+                version INTEGER NOT NULL DEFAULT 1,
+                updated_at TEXT NOT NULL
+            )
+            """
+        )
+        cur.execute("CREATE INDEX IF NOT EXISTS idx_profiles_position ON profiles (position)")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profile_store (
+                id INTEGER PRIMARY KEY,
+                revision BIGINT NOT NULL DEFAULT 0,
+                active INTEGER NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cur.execute("INSERT INTO profile_store (id, revision, active) VALUES (1, 0, 0) ON CONFLICT (id) DO NOTHING")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS table_revisions (
+                name TEXT PRIMARY KEY,
+                revision BIGINT NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cur.executemany(
+            "INSERT INTO table_revisions (name, revision) VALUES (%s, 0) ON CONFLICT (name) DO NOTHING",
+            [(n,) for n in REVISIONED_TABLES],
+        )
 
 
 def _init_mysql(conn) -> None:
@@ -232,6 +698,87 @@ def _init_mysql(conn) -> None:
             )
             """
         )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS rationale_cache (
+                cache_key VARCHAR(255) PRIMARY KEY,
+                rationale TEXT NOT NULL,
+                last_used_at VARCHAR(64) NOT NULL
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS enrichment_results (
+                profile_id VARCHAR(255) NOT NULL,
+                connector VARCHAR(64) NOT NULL,
+                content_hash VARCHAR(64) NOT NULL,
+                result MEDIUMTEXT NOT NULL,
+                fetched_at VARCHAR(64) NOT NULL,
+                PRIMARY KEY (profile_id, connector)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS chat_conversations (
+                user_low VARCHAR(255) NOT NULL,
+                user_high VARCHAR(255) NOT NULL,
+                last_message_id BIGINT NOT NULL,
+                last_from_user_id VARCHAR(255) NOT NULL,
+                last_body TEXT NOT NULL,
+                last_at VARCHAR(64) NOT NULL,
+                unread_low INT NOT NULL DEFAULT 0,
+                unread_high INT NOT NULL DEFAULT 0,
+                PRIMARY KEY (user_low, user_high),
+                KEY idx_chat_conversations_high (user_high, user_low)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profiles (
+                id VARCHAR(255) PRIMARY KEY,
+                position BIGINT NOT NULL,
+                data MEDIUMTEXT NOT NULL,
+                version INT NOT NULL DEFAULT 1,
+                updated_at VARCHAR(64) NOT NULL,
+                KEY idx_profiles_position (position)
+            )
+            """
+        )
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS profile_store (
+                id INT PRIMARY KEY,
+                revision BIGINT NOT NULL DEFAULT 0,
+                active INT NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cur.execute("INSERT IGNORE INTO profile_store (id, revision, active) VALUES (1, 0, 0)")
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS table_revisions (
+                name VARCHAR(64) PRIMARY KEY,
+                revision BIGINT NOT NULL DEFAULT 0
+            )
+            """
+        )
+        cur.executemany(
+            "INSERT IGNORE INTO table_revisions (name, revision) VALUES (%s, 0)", [(n,) for n in REVISIONED_TABLES]
+        )
+        # MySQL has no CREATE INDEX IF NOT EXISTS.
+        for name, columns in CHAT_MESSAGE_INDEXES:
+            cur.execute(
+                """
+                SELECT COUNT(*) AS n FROM information_schema.statistics
+                WHERE table_schema = DATABASE() AND table_name = 'chat_messages' AND index_name = %s
+                """,
+                (name,),
+            )
+            if not cur.fetchone()["n"]:
+                cur.execute(f"CREATE INDEX {name} ON chat_messages ({columns})")
 
 
 def init_db() -> None:
@@ -243,57 +790,118 @@ def init_db() -> None:
             _init_postgres(conn)
         elif kind == "mysql":
             _init_mysql(conn)
+        _backfill_chat_conversations(kind, conn)
     finally:
         conn.close()
 
 
-def upsert_action(from_id: str, to_id: str, status: str, notes: str, updated_at: str) -> None:
-    kind, conn = _connect()
+@contextmanager
+def _transaction(kind: str, conn) -> Iterator[None]:
+    """Run the block as one transaction on connections that otherwise autocommit.
+
+    SQLite takes the write lock up front (BEGIN IMMEDIATE), so reads in the
+    block see no concurrent writes; otherwise sqlite3 would only open the
+    transaction at the first DML statement.
+    """
+    if kind == "postgres":
+        with conn.transaction():
+            yield
+        return
+    if kind == "mysql":
+        conn.begin()
+    elif not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
     try:
-        if kind == "sqlite":
-            conn.execute(
-                """
-                INSERT INTO intro_actions (from_id, to_id, status, notes, updated_at)
-                VALUES (?, ?, ?, ?, ?)
-                ON CONFLICT(from_id, to_id) DO UPDATE SET
-                    status=excluded.status,
-                    notes=excluded.notes,
-                    updated_at=excluded.updated_at
-                """,
-                (from_id, to_id, status, notes, updated_at),
-            )
-            conn.commit()
-            return
+        yield
+    except Exception:
+        conn.rollback()
+        raise
+    conn.commit()
 
-        if kind == "postgres":
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO intro_actions (from_id, to_id, status, notes, updated_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON CONFLICT (from_id, to_id) DO UPDATE SET
-                        status = EXCLUDED.status,
-                        notes = EXCLUDED.notes,
-                        updated_at = EXCLUDED.updated_at
-                    """,
-                    (from_id, to_id, status, notes, updated_at),
-                )
-            return
 
-        if kind == "mysql":
-            with conn.cursor() as cur:
-                cur.execute(
-                    """
-                    INSERT INTO intro_actions (from_id, to_id, status, notes, updated_at)
-                    VALUES (%s, %s, %s, %s, %s)
-                    ON DUPLICATE KEY UPDATE
-                        status = VALUES(status),
-                        notes = VALUES(notes),
-                        updated_at = VALUES(updated_at)
-                    """,
-                    (from_id, to_id, status, notes, updated_at),
-                )
-            return
+def _conversation_key(user_a: str, user_b: str) -> Tuple[str, str]:
+    return (user_a, user_b) if user_a <= user_b else (user_b, user_a)
+
+
+def _upsert_conversation(kind: str, conn, message: Dict[str, Any], unread: bool = True) -> None:
+    low, high = _conversation_key(message["from_user_id"], message["to_user_id"])
+    unread_low = int(unread and message["to_user_id"] == low)
+    unread_high = int(unread and not unread_low)
+    params = (
+        low,
+        high,
+        message["id"],
+        message["from_user_id"],
+        message["body"],
+        message["created_at"],
+        unread_low,
+        unread_high,
+    )
+    # A concurrent insert may commit its summary after a newer one; only a higher id wins.
+    if kind in {"sqlite", "postgres"}:
+        newest = "MAX" if kind == "sqlite" else "GREATEST"
+        query = f"""
+            INSERT INTO chat_conversations
+                (user_low, user_high, last_message_id, last_from_user_id, last_body, last_at, unread_low, unread_high)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (user_low, user_high) DO UPDATE SET
+                last_from_user_id = CASE WHEN excluded.last_message_id > chat_conversations.last_message_id
+                    THEN excluded.last_from_user_id ELSE chat_conversations.last_from_user_id END,
+                last_body = CASE WHEN excluded.last_message_id > chat_conversations.last_message_id
+                    THEN excluded.last_body ELSE chat_conversations.last_body END,
+                last_at = CASE WHEN excluded.last_message_id > chat_conversations.last_message_id
+                    THEN excluded.last_at ELSE chat_conversations.last_at END,
+                last_message_id = {newest}(chat_conversations.last_message_id, excluded.last_message_id),
+                unread_low = chat_conversations.unread_low + excluded.unread_low,
+                unread_high = chat_conversations.unread_high + excluded.unread_high
+        """
+    else:
+        # ON DUPLICATE KEY UPDATE assigns left to right, so last_message_id goes last.
+        query = """
+            INSERT INTO chat_conversations
+                (user_low, user_high, last_message_id, last_from_user_id, last_body, last_at, unread_low, unread_high)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            ON DUPLICATE KEY UPDATE
+                last_from_user_id = IF(VALUES(last_message_id) > last_message_id, VALUES(last_from_user_id), last_from_user_id),
+                last_body = IF(VALUES(last_message_id) > last_message_id, VALUES(last_body), last_body),
+                last_at = IF(VALUES(last_message_id) > last_message_id, VALUES(last_at), last_at),
+                last_message_id = GREATEST(last_message_id, VALUES(last_message_id)),
+                unread_low = unread_low + VALUES(unread_low),
+                unread_high = unread_high + VALUES(unread_high)
+        """
+    if kind == "sqlite":
+        conn.execute(query, params)
+        return
+    with conn.cursor() as cur:
+        cur.execute(_sql(kind, query), params)
+
+
+def _backfill_chat_conversations(kind: str, conn) -> None:
+    """Build conversation summaries for messages written before chat_conversations existed.
+
+    Runs only while the summary table is empty; read state is unknown, so unread counts start at zero.
+    """
+    has_summaries = _fetch_all_dicts(kind, conn, "SELECT 1 AS present FROM chat_conversations LIMIT 1", ())
+    if has_summaries:
+        return
+    latest: Dict[Tuple[str, str], Dict[str, Any]] = {}
+    for message in _fetch_all_dicts(
+        kind, conn, "SELECT id, from_user_id, to_user_id, body, created_at FROM chat_messages ORDER BY id ASC", ()
+    ):
+        latest[_conversation_key(message["from_user_id"], message["to_user_id"])] = message
+    if not latest:
+        return
+    with _transaction(kind, conn):
+        for message in latest.values():
+            _upsert_conversation(kind, conn, message, unread=False)
+
+
+def upsert_action(from_id: str, to_id: str, status: str, notes: str, updated_at: str) -> None:
+    kind, conn = _connect()
+    try:
+        with _transaction(kind, conn):
+            _upsert_action_rows(kind, conn, [(from_id, to_id, status, notes, updated_at)])
+            _bump_table_revision(kind, conn, "intro_actions")
     finally:
         conn.close()
 
@@ -349,6 +957,221 @@ def action_map() -> Dict[str, Dict[str, str]]:
     return mapping
 
 
+ACTION_LOOKUP_CHUNK = 400
+ACTION_LOOKUP_FULL_SCAN_KEYS = 5000
+
+
+def _actions_for_pairs(kind: str, conn, keys: List[Tuple[str, str]]) -> Dict[str, Dict[str, str]]:
+    mapping: Dict[str, Dict[str, str]] = {}
+    for start in range(0, len(keys), ACTION_LOOKUP_CHUNK):
+        chunk = keys[start : start + ACTION_LOOKUP_CHUNK]
+        placeholders = ", ".join(["(?, ?)"] * len(chunk))
+        params = tuple(value for pair in chunk for value in pair)
+        rows = _fetch_all_dicts(
+            kind,
+            conn,
+            f"""
+            SELECT from_id, to_id, status, notes, updated_at
+            FROM intro_actions
+            WHERE (from_id, to_id) IN ({placeholders})
+            """,
+            params,
+        )
+        for row in rows:
+            mapping[f"{row['from_id']}::{row['to_id']}"] = row
+    return mapping
+
+
+def get_actions_for_pairs(keys: List[Tuple[str, str]]) -> Dict[str, Dict[str, str]]:
+    """Actions for the given (from_id, to_id) pairs, keyed like action_map().
+
+    Keys are looked up with row-value IN lists in chunks; above
+    ACTION_LOOKUP_FULL_SCAN_KEYS one full read is cheaper than many chunks.
+    """
+    unique = list(dict.fromkeys(keys))
+    if not unique:
+        return {}
+    if len(unique) > ACTION_LOOKUP_FULL_SCAN_KEYS:
+        wanted = {f"{from_id}::{to_id}" for from_id, to_id in unique}
+        return {key: row for key, row in action_map().items() if key in wanted}
+
+    kind, conn = _connect()
+    try:
+        return _actions_for_pairs(kind, conn, unique)
+    finally:
+        conn.close()
+
+
+def pending_action(from_id: str, to_id: str) -> Dict[str, str]:
+    """The action reported for a pair nobody has acted on yet."""
+    return {
+        "from_id": from_id,
+        "to_id": to_id,
+        "status": "pending",
+        "notes": "",
+        "updated_at": "",
+    }
+
+
+def with_actions(per_profile: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Copies of the ranked rows with each row's action attached, reading only those pairs."""
+    actions = get_actions_for_pairs(
+        [(source_id, match["target_id"]) for source_id, matches in per_profile.items() for match in matches]
+    )
+    merged: Dict[str, List[Dict[str, Any]]] = {}
+    for source_id, matches in per_profile.items():
+        out: List[Dict[str, Any]] = []
+        for match in matches:
+            key = f"{source_id}::{match['target_id']}"
+            match_copy = dict(match)
+            match_copy["action"] = actions.get(key, pending_action(source_id, match["target_id"]))
+            out.append(match_copy)
+        merged[source_id] = out
+    return merged
+
+
+def attach_pair_actions(*pair_lists: List[Dict[str, Any]]) -> None:
+    """Set row["action"] on from_id/to_id rows, reading only those pairs' actions."""
+    rows = [row for pairs in pair_lists for row in pairs]
+    actions = get_actions_for_pairs([(row["from_id"], row["to_id"]) for row in rows])
+    for row in rows:
+        key = f"{row['from_id']}::{row['to_id']}"
+        row["action"] = actions.get(key, pending_action(row["from_id"], row["to_id"]))
+
+
+def _upsert_action_rows(kind: str, conn, values: List[Tuple[str, str, str, str, str]]) -> List[bool]:
+    """Upsert action rows; per row, True when it inserted a new pair.
+
+    The answer comes from the write itself: RETURNING (xmax = 0) on Postgres,
+    affected rows on MySQL (1 insert, 2 update), and on SQLite a read under
+    the write lock _transaction already holds.
+    """
+    if kind == "sqlite":
+        existing = _actions_for_pairs(kind, conn, list(dict.fromkeys((v[0], v[1]) for v in values)))
+        conn.executemany(
+            """
+            INSERT INTO intro_actions (from_id, to_id, status, notes, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (from_id, to_id) DO UPDATE SET
+                status = excluded.status,
+                notes = excluded.notes,
+                updated_at = excluded.updated_at
+            """,
+            values,
+        )
+        return [f"{v[0]}::{v[1]}" not in existing for v in values]
+
+    if kind == "postgres":
+        with conn.cursor() as cur:
+            cur.executemany(
+                """
+                INSERT INTO intro_actions (from_id, to_id, status, notes, updated_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON CONFLICT (from_id, to_id) DO UPDATE SET
+                    status = EXCLUDED.status,
+                    notes = EXCLUDED.notes,
+                    updated_at = EXCLUDED.updated_at
+                RETURNING (xmax = 0) AS inserted
+                """,
+                values,
+                returning=True,
+            )
+            inserted: List[bool] = []
+            for result in cur.results():
+                row = result.fetchone()
+                inserted.append(bool(row["inserted"] if isinstance(row, dict) else row[0]))
+            return inserted
+
+    inserted = []
+    with conn.cursor() as cur:
+        # One statement per row: executemany would fold the affected-row counts together.
+        for value in values:
+            cur.execute(
+                """
+                INSERT INTO intro_actions (from_id, to_id, status, notes, updated_at)
+                VALUES (%s, %s, %s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    status = VALUES(status),
+                    notes = VALUES(notes),
+                    updated_at = VALUES(updated_at)
+                """,
+                value,
+            )
+            inserted.append(cur.rowcount == 1)
+    return inserted
+
+
+def upsert_actions_bulk(actions: List[Dict[str, str]], updated_at: str) -> List[Dict[str, str]]:
+    """Apply many action upserts in one transaction.
+
+    Each input needs from_id, to_id, status and notes. Returns one result per
+    input row, in order, marked "created" or "updated" as decided by the write
+    (see _upsert_action_rows). When a pair repeats, the last row wins and the
+    later rows are "updated".
+    """
+    if not actions:
+        return []
+    values = [(a["from_id"], a["to_id"], a["status"], a.get("notes", ""), updated_at) for a in actions]
+    kind, conn = _connect()
+    try:
+        with _transaction(kind, conn):
+            inserted = _upsert_action_rows(kind, conn, values)
+            _bump_table_revision(kind, conn, "intro_actions")
+    finally:
+        conn.close()
+
+    seen = set()
+    results: List[Dict[str, str]] = []
+    for (from_id, to_id, status, notes, _updated), created in zip(values, inserted):
+        key = f"{from_id}::{to_id}"
+        results.append(
+            {
+                "from_id": from_id,
+                "to_id": to_id,
+                "status": status,
+                "notes": notes,
+                "updated_at": updated_at,
+                "result": "created" if created and key not in seen else "updated",
+            }
+        )
+        seen.add(key)
+    return results
+
+
+def count_actions() -> Dict[str, Any]:
+    kind, conn = _connect()
+    try:
+        rows = _fetch_all_dicts(
+            kind,
+            conn,
+            "SELECT status, COUNT(*) AS n FROM intro_actions GROUP BY status",
+            (),
+        )
+    finally:
+        conn.close()
+    by_status = {str(row["status"]): int(row["n"]) for row in rows}
+    return {"total": sum(by_status.values()), "by_status": by_status}
+
+
+def _bump_table_revision(kind: str, conn, name: str) -> None:
+    """Advance name's revision inside the caller's write transaction."""
+    _execute(kind, conn, "UPDATE table_revisions SET revision = revision + 1 WHERE name = ?", (name,))
+
+
+def _table_revision(name: str) -> int:
+    kind, conn = _connect()
+    try:
+        rows = _fetch_all_dicts(kind, conn, "SELECT revision FROM table_revisions WHERE name = ?", (name,))
+    finally:
+        conn.close()
+    return int(rows[0]["revision"]) if rows else 0
+
+
+def action_signature() -> int:
+    """Revision counter of intro_actions; bumped by every action write."""
+    return _table_revision("intro_actions")
+
+
 def create_user(
     user_id: str,
     email: str,
@@ -404,6 +1227,32 @@ def _fetch_one_dict(kind: str, conn, query: str, params: tuple) -> Optional[Dict
         return dict(zip(cols, row))
 
 
+def _sql(kind: str, query: str) -> str:
+    """Queries are written with sqlite "?" placeholders; server backends use "%s"."""
+    return query if kind == "sqlite" else query.replace("?", "%s")
+
+
+def _execute(kind: str, conn, query: str, params: tuple) -> None:
+    if kind == "sqlite":
+        conn.execute(query, params)
+        return
+    with conn.cursor() as cur:
+        cur.execute(_sql(kind, query), params)
+
+
+def _fetch_all_dicts(kind: str, conn, query: str, params: tuple) -> List[Dict[str, Any]]:
+    if kind == "sqlite":
+        return [dict(row) for row in conn.execute(query, params).fetchall()]
+
+    with conn.cursor() as cur:
+        cur.execute(_sql(kind, query), params)
+        rows = cur.fetchall()
+        if rows and isinstance(rows[0], dict):
+            return list(rows)
+        cols = [d.name for d in cur.description]
+        return [dict(zip(cols, row)) for row in rows]
+
+
 def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
     kind, conn = _connect()
     try:
@@ -525,128 +1374,328 @@ def update_user_profile_fields(
 
 
 def insert_chat_message(from_user_id: str, to_user_id: str, body: str, created_at: str) -> Dict[str, Any]:
+    """Store a message and update its conversation summary in the same transaction."""
     kind, conn = _connect()
     try:
-        if kind == "sqlite":
-            cur = conn.execute(
-                """
-                INSERT INTO chat_messages (from_user_id, to_user_id, body, created_at)
-                VALUES (?, ?, ?, ?)
-                """,
-                (from_user_id, to_user_id, body, created_at),
-            )
-            conn.commit()
-            return {
-                "id": int(cur.lastrowid),
-                "from_user_id": from_user_id,
-                "to_user_id": to_user_id,
-                "body": body,
-                "created_at": created_at,
-            }
-
-        if kind == "postgres":
-            with conn.cursor() as cur:
-                cur.execute(
+        with _transaction(kind, conn):
+            if kind == "sqlite":
+                cur = conn.execute(
                     """
                     INSERT INTO chat_messages (from_user_id, to_user_id, body, created_at)
-                    VALUES (%s, %s, %s, %s)
-                    RETURNING id
+                    VALUES (?, ?, ?, ?)
                     """,
                     (from_user_id, to_user_id, body, created_at),
                 )
-                msg_id = int(cur.fetchone()[0])
-            return {
+                msg_id = int(cur.lastrowid)
+            elif kind == "postgres":
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO chat_messages (from_user_id, to_user_id, body, created_at)
+                        VALUES (%s, %s, %s, %s)
+                        RETURNING id
+                        """,
+                        (from_user_id, to_user_id, body, created_at),
+                    )
+                    msg_id = int(cur.fetchone()[0])
+            else:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        INSERT INTO chat_messages (from_user_id, to_user_id, body, created_at)
+                        VALUES (%s, %s, %s, %s)
+                        """,
+                        (from_user_id, to_user_id, body, created_at),
+                    )
+                    msg_id = int(cur.lastrowid)
+            message = {
                 "id": msg_id,
                 "from_user_id": from_user_id,
                 "to_user_id": to_user_id,
                 "body": body,
                 "created_at": created_at,
             }
+            _upsert_conversation(kind, conn, message)
+        return message
+    finally:
+        conn.close()
 
-        with conn.cursor() as cur:
-            cur.execute(
-                """
-                INSERT INTO chat_messages (from_user_id, to_user_id, body, created_at)
-                VALUES (%s, %s, %s, %s)
-                """,
-                (from_user_id, to_user_id, body, created_at),
-            )
-            msg_id = int(cur.lastrowid)
-        return {
-            "id": msg_id,
-            "from_user_id": from_user_id,
-            "to_user_id": to_user_id,
-            "body": body,
-            "created_at": created_at,
-        }
+
+def get_chat_messages_between(
+    user_a: str,
+    user_b: str,
+    limit: int = 200,
+    before_id: Optional[int] = None,
+    after_id: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Messages between two users in ascending id order, paged by message id.
+
+    after_id returns the oldest messages newer than it (forward paging, polling);
+    before_id alone returns the newest messages older than it (scrolling back).
+    Without either the conversation is read from the start.
+    """
+    safe_limit = max(1, min(limit, 500))
+    conditions = ""
+    params: List[Any] = [user_a, user_b, user_b, user_a]
+    if after_id is not None:
+        conditions += " AND id > ?"
+        params.append(after_id)
+    if before_id is not None:
+        conditions += " AND id < ?"
+        params.append(before_id)
+    newest_first = before_id is not None and after_id is None
+    params.append(safe_limit)
+
+    kind, conn = _connect()
+    try:
+        rows = _fetch_all_dicts(
+            kind,
+            conn,
+            f"""
+            SELECT id, from_user_id, to_user_id, body, created_at
+            FROM chat_messages
+            WHERE ((from_user_id = ? AND to_user_id = ?)
+               OR (from_user_id = ? AND to_user_id = ?)){conditions}
+            ORDER BY id {"DESC" if newest_first else "ASC"}
+            LIMIT ?
+            """,
+            tuple(params),
+        )
     finally:
         conn.close()
+    return rows[::-1] if newest_first else rows
 
 
-def get_chat_messages_between(user_a: str, user_b: str, limit: int = 200) -> List[Dict[str, Any]]:
+def get_recent_chat_activity_for_user(user_id: str, limit: int = 200) -> List[Dict[str, Any]]:
     safe_limit = max(1, min(limit, 500))
     kind, conn = _connect()
     try:
+        # UNION ALL lets each branch use its composite index instead of an OR scan.
+        return _fetch_all_dicts(
+            kind,
+            conn,
+            """
+            SELECT id, from_user_id, to_user_id, body, created_at FROM (
+                SELECT id, from_user_id, to_user_id, body, created_at FROM chat_messages WHERE from_user_id = ?
+                UNION ALL
+                SELECT id, from_user_id, to_user_id, body, created_at FROM chat_messages
+                WHERE to_user_id = ? AND from_user_id <> ?
+            ) activity
+            ORDER BY id DESC
+            LIMIT ?
+            """,
+            (user_id, user_id, user_id, safe_limit),
+        )
+    finally:
+        conn.close()
+
+
+def get_latest_chat_message_per_peer(user_id: str) -> List[Dict[str, Any]]:
+    """One row per conversation partner: the newest message in either direction, newest first."""
+    kind, conn = _connect()
+    try:
+        return _fetch_all_dicts(
+            kind,
+            conn,
+            """
+            SELECT m.id, m.from_user_id, m.to_user_id, m.body, m.created_at, latest.peer_id
+            FROM chat_messages m
+            JOIN (
+                SELECT peer_id, MAX(last_id) AS last_id FROM (
+                    SELECT to_user_id AS peer_id, MAX(id) AS last_id
+                    FROM chat_messages WHERE from_user_id = ? GROUP BY to_user_id
+                    UNION ALL
+                    SELECT from_user_id AS peer_id, MAX(id) AS last_id
+                    FROM chat_messages WHERE to_user_id = ? GROUP BY from_user_id
+                ) per_direction
+                GROUP BY peer_id
+            ) latest ON m.id = latest.last_id
+            ORDER BY m.id DESC
+            """,
+            (user_id, user_id),
+        )
+    finally:
+        conn.close()
+
+
+def get_chat_inbox(user_id: str) -> List[Dict[str, Any]]:
+    """One summary row per conversation partner, newest conversation first."""
+    kind, conn = _connect()
+    try:
+        rows = _fetch_all_dicts(
+            kind,
+            conn,
+            """
+            SELECT user_low, user_high, last_message_id, last_from_user_id, last_body, last_at, unread_low, unread_high
+            FROM (
+                SELECT * FROM chat_conversations WHERE user_low = ?
+                UNION ALL
+                SELECT * FROM chat_conversations WHERE user_high = ? AND user_low <> ?
+            ) conversations
+            ORDER BY last_message_id DESC
+            """,
+            (user_id, user_id, user_id),
+        )
+    finally:
+        conn.close()
+
+    inbox: List[Dict[str, Any]] = []
+    for row in rows:
+        is_low = row["user_low"] == user_id
+        inbox.append(
+            {
+                "peer_id": row["user_high"] if is_low else row["user_low"],
+                "last_message_id": row["last_message_id"],
+                "last_from_user_id": row["last_from_user_id"],
+                "last_body": row["last_body"],
+                "last_at": row["last_at"],
+                "unread_count": row["unread_low"] if is_low else row["unread_high"],
+            }
+        )
+    return inbox
+
+
+def mark_conversation_read(user_id: str, peer_id: str) -> None:
+    low, high = _conversation_key(user_id, peer_id)
+    column = "unread_low" if user_id == low else "unread_high"
+    kind, conn = _connect()
+    try:
+        query = f"UPDATE chat_conversations SET {column} = 0 WHERE user_low = ? AND user_high = ? AND {column} > 0"
         if kind == "sqlite":
-            rows = conn.execute(
+            conn.execute(query, (low, high))
+            conn.commit()
+            return
+        with conn.cursor() as cur:
+            cur.execute(_sql(kind, query), (low, high))
+    finally:
+        conn.close()
+
+
+def get_cached_rationale(cache_key: str) -> Optional[str]:
+    kind, conn = _connect()
+    try:
+        placeholder = "?" if kind == "sqlite" else "%s"
+        row = _fetch_one_dict(
+            kind,
+            conn,
+            f"SELECT rationale FROM rationale_cache WHERE cache_key = {placeholder}",
+            (cache_key,),
+        )
+        return str(row["rationale"]) if row else None
+    finally:
+        conn.close()
+
+
+def put_cached_rationale(cache_key: str, rationale: str, used_at: str) -> None:
+    kind, conn = _connect()
+    try:
+        if kind == "sqlite":
+            conn.execute(
                 """
-                SELECT id, from_user_id, to_user_id, body, created_at
-                FROM chat_messages
-                WHERE (from_user_id = ? AND to_user_id = ?)
-                   OR (from_user_id = ? AND to_user_id = ?)
-                ORDER BY id ASC
-                LIMIT ?
+                INSERT INTO rationale_cache (cache_key, rationale, last_used_at)
+                VALUES (?, ?, ?)
+                ON CONFLICT(cache_key) DO UPDATE SET
+                    rationale=excluded.rationale,
+                    last_used_at=excluded.last_used_at
                 """,
-                (user_a, user_b, user_b, user_a, safe_limit),
-            ).fetchall()
-            return [dict(row) for row in rows]
+                (cache_key, rationale, used_at),
+            )
+            conn.commit()
+            return
+
+        if kind == "postgres":
+            with conn.cursor() as cur:
+                cur.execute(
+                    """
+                    INSERT INTO rationale_cache (cache_key, rationale, last_used_at)
+                    VALUES (%s, %s, %s)
+                    ON CONFLICT (cache_key) DO UPDATE SET
+                        rationale = EXCLUDED.rationale,
+                        last_used_at = EXCLUDED.last_used_at
+                    """,
+                    (cache_key, rationale, used_at),
+                )
+            return
 
         with conn.cursor() as cur:
             cur.execute(
                 """
-                SELECT id, from_user_id, to_user_id, body, created_at
-                FROM chat_messages
-                WHERE (from_user_id = %s AND to_user_id = %s)
-                   OR (from_user_id = %s AND to_user_id = %s)
-                ORDER BY id ASC
-                LIMIT %s
+                INSERT INTO rationale_cache (cache_key, rationale, last_used_at)
+                VALUES (%s, %s, %s)
+                ON DUPLICATE KEY UPDATE
+                    rationale = VALUES(rationale),
+                    last_used_at = VALUES(last_used_at)
                 """,
-                (user_a, user_b, user_b, user_a, safe_limit),
+                (cache_key, rationale, used_at),
             )
-            rows = cur.fetchall()
-            if rows and isinstance(rows[0], dict):
-                return list(rows)
-            cols = [d.name for d in cur.description]
-            return [dict(zip(cols, row)) for row in rows]
     finally:
         conn.close()
 
 
-def get_recent_chat_activity_for_user(user_id: str) -> List[Dict[str, Any]]:
+def touch_cached_rationales(cache_keys: Iterable[str], used_at: str) -> None:
+    """Record reads of cached rationales, batched by the caller, so pruning follows last use."""
+    params = [(used_at, key) for key in cache_keys]
+    if not params:
+        return
+    query = "UPDATE rationale_cache SET last_used_at = ? WHERE cache_key = ?"
     kind, conn = _connect()
     try:
+        with _transaction(kind, conn):
+            if kind == "sqlite":
+                conn.executemany(query, params)
+            else:
+                with conn.cursor() as cur:
+                    cur.executemany(_sql(kind, query), params)
+    finally:
+        conn.close()
+
+
+def prune_rationale_cache(max_rows: int) -> None:
+    """Keep only the max_rows most recently used rationales (LRU eviction).
+
+    last_used_at is set on write and refreshed by touch_cached_rationales().
+    """
+    kind, conn = _connect()
+    try:
+        placeholder = "?" if kind == "sqlite" else "%s"
+        cutoff = _fetch_one_dict(
+            kind,
+            conn,
+            f"""
+            SELECT last_used_at FROM rationale_cache
+            ORDER BY last_used_at DESC
+            LIMIT 1 OFFSET {placeholder}
+            """,
+            (max(max_rows, 0),),
+        )
+        if not cutoff:
+            return
+        query = f"DELETE FROM rationale_cache WHERE last_used_at <= {placeholder}"
         if kind == "sqlite":
-            rows = conn.execute(
-                """
-                SELECT id, from_user_id, to_user_id, body, created_at
-                FROM chat_messages
-                WHERE from_user_id = ? OR to_user_id = ?
-                ORDER BY id DESC
-                """,
-                (user_id, user_id),
-            ).fetchall()
-            return [dict(row) for row in rows]
+            conn.execute(query, (cutoff["last_used_at"],))
+            conn.commit()
+            return
+        with conn.cursor() as cur:
+            cur.execute(query, (cutoff["last_used_at"],))
+    finally:
+        conn.close()
+
+
+def get_enrichment_results(profile_id: Optional[str] = None) -> List[Dict[str, Any]]:
+    kind, conn = _connect()
+    try:
+        placeholder = "?" if kind == "sqlite" else "%s"
+        query = "SELECT profile_id, connector, content_hash, result, fetched_at FROM enrichment_results"
+        params: tuple = ()
+        if profile_id is not None:
+            query += f" WHERE profile_id = {placeholder}"
+            params = (profile_id,)
+
+        if kind == "sqlite":
+            return [dict(row) for row in conn.execute(query, params).fetchall()]
 
         with conn.cursor() as cur:
-            cur.execute(
-                """
-                SELECT id, from_user_id, to_user_id, body, created_at
-                FROM chat_messages
-                WHERE from_user_id = %s OR to_user_id = %s
-                ORDER BY id DESC
-                """,
-                (user_id, user_id),
-            )
+            cur.execute(query, params)
             rows = cur.fetchall()
             if rows and isinstance(rows[0], dict):
                 return list(rows)
@@ -654,3 +1703,196 @@ def get_recent_chat_activity_for_user(user_id: str) -> List[Dict[str, Any]]:
             return [dict(zip(cols, row)) for row in rows]
     finally:
         conn.close()
+
+
+def put_enrichment_results(profile_id: str, rows: List[Dict[str, str]]) -> None:
+    """Store connector results for one profile, replacing earlier results of the same connectors.
+
+    Each row carries connector, content_hash, result (a JSON string) and fetched_at.
+    Connectors not present in rows keep whatever was stored before.
+    """
+    if not rows:
+        return
+    kind, conn = _connect()
+    try:
+        keys = [(profile_id, r["connector"]) for r in rows]
+        values = [(profile_id, r["connector"], r["content_hash"], r["result"], r["fetched_at"]) for r in rows]
+        with _transaction(kind, conn):
+            if kind == "sqlite":
+                conn.executemany("DELETE FROM enrichment_results WHERE profile_id = ? AND connector = ?", keys)
+                conn.executemany(
+                    """
+                    INSERT INTO enrichment_results (profile_id, connector, content_hash, result, fetched_at)
+                    VALUES (?, ?, ?, ?, ?)
+                    """,
+                    values,
+                )
+            else:
+                with conn.cursor() as cur:
+                    cur.executemany("DELETE FROM enrichment_results WHERE profile_id = %s AND connector = %s", keys)
+                    cur.executemany(
+                        """
+                        INSERT INTO enrichment_results (profile_id, connector, content_hash, result, fetched_at)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        values,
+                    )
+            _bump_table_revision(kind, conn, "enrichment_results")
+    finally:
+        conn.close()
+
+
+def enrichment_signature() -> int:
+    """Revision counter of enrichment_results; bumped by every refresh or delete."""
+    return _table_revision("enrichment_results")
+
+
+def delete_enrichment_results(profile_id: Optional[str] = None) -> None:
+    kind, conn = _connect()
+    try:
+        query = "DELETE FROM enrichment_results"
+        params: tuple = ()
+        if profile_id is not None:
+            query += " WHERE profile_id = ?"
+            params = (profile_id,)
+        with _transaction(kind, conn):
+            _execute(kind, conn, query, params)
+            _bump_table_revision(kind, conn, "enrichment_results")
+    finally:
+        conn.close()
+
+
+PROFILE_WRITE_CHUNK = 500
+
+
+def get_profile_store_state() -> Dict[str, int]:
+    """The profile table's revision counter and whether it is the active source (else the seed file)."""
+    kind, conn = _connect()
+    try:
+        rows = _fetch_all_dicts(kind, conn, "SELECT revision, active FROM profile_store WHERE id = 1", ())
+    finally:
+        conn.close()
+    if not rows:
+        return {"revision": 0, "active": 0}
+    return {"revision": int(rows[0]["revision"]), "active": int(rows[0]["active"])}
+
+
+def list_profiles() -> List[Dict[str, Any]]:
+    """Stored profiles in insertion order; data holds the profile as a JSON string."""
+    kind, conn = _connect()
+    try:
+        return _fetch_all_dicts(kind, conn, "SELECT id, data, version, updated_at FROM profiles ORDER BY position", ())
+    finally:
+        conn.close()
+
+
+def _bump_profile_revision(kind: str, conn) -> Dict[str, int]:
+    # The UPDATE comes first so concurrent writers queue on the profile_store row lock.
+    _execute(kind, conn, "UPDATE profile_store SET revision = revision + 1 WHERE id = 1", ())
+    row = _fetch_all_dicts(kind, conn, "SELECT revision, active FROM profile_store WHERE id = 1", ())[0]
+    return {"revision": int(row["revision"]), "active": int(row["active"])}
+
+
+def _write_profile_rows(kind: str, conn, rows: Iterable[Tuple[str, str]], updated_at: str) -> None:
+    """Upsert (id, data) rows in chunks; new ids are appended after the current last position."""
+    if kind in {"sqlite", "postgres"}:
+        query = """
+            INSERT INTO profiles (id, position, data, version, updated_at)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                data = excluded.data,
+                version = profiles.version + 1,
+                updated_at = excluded.updated_at
+        """
+    else:
+        query = """
+            INSERT INTO profiles (id, position, data, version, updated_at)
+            VALUES (?, ?, ?, 1, ?)
+            ON DUPLICATE KEY UPDATE
+                data = VALUES(data),
+                version = version + 1,
+                updated_at = VALUES(updated_at)
+        """
+    top = _fetch_all_dicts(kind, conn, "SELECT MAX(position) AS top FROM profiles", ())[0]["top"]
+    position = -1 if top is None else int(top)
+    batch: List[Tuple[str, int, str, str]] = []
+    for profile_id, data in rows:
+        position += 1
+        batch.append((profile_id, position, data, updated_at))
+        if len(batch) >= PROFILE_WRITE_CHUNK:
+            _execute_profile_batch(kind, conn, query, batch)
+            batch = []
+    if batch:
+        _execute_profile_batch(kind, conn, query, batch)
+
+
+def _execute_profile_batch(kind: str, conn, query: str, batch: List[Tuple[str, int, str, str]]) -> None:
+    if kind == "sqlite":
+        conn.executemany(query, batch)
+        return
+    with conn.cursor() as cur:
+        cur.executemany(_sql(kind, query), batch)
+
+
+def _count_profiles(kind: str, conn) -> int:
+    return int(_fetch_all_dicts(kind, conn, "SELECT COUNT(*) AS n FROM profiles", ())[0]["n"])
+
+
+def replace_profiles(rows: Iterable[Tuple[str, str]], updated_at: str) -> Dict[str, int]:
+    """Make (id, data) rows the whole profile table in one transaction.
+
+    A repeated id keeps its first position and its last data. Returns the new
+    revision and the number of stored profiles.
+    """
+    kind, conn = _connect()
+    try:
+        with _transaction(kind, conn):
+            revision = _bump_profile_revision(kind, conn)["revision"]
+            _execute(kind, conn, "DELETE FROM profiles", ())
+            _execute(kind, conn, "UPDATE profile_store SET active = 1 WHERE id = 1", ())
+            _write_profile_rows(kind, conn, rows, updated_at)
+            stored = _count_profiles(kind, conn)
+    finally:
+        conn.close()
+    return {"revision": revision, "stored": stored}
+
+
+def upsert_profiles(
+    rows: Iterable[Tuple[str, str]],
+    updated_at: str,
+    seed_rows: Iterable[Tuple[str, str]] = (),
+) -> Dict[str, Any]:
+    """Insert or update (id, data) rows by id in one transaction.
+
+    Existing profiles keep their position and new ones are appended in order.
+    While the table is not yet the active source, seed_rows are written first
+    so the first registration extends the seed list instead of replacing it.
+    Returns the new revision, whether the table was active before, and the
+    number of stored profiles.
+    """
+    kind, conn = _connect()
+    try:
+        with _transaction(kind, conn):
+            state = _bump_profile_revision(kind, conn)
+            if not state["active"]:
+                _execute(kind, conn, "DELETE FROM profiles", ())
+                _execute(kind, conn, "UPDATE profile_store SET active = 1 WHERE id = 1", ())
+                _write_profile_rows(kind, conn, seed_rows, updated_at)
+            _write_profile_rows(kind, conn, rows, updated_at)
+            stored = _count_profiles(kind, conn)
+    finally:
+        conn.close()
+    return {"revision": state["revision"], "was_active": bool(state["active"]), "stored": stored}
+
+
+def clear_profiles() -> int:
+    """Drop all stored profiles so readers fall back to the seed file; returns the new revision."""
+    kind, conn = _connect()
+    try:
+        with _transaction(kind, conn):
+            revision = _bump_profile_revision(kind, conn)["revision"]
+            _execute(kind, conn, "DELETE FROM profiles", ())
+            _execute(kind, conn, "UPDATE profile_store SET active = 0 WHERE id = 1", ())
+    finally:
+        conn.close()
+    return revision
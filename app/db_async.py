@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+from app import db
+
+T = TypeVar("T")
+
+
+def _worker_count() -> int:
+    try:
+        return max(1, int(os.getenv("DB_ASYNC_WORKERS", "8")))
+    except ValueError:
+        return 8
+
+
+class DbExecutor:
+    """Bounded thread pool that runs blocking app.db calls for async handlers.
+
+    Database work gets its own threads instead of sharing Starlette's
+    threadpool, so slow queries cannot starve sync endpoints and at most
+    `workers` queries run at once; further calls wait in the queue. Worker
+    threads are long-lived, which keeps SQLite's per-thread pooled connection
+    warm. Queue depth and peak concurrency are counted for /api/db/pool.
+    """
+
+    def __init__(self, workers: int) -> None:
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self.running = 0
+        self.queued = 0
+        self.peak_running = 0
+        self.calls = 0
+
+    def _pool(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="db-async")
+        return self._executor
+
+    def _track(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self.queued -= 1
+            self.running += 1
+            self.peak_running = max(self.peak_running, self.running)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            with self._lock:
+                self.running -= 1
+
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        with self._lock:
+            self.queued += 1
+            self.calls += 1
+        loop = asyncio.get_running_loop()
+        call = functools.partial(self._track, func, *args, **kwargs)
+        return await loop.run_in_executor(self._pool(), call)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.workers,
+                "running": self.running,
+                "queued": self.queued,
+                "peak_running": self.peak_running,
+                "calls": self.calls,
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+
+DB_EXECUTOR = DbExecutor(_worker_count())
+
+
+async def run_db(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run any blocking database-backed callable on the DB executor."""
+    return await DB_EXECUTOR.run(func, *args, **kwargs)
+
+
+def _offload(func: Callable[..., T]) -> Callable[..., Awaitable[T]]:
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        return await DB_EXECUTOR.run(func, *args, **kwargs)
+
+    return wrapper
+
+
+get_all_actions = _offload(db.get_all_actions)
+get_actions_for_pairs = _offload(db.get_actions_for_pairs)
+upsert_action = _offload(db.upsert_action)
+upsert_actions_bulk = _offload(db.upsert_actions_bulk)
+count_actions = _offload(db.count_actions)
+get_user_by_id = _offload(db.get_user_by_id)
+get_user_by_email = _offload(db.get_user_by_email)
+list_users = _offload(db.list_users)
+insert_chat_message = _offload(db.insert_chat_message)
+get_chat_messages_between = _offload(db.get_chat_messages_between)
+get_chat_inbox = _offload(db.get_chat_inbox)
+mark_conversation_read = _offload(db.mark_conversation_read)
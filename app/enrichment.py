@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+import hashlib
+import json
 import os
+from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
-from app.connectors import run_live_connectors
+from app.connectors import merge_connector_results, run_live_connectors
+from app.db import get_enrichment_results, put_enrichment_results
 
 KEYWORD_ENRICHMENT = {
     "custody": ["institutional custody", "regulated operations", "asset security"],
@@ -14,17 +18,34 @@ KEYWORD_ENRICHMENT = {
 }
 
 
-def enrich_profile(
-    profile: Dict[str, Any],
-    live_enabled: Optional[bool] = None,
-    connectors_override: Optional[List[str]] = None,
-) -> Dict[str, Any]:
-    """Mock enrichment layer for demo reliability.
+# How long a stored connector result is served before /api/enrichment/refresh has to
+# run the connector again. Override per connector with ENRICHMENT_TTL_<NAME>=<seconds>.
+CONNECTOR_TTL_SECONDS = {
+    "website": 7 * 86400,
+    "structured_funding": 86400,
+    "social_profiles": 86400,
+    "clearbit": 30 * 86400,
+    "crunchbase": 7 * 86400,
+    "openalex": 30 * 86400,
+}
+DEFAULT_TTL_SECONDS = 86400
+
+
+def connector_ttl_seconds(connector: str) -> int:
+    default = CONNECTOR_TTL_SECONDS.get(connector, DEFAULT_TTL_SECONDS)
+    try:
+        return int(os.getenv(f"ENRICHMENT_TTL_{connector.upper()}", str(default)))
+    except ValueError:
+        return default
 
-    In production, this is where connectors for company sites, social data, and
-    funding databases would normalize and merge additional signals.
-    """
 
+def profile_content_hash(profile: Dict[str, Any]) -> str:
+    content = {k: v for k, v in profile.items() if k != "enrichment"}
+    raw = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _keyword_tags(profile: Dict[str, Any]) -> List[str]:
     text_blob = " ".join(
         [
             str(profile.get("mandate", "")),
@@ -41,16 +62,17 @@ def enrich_profile(
         if keyword in text_blob:
             inferred_tags.extend(tags)
 
-    inferred_tags = sorted(set(inferred_tags))
+    return sorted(set(inferred_tags))
 
-    should_run_live = (os.getenv("ENABLE_LIVE_ENRICHMENT", "0") == "1") if live_enabled is None else live_enabled
-    live_result = run_live_connectors(profile, connectors=connectors_override) if should_run_live else {
-        "tags": [],
-        "confidence_delta": 0.0,
-        "sources": [],
-        "errors": [],
-    }
 
+def _with_enrichment(
+    profile: Dict[str, Any],
+    live_result: Dict[str, Any],
+    live_enabled: bool,
+    active_connectors: List[str],
+    fetched_at: Dict[str, str],
+) -> Dict[str, Any]:
+    inferred_tags = _keyword_tags(profile)
     merged_tags = sorted(set(inferred_tags + live_result["tags"]))
     base_confidence = 0.68 if inferred_tags else 0.52
     confidence = min(base_confidence + live_result["confidence_delta"], 0.95)
@@ -65,9 +87,110 @@ def enrich_profile(
             "market_data_mock",
             *live_result["sources"],
         ],
-        "live_connectors_enabled": should_run_live,
+        "live_connectors_enabled": live_enabled,
         "live_connector_errors": live_result["errors"],
-        "active_connectors": connectors_override or [],
+        "active_connectors": active_connectors,
         "live_connector_results": live_result.get("connector_results", []),
+        "live_connector_timings_ms": live_result.get("timings_ms", {}),
+        "live_connector_fetched_at": fetched_at,
     }
     return profile_copy
+
+
+def enrich_profile(
+    profile: Dict[str, Any],
+    live_enabled: Optional[bool] = None,
+    connectors_override: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Mock enrichment layer for demo reliability.
+
+    In production, this is where connectors for company sites, social data, and
+    funding databases would normalize and merge additional signals.
+    """
+
+    should_run_live = (os.getenv("ENABLE_LIVE_ENRICHMENT", "0") == "1") if live_enabled is None else live_enabled
+    live_result = run_live_connectors(profile, connectors=connectors_override) if should_run_live else {
+        "tags": [],
+        "confidence_delta": 0.0,
+        "sources": [],
+        "errors": [],
+    }
+    now = datetime.now(timezone.utc).isoformat()
+    fetched_at = {row["connector"]: now for row in live_result.get("connector_results", [])}
+    return _with_enrichment(profile, live_result, should_run_live, connectors_override or [], fetched_at)
+
+
+def refresh_enrichment(
+    profile: Dict[str, Any],
+    live_enabled: Optional[bool] = None,
+    connectors_override: Optional[List[str]] = None,
+) -> Dict[str, Any]:
+    """Run enrich_profile and store the connector results for cached reads.
+
+    Results that came back with errors (failures, deadline misses) are not stored,
+    so the previously stored result for that connector stays in place.
+    """
+    enriched = enrich_profile(profile, live_enabled=live_enabled, connectors_override=connectors_override)
+    enrichment = enriched["enrichment"]
+    content_hash = profile_content_hash(profile)
+    rows = [
+        {
+            "connector": result["connector"],
+            "content_hash": content_hash,
+            "result": json.dumps(result),
+            "fetched_at": enrichment["live_connector_fetched_at"][result["connector"]],
+        }
+        for result in enrichment["live_connector_results"]
+        if not result["errors"]
+    ]
+    put_enrichment_results(str(profile.get("id", "")), rows)
+    return enriched
+
+
+def load_enrichment_store(profile_id: Optional[str] = None) -> Dict[str, List[Dict[str, Any]]]:
+    """Stored connector results grouped by profile id; empty when the store is unavailable."""
+    try:
+        rows = get_enrichment_results(profile_id)
+    except Exception:
+        return {}
+    by_profile: Dict[str, List[Dict[str, Any]]] = {}
+    for row in rows:
+        by_profile.setdefault(row["profile_id"], []).append(row)
+    return by_profile
+
+
+def enrich_profile_cached(
+    profile: Dict[str, Any],
+    stored_rows: List[Dict[str, Any]],
+    now: Optional[datetime] = None,
+) -> Dict[str, Any]:
+    """Enrichment built from stored connector results only; never calls a connector.
+
+    Rows stored for an older version of the profile (content hash mismatch) or past
+    their connector TTL are ignored.
+    """
+    now = now or datetime.now(timezone.utc)
+    content_hash = profile_content_hash(profile)
+    fresh: List[Dict[str, Any]] = []
+    fetched_at: Dict[str, str] = {}
+    for row in sorted(stored_rows, key=lambda r: r["connector"]):
+        if row["content_hash"] != content_hash:
+            continue
+        try:
+            fetched = datetime.fromisoformat(row["fetched_at"])
+            result = json.loads(row["result"])
+        except (TypeError, ValueError):
+            continue
+        if now - fetched > timedelta(seconds=connector_ttl_seconds(row["connector"])):
+            continue
+        fresh.append(result)
+        fetched_at[row["connector"]] = row["fetched_at"]
+
+    live_result = merge_connector_results(fresh)
+    return _with_enrichment(profile, live_result, bool(fresh), [r["connector"] for r in fresh], fetched_at)
+
+
+def enrich_profiles_cached(profiles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    store = load_enrichment_store(str(profiles[0].get("id", ""))) if len(profiles) == 1 else load_enrichment_store()
+    now = datetime.now(timezone.utc)
+    return [enrich_profile_cached(p, store.get(str(p.get("id", "")), []), now=now) for p in profiles]
@@ -2,11 +2,14 @@ from __future__ import annotations
 
 import json
 import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
 
+RationaleItem = Tuple[Dict[str, Any], Dict[str, Any], float, float, float]
+
+
 def _template_rationale(
     a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float
 ) -> str:
@@ -30,15 +33,47 @@ def _llm_enabled() -> bool:
     return os.getenv("ENABLE_LLM_RATIONALE", "0") == "1" and bool(os.getenv("OPENAI_API_KEY"))
 
 
+def _openai_responses_url() -> str:
+    base = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+    return f"{base}/responses"
+
+
+def _batch_size() -> int:
+    try:
+        return max(1, int(os.getenv("OPENAI_RATIONALE_BATCH_SIZE", "25")))
+    except ValueError:
+        return 25
+
+
+def _post_responses(payload: Dict[str, Any], timeout: float) -> str:
+    req = Request(
+        url=_openai_responses_url(),
+        data=json.dumps(payload).encode("utf-8"),
+        headers={
+            "Authorization": f"Bearer {os.getenv('OPENAI_API_KEY', '')}",
+            "Content-Type": "application/json",
+        },
+        method="POST",
+    )
+    with urlopen(req, timeout=timeout) as response:
+        body = json.loads(response.read().decode("utf-8"))
+    return str(body.get("output_text", "")).strip()
+
+
+def _pair_prompt(a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float) -> Dict[str, Any]:
+    return {
+        "source": {"name": a.get("name"), "role": a.get("title"), "org": a.get("organization")},
+        "target": {"name": b.get("name"), "role": b.get("title"), "org": b.get("organization")},
+        "scores": {"fit": fit, "complementarity": comp, "readiness": ready},
+    }
+
+
 def _openai_rationale(
     a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float
 ) -> str:
-    api_key = os.getenv("OPENAI_API_KEY", "")
     model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
     prompt = {
-        "source": {"name": a.get("name"), "role": a.get("title"), "org": a.get("organization")},
-        "target": {"name": b.get("name"), "role": b.get("title"), "org": b.get("organization")},
-        "scores": {"fit": fit, "complementarity": comp, "readiness": ready},
+        **_pair_prompt(a, b, fit, comp, ready),
         "task": "Write one concise sentence explaining why this intro is high-value and near-term actionable.",
     }
 
@@ -50,29 +85,91 @@ def _openai_rationale(
         ],
         "max_output_tokens": 80,
     }
-    req = Request(
-        url="https://api.openai.com/v1/responses",
-        data=json.dumps(payload).encode("utf-8"),
-        headers={
-            "Authorization": f"Bearer {api_key}",
-            "Content-Type": "application/json",
-        },
-        method="POST",
-    )
-    with urlopen(req, timeout=6) as response:
-        body = json.loads(response.read().decode("utf-8"))
-    text = body.get("output_text", "").strip()
+    text = _post_responses(payload, timeout=6)
     if text:
         return text
     raise ValueError("No output_text in OpenAI response")
 
 
-def generate_match_rationale(
+def _parse_batch_output(text: str, count: int) -> List[Optional[str]]:
+    cleaned = text.strip()
+    if cleaned.startswith("```"):
+        cleaned = cleaned.strip("`")
+        cleaned = cleaned[cleaned.find("\n") + 1 :] if "\n" in cleaned else cleaned
+    parsed = json.loads(cleaned)
+    if isinstance(parsed, dict):
+        parsed = parsed.get("rationales", [])
+    if not isinstance(parsed, list):
+        raise ValueError("Batch rationale output is not a JSON array")
+
+    out: List[Optional[str]] = [None] * count
+    for position, entry in enumerate(parsed):
+        if isinstance(entry, dict):
+            index, value = entry.get("index", position), entry.get("rationale")
+        else:
+            index, value = position, entry
+        if isinstance(index, int) and 0 <= index < count and isinstance(value, str) and value.strip():
+            out[index] = value.strip()
+    return out
+
+
+def _openai_rationale_batch(items: Sequence[RationaleItem]) -> List[Optional[str]]:
+    model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini")
+    prompt = {
+        "pairs": [{"index": idx, **_pair_prompt(*item)} for idx, item in enumerate(items)],
+        "task": (
+            "For each pair write one concise sentence explaining why this intro is high-value and "
+            "near-term actionable. Respond only with a JSON array of objects "
+            '{"index": <pair index>, "rationale": <sentence>}.'
+        ),
+    }
+    payload = {
+        "model": model,
+        "input": [
+            {"role": "system", "content": "You write concise B2B matchmaking rationales for conference organizers."},
+            {"role": "user", "content": json.dumps(prompt)},
+        ],
+        "max_output_tokens": 80 * len(items),
+    }
+    text = _post_responses(payload, timeout=20)
+    if not text:
+        raise ValueError("No output_text in OpenAI response")
+    return _parse_batch_output(text, len(items))
+
+
+def _llm_rationale_batch(items: Sequence[RationaleItem]) -> List[Optional[str]]:
+    """LLM rationales for many pairs in ceil(len / batch size) requests; None marks items that failed."""
+    out: List[Optional[str]] = []
+    size = _batch_size()
+    for start in range(0, len(items), size):
+        chunk = items[start : start + size]
+        try:
+            out.extend(_openai_rationale_batch(chunk))
+        except (HTTPError, URLError, TimeoutError, ValueError, json.JSONDecodeError):
+            out.extend([None] * len(chunk))
+    return out
+
+
+def _llm_rationale(
     a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float
-) -> str:
-    if not _llm_enabled():
-        return _template_rationale(a, b, fit, comp, ready)
+) -> Optional[str]:
     try:
         return _openai_rationale(a, b, fit, comp, ready)
     except (HTTPError, URLError, TimeoutError, ValueError, json.JSONDecodeError):
+        return None
+
+
+def generate_match_rationale(
+    a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float
+) -> str:
+    if not _llm_enabled():
         return _template_rationale(a, b, fit, comp, ready)
+    return _llm_rationale(a, b, fit, comp, ready) or _template_rationale(a, b, fit, comp, ready)
+
+
+def generate_match_rationales(items: Sequence[RationaleItem]) -> List[str]:
+    """Batch variant of generate_match_rationale; items that the LLM misses fall back to the template."""
+    if not _llm_enabled():
+        return [_template_rationale(*item) for item in items]
+    texts = _llm_rationale_batch(items)
+    return [text or _template_rationale(*item) for item, text in zip(items, texts)]
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, Optional
+
+from app.profiles import ProfileRepository, validate_profile_minimum
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+DEFAULT_PROGRESS_EVERY = 1000
+
+
+class ProfileStreamIngest:
+    """Incremental NDJSON profile ingestion (one profile object per line).
+
+    Each line is validated as it arrives and copied to a temporary spool file;
+    only an id -> spool offset index stays in memory. commit() streams the
+    spooled profiles into the profiles table in one transaction, so readers see
+    either the old list or the new one and an invalid line leaves the table
+    untouched. With overwrite=False the existing profiles keep their position
+    and are replaced by id, the same merge POST /api/profiles/ingest does. A
+    repeated id in the stream keeps its first position and its last value.
+    """
+
+    def __init__(
+        self,
+        repository: ProfileRepository,
+        overwrite: bool = True,
+        progress: Optional[ProgressCallback] = None,
+        progress_every: int = DEFAULT_PROGRESS_EVERY,
+        spool_dir: Optional[Path] = None,
+    ) -> None:
+        self.repository = repository
+        self.overwrite = overwrite
+        self.progress = progress
+        self.progress_every = max(1, progress_every)
+        self.received = 0
+        self.bytes_read = 0
+        self.lines = 0
+        self.started_at = datetime.now(timezone.utc).isoformat()
+        self._offsets: Dict[str, int] = {}
+        self._pending = b""
+        self._spool = tempfile.NamedTemporaryFile(
+            mode="w+b", dir=spool_dir, prefix=".ingest-", suffix=".ndjson", delete=False
+        )
+        self._closed = False
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "received": self.received,
+            "unique_ids": len(self._offsets),
+            "lines": self.lines,
+            "bytes": self.bytes_read,
+            "started_at": self.started_at,
+        }
+
+    def _report(self) -> None:
+        if self.progress is not None:
+            self.progress(self.status())
+
+    def feed_line(self, line: bytes | str) -> None:
+        raw = line.encode("utf-8") if isinstance(line, str) else line
+        self.lines += 1
+        text = raw.strip()
+        if not text:
+            return
+        try:
+            profile = json.loads(text)
+        except ValueError as exc:
+            raise ValueError(f"line {self.lines}: invalid JSON ({exc.msg})") from None
+        try:
+            validate_profile_minimum(profile)
+        except ValueError as exc:
+            raise ValueError(f"line {self.lines}: {exc}") from None
+
+        offset = self._spool.tell()
+        self._spool.write(json.dumps(profile).encode("utf-8") + b"\n")
+        self._offsets[str(profile["id"])] = offset
+        self.received += 1
+        if self.received % self.progress_every == 0:
+            self._report()
+
+    def feed(self, chunk: bytes) -> None:
+        """Accept an arbitrary slice of the upload; lines may span chunks."""
+        self.bytes_read += len(chunk)
+        data = self._pending + chunk
+        lines = data.split(b"\n")
+        self._pending = lines.pop()
+        for line in lines:
+            self.feed_line(line)
+
+    def feed_lines(self, lines: Iterable[bytes | str]) -> None:
+        for line in lines:
+            if isinstance(line, bytes):
+                self.bytes_read += len(line)
+            self.feed_line(line)
+
+    def _spooled(self, offset: int) -> bytes:
+        self._spool.seek(offset)
+        return self._spool.readline().rstrip(b"\n")
+
+    def _spooled_profiles(self) -> Iterator[Dict[str, Any]]:
+        for offset in self._offsets.values():
+            yield json.loads(self._spooled(offset))
+
+    def commit(self) -> Dict[str, Any]:
+        """Write the spooled profiles in one transaction and return the final counts."""
+        if self._pending:
+            self.feed_line(self._pending)
+            self._pending = b""
+        self._spool.flush()
+
+        try:
+            if self.overwrite:
+                written = self.repository.persist_stream(self._spooled_profiles())
+            else:
+                written = self.repository.merge(self._spooled_profiles(), keep_in_memory=False)
+        finally:
+            self.close()
+
+        result = self.status()
+        result["stored_profiles"] = written
+        result["overwrite"] = self.overwrite
+        self._report()
+        return result
+
+    def close(self) -> None:
+        """Drop the spool file; stored profiles are left untouched unless commit() ran."""
+        if self._closed:
+            return
+        self._closed = True
+        self._spool.close()
+        Path(self._spool.name).unlink(missing_ok=True)
+
+    def __enter__(self) -> "ProfileStreamIngest":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
@@ -3,80 +3,39 @@ from __future__ import annotations
 import json
 from datetime import datetime, timezone
 from http.server import BaseHTTPRequestHandler, HTTPServer
-from pathlib import Path
 from urllib.parse import parse_qs, urlparse
 
-from app.db import action_map, backend_summary, get_all_actions, init_db, upsert_action
-from app.enrichment import enrich_profile
+from app.db import (
+    attach_pair_actions,
+    backend_summary,
+    count_actions,
+    get_all_actions,
+    init_db,
+    upsert_action,
+    with_actions,
+)
+from app.enrichment import enrich_profiles_cached
+from app.ingest import ProfileStreamIngest
 from app.matching import generate_all_matches, top_intro_pairs, top_non_obvious_pairs
+from app.profiles import DATA_PATH, PROFILE_REPOSITORY, ROOT, RUNTIME_SOURCE, validate_profile_minimum
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA_PATH = ROOT / "data" / "test_profiles.json"
-INGESTED_DATA_PATH = ROOT / "data" / "runtime_profiles.json"
 STATIC_DIR = ROOT / "app" / "static"
 
 
-def _active_profiles_path() -> Path:
-    return INGESTED_DATA_PATH if INGESTED_DATA_PATH.exists() else DATA_PATH
-
-
 def _read_raw_profiles():
-    with open(_active_profiles_path(), "r", encoding="utf-8") as f:
-        loaded = json.load(f)
-    if not isinstance(loaded, list):
-        raise ValueError("profiles source must be a JSON array")
-    return loaded
+    return PROFILE_REPOSITORY.profiles()
 
 
 def _load_profiles():
-    return [enrich_profile(p) for p in _read_raw_profiles()]
-
-
-def _validate_profile_minimum(profile):
-    if not profile.get("id"):
-        raise ValueError("profile missing id")
-    if not profile.get("name"):
-        raise ValueError("profile missing name")
+    return enrich_profiles_cached(_read_raw_profiles())
 
 
 def _write_profiles(profiles, overwrite=True):
     for p in profiles:
-        _validate_profile_minimum(p)
-
-    if not overwrite and INGESTED_DATA_PATH.exists():
-        existing = json.loads(INGESTED_DATA_PATH.read_text(encoding="utf-8"))
-        by_id = {str(x["id"]): x for x in existing if isinstance(x, dict) and x.get("id")}
-        for p in profiles:
-            by_id[str(p["id"])] = p
-        merged = list(by_id.values())
-        INGESTED_DATA_PATH.write_text(json.dumps(merged, indent=2), encoding="utf-8")
-        return len(merged)
-
-    INGESTED_DATA_PATH.write_text(json.dumps(profiles, indent=2), encoding="utf-8")
-    return len(profiles)
-
-
-def _merge_actions(per_profile):
-    actions = action_map()
-    merged = {}
-    for source_id, matches in per_profile.items():
-        rows = []
-        for match in matches:
-            key = f"{source_id}::{match['target_id']}"
-            copy = dict(match)
-            copy["action"] = actions.get(
-                key,
-                {
-                    "from_id": source_id,
-                    "to_id": match["target_id"],
-                    "status": "pending",
-                    "notes": "",
-                    "updated_at": "",
-                },
-            )
-            rows.append(copy)
-        merged[source_id] = rows
-    return merged
+        validate_profile_minimum(p)
+    if overwrite:
+        return PROFILE_REPOSITORY.persist(profiles)
+    return PROFILE_REPOSITORY.merge(profiles)
 
 
 class MatchmakingHandler(BaseHTTPRequestHandler):
@@ -128,14 +87,14 @@ class MatchmakingHandler(BaseHTTPRequestHandler):
             self._json({"status": "ok", "mode": "fallback", "db_backend": backend_summary()["backend"]})
             return
         if parsed.path == "/api/profiles":
-            self._json({"profiles": _load_profiles(), "source": _active_profiles_path().name})
+            self._json({"profiles": _load_profiles(), "source": PROFILE_REPOSITORY.source_name()})
             return
         if parsed.path == "/api/actions":
             self._json({"actions": get_all_actions()})
             return
         if parsed.path == "/api/matches":
             profiles = _load_profiles()
-            per_profile = _merge_actions(generate_all_matches(profiles))
+            per_profile = with_actions(generate_all_matches(profiles))
             profile_id = parse_qs(parsed.query).get("profile_id", [None])[0]
             if profile_id:
                 if profile_id not in per_profile:
@@ -149,51 +108,15 @@ class MatchmakingHandler(BaseHTTPRequestHandler):
             profiles = _load_profiles()
             limit = int(parse_qs(parsed.query).get("limit", [5])[0])
             pairs = top_non_obvious_pairs(profiles, limit=max(1, min(limit, 20)))
-            actions = action_map()
-            for row in pairs:
-                key = f"{row['from_id']}::{row['to_id']}"
-                row["action"] = actions.get(
-                    key,
-                    {
-                        "from_id": row["from_id"],
-                        "to_id": row["to_id"],
-                        "status": "pending",
-                        "notes": "",
-                        "updated_at": "",
-                    },
-                )
+            attach_pair_actions(pairs)
             self._json({"non_obvious_pairs": pairs})
             return
         if parsed.path == "/api/dashboard":
             profiles = _load_profiles()
             pairs = top_intro_pairs(profiles, limit=10)
             non_obvious = top_non_obvious_pairs(profiles, limit=5)
-            per_profile = _merge_actions(generate_all_matches(profiles))
-            actions = action_map()
-            for row in pairs:
-                key = f"{row['from_id']}::{row['to_id']}"
-                row["action"] = actions.get(
-                    key,
-                    {
-                        "from_id": row["from_id"],
-                        "to_id": row["to_id"],
-                        "status": "pending",
-                        "notes": "",
-                        "updated_at": "",
-                    },
-                )
-            for row in non_obvious:
-                key = f"{row['from_id']}::{row['to_id']}"
-                row["action"] = actions.get(
-                    key,
-                    {
-                        "from_id": row["from_id"],
-                        "to_id": row["to_id"],
-                        "status": "pending",
-                        "notes": "",
-                        "updated_at": "",
-                    },
-                )
+            per_profile = with_actions(generate_all_matches(profiles))
+            attach_pair_actions(pairs, non_obvious)
 
             risk_counts = {"low": 0, "medium": 0, "high": 0}
             for rows in per_profile.values():
@@ -207,7 +130,7 @@ class MatchmakingHandler(BaseHTTPRequestHandler):
                     "overview": {
                         "attendee_count": len(profiles),
                         "recommended_intro_count": len(pairs),
-                        "actioned_intro_count": len(get_all_actions()),
+                        "actioned_intro_count": count_actions()["total"],
                         "risk_distribution": risk_counts,
                     },
                     "top_intro_pairs": pairs,
@@ -222,9 +145,29 @@ class MatchmakingHandler(BaseHTTPRequestHandler):
             return
         self._text("Not found", status=404)
 
+    def _ingest_stream(self, parsed, content_len):
+        overwrite = parse_qs(parsed.query).get("overwrite", ["true"])[0].lower() != "false"
+        remaining = content_len
+        with ProfileStreamIngest(PROFILE_REPOSITORY, overwrite=overwrite) as ingest:
+            try:
+                while remaining > 0:
+                    chunk = self.rfile.read(min(remaining, 64 * 1024))
+                    if not chunk:
+                        break
+                    remaining -= len(chunk)
+                    ingest.feed(chunk)
+                result = ingest.commit()
+            except ValueError as exc:
+                self._json({"error": str(exc)}, status=400)
+                return
+        self._json({"status": "ok", "source": RUNTIME_SOURCE, **result})
+
     def do_POST(self):
         parsed = urlparse(self.path)
         content_len = int(self.headers.get("Content-Length", "0"))
+        if parsed.path == "/api/profiles/ingest/stream":
+            self._ingest_stream(parsed, content_len)
+            return
         payload = json.loads(self.rfile.read(content_len).decode("utf-8")) if content_len else {}
 
         if parsed.path == "/api/actions":
@@ -258,15 +201,14 @@ class MatchmakingHandler(BaseHTTPRequestHandler):
                 {
                     "status": "ok",
                     "stored_profiles": count,
-                    "source": INGESTED_DATA_PATH.name,
+                    "source": RUNTIME_SOURCE,
                     "overwrite": overwrite,
                 }
             )
             return
 
         if parsed.path == "/api/profiles/reset":
-            if INGESTED_DATA_PATH.exists():
-                INGESTED_DATA_PATH.unlink()
+            PROFILE_REPOSITORY.clear_runtime()
             self._json({"status": "ok", "source": DATA_PATH.name})
             return
 
@@ -275,6 +217,7 @@ class MatchmakingHandler(BaseHTTPRequestHandler):
 
 def run(host: str, port: int) -> None:
     init_db()
+    PROFILE_REPOSITORY.import_legacy_runtime()
     server = HTTPServer((host, port), MatchmakingHandler)
     print(f"Fallback server running at http://{host}:{port}")
     server.serve_forever()
@@ -1,43 +1,69 @@
 from __future__ import annotations
 
-import json
+import asyncio
+import threading
 import uuid
 from datetime import datetime, timezone
-from pathlib import Path
-from typing import Any, Dict, List, Literal, Optional
+from typing import Any, Dict, FrozenSet, Iterator, List, Literal, Optional, Tuple
 
-from fastapi import Depends, FastAPI, Header, HTTPException, Query, Response
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, JSONResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel, Field
 
+from app import db_async
 from app.auth import bearer_token, create_access_token, decode_access_token, hash_password, verify_password
+from app.chat_peers import ChatPeerAllowlist
 from app.concierge import concierge_reply
+from app.dashboard_cache import DashboardCache, etag_matches, variant_etag
 from app.db import (
-    action_map,
+    action_signature,
+    attach_pair_actions,
     backend_summary,
+    count_actions,
     create_user,
-    get_all_actions,
-    get_chat_messages_between,
-    get_recent_chat_activity_for_user,
+    delete_enrichment_results,
+    enrichment_signature,
     get_user_by_email,
     get_user_by_id,
     init_db,
-    insert_chat_message,
     list_users,
+    pool_stats,
     update_user_profile_fields,
-    upsert_action,
+    with_actions,
 )
-from app.enrichment import enrich_profile
-from app.matching import generate_all_matches, top_intro_pairs, top_non_obvious_pairs
+from app.enrichment import enrich_profiles_cached, refresh_enrichment
+from app.ingest import ProfileStreamIngest
+from app.match_export import NDJSON_MEDIA_TYPE, ndjson_lines
+from app.match_graph import MatchGraph
+from app.match_paging import (
+    StaleCursor,
+    decode_cursor,
+    encode_cursor,
+    page_of,
+    page_window,
+    parse_fields,
+    project_rows,
+    wants,
+)
+from app.matching import fill_rationales, top_intro_pairs, top_non_obvious_pairs
+from app.profiles import DATA_PATH, PROFILE_REPOSITORY, ROOT, RUNTIME_SOURCE, validate_profile_minimum
+from app.rationale_cache import RATIONALE_CACHE
 
 
-ROOT = Path(__file__).resolve().parents[1]
-DATA_PATH = ROOT / "data" / "test_profiles.json"
-INGESTED_DATA_PATH = ROOT / "data" / "runtime_profiles.json"
 STATIC_DIR = ROOT / "app" / "static"
 
+MATCH_GRAPH = MatchGraph()
+CHAT_PEERS = ChatPeerAllowlist(top_k=4)
+DASHBOARD_CACHE = DashboardCache()
+INGEST_LOCK = threading.Lock()
+INGEST_STATUS: Dict[str, Any] = {"state": "idle"}
+
+EXPORT_SOURCES_PER_CHUNK = 50
+INGEST_FEED_BATCH_BYTES = 1 << 20
+
 ROLE_CHOICES = {"vip", "speaker", "sponsor", "delegate", "attendee"}
 
 
@@ -48,6 +74,10 @@ class ActionUpsert(BaseModel):
     notes: str = Field(default="")
 
 
+class ActionBulkUpsert(BaseModel):
+    actions: List[ActionUpsert] = Field(min_length=1, max_length=1000)
+
+
 class ProfileIngestRequest(BaseModel):
     profiles: List[Dict[str, Any]]
     overwrite: bool = True
@@ -95,6 +125,15 @@ class ConciergeChatRequest(BaseModel):
     history: List[Dict[str, str]] = Field(default_factory=list)
 
 
+class PairRef(BaseModel):
+    from_id: str = Field(min_length=1)
+    to_id: str = Field(min_length=1)
+
+
+class RationaleRequest(BaseModel):
+    pairs: List[PairRef] = Field(min_length=1, max_length=200)
+
+
 class EnrichmentRefreshRequest(BaseModel):
     profile_id: Optional[str] = None
     live_enabled: bool = True
@@ -121,60 +160,36 @@ app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 @app.on_event("startup")
 def on_startup() -> None:
     init_db()
+    PROFILE_REPOSITORY.import_legacy_runtime()
 
 
-def _utc_now() -> str:
-    return datetime.now(timezone.utc).isoformat()
+@app.on_event("shutdown")
+def on_shutdown() -> None:
+    db_async.DB_EXECUTOR.shutdown()
 
 
-def _active_profiles_path() -> Path:
-    return INGESTED_DATA_PATH if INGESTED_DATA_PATH.exists() else DATA_PATH
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
 
 
 def _read_raw_profiles() -> List[Dict[str, Any]]:
-    path = _active_profiles_path()
-    with open(path, "r", encoding="utf-8") as f:
-        loaded = json.load(f)
-    if not isinstance(loaded, list):
-        raise ValueError("profiles source must be a JSON array")
-    return loaded
-
-
-def _persist_runtime_profiles(profiles: List[Dict[str, Any]]) -> None:
-    INGESTED_DATA_PATH.write_text(json.dumps(profiles, indent=2), encoding="utf-8")
-
-
-def _validate_profile_minimum(profile: Dict[str, Any]) -> None:
-    if not profile.get("id"):
-        raise ValueError("profile missing id")
-    if not profile.get("name"):
-        raise ValueError("profile missing name")
+    return PROFILE_REPOSITORY.profiles()
 
 
 def _write_profiles(profiles: List[Dict[str, Any]], overwrite: bool) -> int:
     for p in profiles:
-        _validate_profile_minimum(p)
-
-    if not overwrite and INGESTED_DATA_PATH.exists():
-        existing = json.loads(INGESTED_DATA_PATH.read_text(encoding="utf-8"))
-        by_id = {str(x["id"]): x for x in existing if isinstance(x, dict) and x.get("id")}
-        for p in profiles:
-            by_id[str(p["id"])] = p
-        merged = list(by_id.values())
-        _persist_runtime_profiles(merged)
-        return len(merged)
-
-    _persist_runtime_profiles(profiles)
-    return len(profiles)
+        validate_profile_minimum(p)
+    if overwrite:
+        return PROFILE_REPOSITORY.persist(profiles)
+    return PROFILE_REPOSITORY.merge(profiles)
 
 
 def _upsert_runtime_profile(profile: Dict[str, Any]) -> None:
-    _validate_profile_minimum(profile)
-    current = _read_raw_profiles()
-    by_id = {str(x.get("id")): x for x in current if isinstance(x, dict) and x.get("id")}
-    by_id[str(profile["id"])] = profile
-    merged = list(by_id.values())
-    _persist_runtime_profiles(merged)
+    validate_profile_minimum(profile)
+    # One row upsert; the other profiles are not rewritten.
+    PROFILE_REPOSITORY.upsert(profile)
+    # Only this profile's row and column are re-scored.
+    _match_graph()
 
 
 def _sanitize_user(user: Dict[str, Any]) -> Dict[str, Any]:
@@ -204,66 +219,45 @@ def _profile_from_user_input(profile_id: str, payload: ProfileUpdateRequest | Re
 
 
 def load_profiles() -> List[Dict[str, Any]]:
-    return [enrich_profile(p) for p in _read_raw_profiles()]
+    # Read-only: live connectors only run through /api/enrichment/refresh.
+    return enrich_profiles_cached(_read_raw_profiles())
+
+
+def _match_graph() -> MatchGraph:
+    version, raw_profiles = PROFILE_REPOSITORY.snapshot()
+    MATCH_GRAPH.sync(raw_profiles, source_version=version)
+    return MATCH_GRAPH
 
 
 def _raw_profile_by_id(profile_id: str) -> Optional[Dict[str, Any]]:
-    for profile in _read_raw_profiles():
-        if str(profile.get("id", "")) == profile_id:
-            return profile
-    return None
+    return PROFILE_REPOSITORY.get(profile_id)
 
 
 def _profile_by_id(profile_id: str) -> Optional[Dict[str, Any]]:
-    for profile in load_profiles():
-        if str(profile.get("id", "")) == profile_id:
-            return profile
-    return None
-
-
-def with_actions(per_profile: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
-    actions = action_map()
-    merged: Dict[str, List[Dict[str, Any]]] = {}
-    for source_id, matches in per_profile.items():
-        out: List[Dict[str, Any]] = []
-        for match in matches:
-            key = f"{source_id}::{match['target_id']}"
-            match_copy = dict(match)
-            match_copy["action"] = actions.get(
-                key,
-                {
-                    "from_id": source_id,
-                    "to_id": match["target_id"],
-                    "status": "pending",
-                    "notes": "",
-                    "updated_at": "",
-                },
-            )
-            out.append(match_copy)
-        merged[source_id] = out
-    return merged
-
-
-def _authenticated_user(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
+    raw = PROFILE_REPOSITORY.get(profile_id)
+    return enrich_profiles_cached([raw])[0] if raw else None
+
+
+async def _authenticated_user(authorization: Optional[str] = Header(default=None)) -> Dict[str, Any]:
     try:
         token = bearer_token(authorization)
         payload = decode_access_token(token)
     except ValueError as exc:
         raise HTTPException(status_code=401, detail=str(exc)) from exc
 
-    user = get_user_by_id(str(payload.get("sub", "")))
+    user = await db_async.get_user_by_id(str(payload.get("sub", "")))
     if not user:
         raise HTTPException(status_code=401, detail="user not found")
     return user
 
 
-def _optional_user(authorization: Optional[str] = Header(default=None)) -> Optional[Dict[str, Any]]:
+async def _optional_user(authorization: Optional[str] = Header(default=None)) -> Optional[Dict[str, Any]]:
     if not authorization:
         return None
     try:
         token = bearer_token(authorization)
         payload = decode_access_token(token)
-        return get_user_by_id(str(payload.get("sub", "")))
+        return await db_async.get_user_by_id(str(payload.get("sub", "")))
     except ValueError:
         return None
 
@@ -279,24 +273,19 @@ def _admin_user(user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str
     return user
 
 
-def _allowed_chat_peer_ids(user: Dict[str, Any], profiles_list: List[Dict[str, Any]]) -> set[str]:
-    users = list_users()
-    profile_to_user = {u["profile_id"]: u["id"] for u in users}
-    current_profile_id = user.get("profile_id", "")
-    if not current_profile_id:
-        return set()
+def _refresh_chat_peers() -> MatchGraph:
+    graph = _match_graph()
+    CHAT_PEERS.refresh(graph)
+    return graph
 
-    per_profile = generate_all_matches(profiles_list)
-    current_targets = {m["target_id"] for m in per_profile.get(current_profile_id, [])[:4]}
 
-    allowed: set[str] = set()
-    for profile_id, user_id in profile_to_user.items():
-        if user_id == user["id"]:
-            continue
-        reverse_targets = {m["target_id"] for m in per_profile.get(profile_id, [])[:4]}
-        if profile_id in current_targets or current_profile_id in reverse_targets:
-            allowed.add(user_id)
-    return allowed
+async def _chat_peer_graph() -> MatchGraph:
+    """Sync the match graph and chat neighbours on the request threadpool.
+
+    A profile change can make this an O(N^2) graph rebuild, which must not hold
+    a DB executor worker; the allowlist lookups that follow only query users.
+    """
+    return await run_in_threadpool(_refresh_chat_peers)
 
 
 @app.get("/", include_in_schema=False)
@@ -314,6 +303,11 @@ def health() -> Dict[str, str]:
     return {"status": "ok", "db_backend": backend_summary()["backend"]}
 
 
+@app.get("/api/db/pool")
+def db_pool_stats() -> Dict[str, Any]:
+    return {"pool": pool_stats(), "async_executor": db_async.DB_EXECUTOR.stats()}
+
+
 @app.post("/api/auth/register")
 def register(payload: RegisterRequest) -> Dict[str, Any]:
     email = payload.email.strip().lower()
@@ -379,12 +373,11 @@ def update_my_profile(payload: ProfileUpdateRequest, user: Dict[str, Any] = Depe
 
 @app.get("/api/profiles")
 def profiles() -> Dict[str, Any]:
-    path = _active_profiles_path()
-    return {"profiles": load_profiles(), "source": str(path.name)}
+    return {"profiles": load_profiles(), "source": PROFILE_REPOSITORY.source_name()}
 
 
 @app.get("/api/attendees")
-def attendees(
+async def attendees(
     search: str = Query(default=""),
     role: Optional[str] = Query(default=None),
     roles: Optional[str] = Query(default=None, description="Comma-separated role filters."),
@@ -393,11 +386,12 @@ def attendees(
     multi_filters = {r.strip().lower() for r in (roles or "").split(",") if r.strip()}
     if role_filter:
         multi_filters.add(role_filter)
-    users_by_profile = {u["profile_id"]: u for u in list_users()}
+    users, profiles_list = await asyncio.gather(db_async.list_users(), db_async.run_db(load_profiles))
+    users_by_profile = {u["profile_id"]: u for u in users}
     output: List[Dict[str, Any]] = []
     query = search.lower().strip()
 
-    for profile in load_profiles():
+    for profile in profiles_list:
         user_row = users_by_profile.get(profile.get("id", ""))
         attendee_role = (
             _normalize_role(str(user_row.get("role", "")))
@@ -433,50 +427,113 @@ def ingest_profiles(payload: ProfileIngestRequest) -> Dict[str, Any]:
     return {
         "status": "ok",
         "stored_profiles": count,
-        "source": str(INGESTED_DATA_PATH.name),
+        "source": RUNTIME_SOURCE,
         "overwrite": payload.overwrite,
     }
 
 
+def _ingest_progress(status: Dict[str, Any]) -> None:
+    INGEST_STATUS.update(status)
+
+
+@app.post("/api/profiles/ingest/stream")
+async def ingest_profiles_stream(
+    request: Request,
+    overwrite: bool = True,
+    progress_every: int = Query(default=1000, ge=1),
+) -> Dict[str, Any]:
+    """NDJSON body, one profile per line, merged and written without buffering the upload."""
+    if not INGEST_LOCK.acquire(blocking=False):
+        raise HTTPException(status_code=409, detail="another profile ingest is running")
+    try:
+        INGEST_STATUS.clear()
+        INGEST_STATUS.update({"state": "running", "overwrite": overwrite})
+        # Parsing, validation and spool writes are blocking, so they run on the
+        # threadpool, one batch of up to INGEST_FEED_BATCH_BYTES at a time.
+        ingest = await run_in_threadpool(
+            ProfileStreamIngest,
+            PROFILE_REPOSITORY,
+            overwrite=overwrite,
+            progress=_ingest_progress,
+            progress_every=progress_every,
+        )
+        try:
+            batch: List[bytes] = []
+            batch_bytes = 0
+            async for chunk in request.stream():
+                batch.append(chunk)
+                batch_bytes += len(chunk)
+                if batch_bytes >= INGEST_FEED_BATCH_BYTES:
+                    await run_in_threadpool(ingest.feed, b"".join(batch))
+                    batch, batch_bytes = [], 0
+            if batch:
+                await run_in_threadpool(ingest.feed, b"".join(batch))
+            result = await run_in_threadpool(ingest.commit)
+        except ValueError as exc:
+            INGEST_STATUS.update({"state": "failed", "error": str(exc)})
+            raise HTTPException(status_code=400, detail=str(exc)) from None
+        finally:
+            await run_in_threadpool(ingest.close)
+        INGEST_STATUS.update({"state": "done", "finished_at": _utc_now()})
+    finally:
+        INGEST_LOCK.release()
+    return {"status": "ok", "source": RUNTIME_SOURCE, **result}
+
+
+@app.get("/api/profiles/ingest/status")
+def ingest_status() -> Dict[str, Any]:
+    return dict(INGEST_STATUS)
+
+
 @app.post("/api/profiles/reset")
 def reset_profiles() -> Dict[str, Any]:
-    if INGESTED_DATA_PATH.exists():
-        INGESTED_DATA_PATH.unlink()
+    PROFILE_REPOSITORY.clear_runtime()
     return {"status": "ok", "source": str(DATA_PATH.name)}
 
 
 @app.get("/api/actions")
-def actions() -> Dict[str, List[Dict[str, str]]]:
-    return {"actions": get_all_actions()}
+async def actions() -> Dict[str, List[Dict[str, str]]]:
+    return {"actions": await db_async.get_all_actions()}
 
 
 @app.post("/api/actions")
-def save_action(payload: ActionUpsert) -> Dict[str, str]:
+async def save_action(payload: ActionUpsert) -> Dict[str, str]:
     now = _utc_now()
-    upsert_action(payload.from_id, payload.to_id, payload.status, payload.notes, now)
+    await db_async.upsert_action(payload.from_id, payload.to_id, payload.status, payload.notes, now)
     return {"status": "ok", "updated_at": now}
 
 
 @app.post("/api/admin/actions")
-def save_action_admin(payload: ActionUpsert, _admin: Dict[str, Any] = Depends(_admin_user)) -> Dict[str, str]:
+async def save_action_admin(payload: ActionUpsert, _admin: Dict[str, Any] = Depends(_admin_user)) -> Dict[str, str]:
     now = _utc_now()
-    upsert_action(payload.from_id, payload.to_id, payload.status, payload.notes, now)
+    await db_async.upsert_action(payload.from_id, payload.to_id, payload.status, payload.notes, now)
     return {"status": "ok", "updated_at": now, "admin": _admin.get("email", "")}
 
 
+@app.post("/api/actions/bulk")
+async def save_actions_bulk(payload: ActionBulkUpsert) -> Dict[str, Any]:
+    now = _utc_now()
+    results = await db_async.upsert_actions_bulk([a.model_dump() for a in payload.actions], now)
+    return {"status": "ok", "updated_at": now, "count": len(results), "results": results}
+
+
+@app.post("/api/admin/actions/bulk")
+async def save_actions_bulk_admin(payload: ActionBulkUpsert, _admin: Dict[str, Any] = Depends(_admin_user)) -> Dict[str, Any]:
+    now = _utc_now()
+    results = await db_async.upsert_actions_bulk([a.model_dump() for a in payload.actions], now)
+    return {"status": "ok", "updated_at": now, "count": len(results), "results": results, "admin": _admin.get("email", "")}
+
+
 @app.get("/api/chat/peers")
-def chat_peers(user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str, Any]:
-    profiles_list = load_profiles()
-    allowed = _allowed_chat_peer_ids(user, profiles_list)
-    all_users = list_users()
+async def chat_peers(user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str, Any]:
+    graph = await _chat_peer_graph()
+    allowed, all_users, inbox = await asyncio.gather(
+        db_async.run_db(CHAT_PEERS.allowed_peer_ids, graph, user),
+        db_async.list_users(),
+        db_async.get_chat_inbox(user["id"]),
+    )
     users_by_id = {u["id"]: u for u in all_users}
-    recent = get_recent_chat_activity_for_user(user["id"])
-
-    latest_by_peer: Dict[str, Dict[str, Any]] = {}
-    for msg in recent:
-        peer_id = msg["to_user_id"] if msg["from_user_id"] == user["id"] else msg["from_user_id"]
-        if peer_id not in latest_by_peer:
-            latest_by_peer[peer_id] = msg
+    latest_by_peer = {row["peer_id"]: row for row in inbox}
 
     peers: List[Dict[str, Any]] = []
     for peer_id in allowed:
@@ -492,8 +549,9 @@ def chat_peers(user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str,
                 "organization": peer.get("organization", ""),
                 "role": peer.get("role", "attendee"),
                 "profile_id": peer.get("profile_id", ""),
-                "latest_message": latest.get("body", "") if latest else "",
-                "latest_at": latest.get("created_at", "") if latest else "",
+                "latest_message": latest["last_body"] if latest else "",
+                "latest_at": latest["last_at"] if latest else "",
+                "unread_count": latest["unread_count"] if latest else 0,
             }
         )
 
@@ -502,30 +560,41 @@ def chat_peers(user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str,
 
 
 @app.get("/api/chat/messages/{peer_user_id}")
-def chat_messages(peer_user_id: str, user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str, Any]:
-    profiles_list = load_profiles()
-    allowed = _allowed_chat_peer_ids(user, profiles_list)
-    if peer_user_id not in allowed:
+async def chat_messages(
+    peer_user_id: str,
+    before_id: Optional[int] = Query(default=None, ge=1, description="Page back: newest messages older than this id."),
+    after_id: Optional[int] = Query(default=None, ge=0, description="Page forward: messages newer than this id."),
+    limit: int = Query(default=200, ge=1, le=500),
+    user: Dict[str, Any] = Depends(_authenticated_user),
+) -> Dict[str, Any]:
+    graph = await _chat_peer_graph()
+    if not await db_async.run_db(CHAT_PEERS.is_allowed, graph, user, peer_user_id):
         raise HTTPException(status_code=403, detail="chat is allowed only for matched peers")
-    return {"messages": get_chat_messages_between(user["id"], peer_user_id)}
+    messages = await db_async.get_chat_messages_between(
+        user["id"], peer_user_id, limit=limit, before_id=before_id, after_id=after_id
+    )
+    # Only a read of the newest messages clears unread: paging back into history
+    # (before_id) or an empty after_id poll shows nothing new, so it skips the write.
+    if before_id is None and (after_id is None or messages):
+        await db_async.mark_conversation_read(user["id"], peer_user_id)
+    return {"messages": messages, "limit": limit}
 
 
 @app.post("/api/chat/messages")
-def send_chat_message(payload: ChatMessageCreate, user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str, Any]:
-    profiles_list = load_profiles()
-    allowed = _allowed_chat_peer_ids(user, profiles_list)
-    if payload.to_user_id not in allowed:
+async def send_chat_message(payload: ChatMessageCreate, user: Dict[str, Any] = Depends(_authenticated_user)) -> Dict[str, Any]:
+    graph = await _chat_peer_graph()
+    if not await db_async.run_db(CHAT_PEERS.is_allowed, graph, user, payload.to_user_id):
         raise HTTPException(status_code=403, detail="chat is allowed only for matched peers")
     body = payload.body.strip()
     if not body:
         raise HTTPException(status_code=400, detail="message body cannot be empty")
-    message = insert_chat_message(user["id"], payload.to_user_id, body, _utc_now())
+    message = await db_async.insert_chat_message(user["id"], payload.to_user_id, body, _utc_now())
     return {"status": "ok", "message": message}
 
 
 @app.post("/api/concierge/chat")
 def concierge_chat(payload: ConciergeChatRequest, user: Optional[Dict[str, Any]] = Depends(_optional_user)) -> Dict[str, Any]:
-    dashboard_data = dashboard()
+    _etag, dashboard_data = _dashboard_snapshot()
     profile = _profile_by_id(payload.profile_id) if payload.profile_id else None
     actor = _sanitize_user(user) if user else {}
     response = concierge_reply(
@@ -543,47 +612,142 @@ def concierge_chat(payload: ConciergeChatRequest, user: Optional[Dict[str, Any]]
     }
 
 
+def _page_error(exc: ValueError) -> HTTPException:
+    return HTTPException(status_code=409 if isinstance(exc, StaleCursor) else 400, detail=str(exc))
+
+
+def _match_rows_view(
+    ranked: Dict[str, List[Dict[str, Any]]],
+    include_rationale: bool,
+    fields: Optional[FrozenSet[str]],
+    profiles_by_id: Optional[Dict[str, Dict[str, Any]]] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Attach actions and rationales only when the projection keeps them, then project."""
+    per_profile = with_actions(ranked) if wants(fields, "action") else ranked
+    if include_rationale and wants(fields, "rationale"):
+        by_id = profiles_by_id if profiles_by_id is not None else {str(p.get("id", "")): p for p in load_profiles()}
+        for source_id, rows in per_profile.items():
+            fill_rationales(rows, by_id, source_id=source_id)
+    return {source_id: project_rows(rows, fields) for source_id, rows in per_profile.items()}
+
+
 @app.get("/api/matches")
-def matches(profile_id: Optional[str] = Query(default=None)) -> Dict[str, Any]:
-    profiles_list = load_profiles()
-    per_profile = with_actions(generate_all_matches(profiles_list))
+def matches(
+    profile_id: Optional[str] = Query(default=None),
+    include_rationale: bool = Query(default=True, description="Generate rationale text for the returned rows."),
+    limit: Optional[int] = Query(
+        default=None, ge=1, le=1000, description="Page size: rows of profile_id, or source profiles without it."
+    ),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page."),
+    top_k: Optional[int] = Query(default=None, ge=1, description="Only the top K rows per source profile."),
+    fields: Optional[str] = Query(default=None, description="Comma-separated row fields, e.g. target_id,score,risk_level."),
+) -> Dict[str, Any]:
+    try:
+        wanted = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    graph = _match_graph()
+
     if profile_id:
-        if profile_id not in per_profile:
+        if not _raw_profile_by_id(profile_id):
             raise HTTPException(status_code=404, detail="profile not found")
-        return {"profile_id": profile_id, "matches": per_profile[profile_id]}
-    return {"matches": per_profile}
+        try:
+            offset = decode_cursor(cursor, graph.version)
+        except ValueError as exc:
+            raise _page_error(exc) from None
+        end = page_window(offset, limit, top_k)
+        count = None if end is None else max(end - offset, 0)
+        # One extra row tells whether another page exists.
+        version, ranked = graph.matches([profile_id], top_k=None if count is None else count + 1, offset=offset)
+        rows = ranked.get(profile_id, [])
+        next_cursor = None
+        if count is not None and len(rows) > count:
+            rows = rows[:count]
+            if top_k is None or end < top_k:
+                next_cursor = encode_cursor(version, end)
+        rows = _match_rows_view({profile_id: rows}, include_rationale, wanted)[profile_id]
+        return {"profile_id": profile_id, "matches": rows, "match_graph_version": version, "next_cursor": next_cursor}
+
+    version, source_ids = graph.source_ids()
+    try:
+        offset = decode_cursor(cursor, version)
+    except ValueError as exc:
+        raise _page_error(exc) from None
+    page_ids, next_cursor = page_of(source_ids, offset, limit, version)
+    version, ranked = graph.matches(page_ids, top_k=top_k)
+    per_profile = _match_rows_view(ranked, include_rationale, wanted)
+    return {"matches": per_profile, "match_graph_version": version, "next_cursor": next_cursor}
+
+
+@app.get("/api/matches/export")
+def export_matches(
+    include_rationale: bool = Query(default=True, description="Generate rationale text for exported rows."),
+    top_k: Optional[int] = Query(default=None, ge=1, description="Only the top K rows per source profile."),
+    fields: Optional[str] = Query(default=None, description="Comma-separated row fields, e.g. target_id,score,risk_level."),
+) -> StreamingResponse:
+    """NDJSON stream of every source profile's ranked matches, one line per source.
+
+    Rows are built EXPORT_SOURCES_PER_CHUNK sources at a time from the match
+    graph, so the response never holds the full matrix and clients can start
+    reading right away. Each line carries the graph version it was read at.
+    """
+    try:
+        wanted = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    graph = _match_graph()
+    version, source_ids = graph.source_ids()
+    by_id = None
+    if include_rationale and wants(wanted, "rationale"):
+        by_id = {str(p.get("id", "")): p for p in load_profiles()}
+
+    def lines() -> Iterator[str]:
+        for start in range(0, len(source_ids), EXPORT_SOURCES_PER_CHUNK):
+            chunk_version, ranked = graph.matches(source_ids[start : start + EXPORT_SOURCES_PER_CHUNK], top_k=top_k)
+            view = _match_rows_view(ranked, include_rationale, wanted, profiles_by_id=by_id)
+            yield from ndjson_lines(view.items(), match_graph_version=chunk_version)
+
+    return StreamingResponse(
+        lines(), media_type=NDJSON_MEDIA_TYPE, headers={"X-Match-Graph-Version": str(version)}
+    )
+
+
+@app.post("/api/rationales")
+def rationales(payload: RationaleRequest) -> Dict[str, Any]:
+    by_id = {str(p.get("id", "")): p for p in load_profiles()}
+    rows: List[Dict[str, Any]] = [{"from_id": pair.from_id, "to_id": pair.to_id, "rationale": None} for pair in payload.pairs]
+    fill_rationales(rows, by_id)
+    missing = [row for row in rows if row["rationale"] is None]
+    if missing:
+        raise HTTPException(status_code=404, detail=f"profile not found for pair {missing[0]['from_id']}::{missing[0]['to_id']}")
+    return {"rationales": rows}
+
+
+@app.get("/api/rationales/cache")
+def rationale_cache_stats() -> Dict[str, Any]:
+    return {"rationale_cache": RATIONALE_CACHE.stats()}
 
 
 @app.get("/api/non-obvious-matches")
 def non_obvious_matches(limit: int = Query(default=5, ge=1, le=20)) -> Dict[str, Any]:
     profiles_list = load_profiles()
     pairs = top_non_obvious_pairs(profiles_list, limit=limit)
-    actions = action_map()
-    for row in pairs:
-        key = f"{row['from_id']}::{row['to_id']}"
-        row["action"] = actions.get(
-            key,
-            {
-                "from_id": row["from_id"],
-                "to_id": row["to_id"],
-                "status": "pending",
-                "notes": "",
-                "updated_at": "",
-            },
-        )
+    attach_pair_actions(pairs)
     return {"non_obvious_pairs": pairs}
 
 
 @app.get("/api/dashboard/drilldown")
 def dashboard_drilldown(from_id: str = Query(min_length=1), to_id: str = Query(min_length=1)) -> Dict[str, Any]:
     profiles_list = load_profiles()
-    per_profile = with_actions(generate_all_matches(profiles_list))
-    rows = per_profile.get(from_id, [])
+    by_id = {str(p.get("id", "")): p for p in profiles_list}
+    source = by_id.get(from_id)
+    target = by_id.get(to_id)
+    rows = _match_graph().matches([from_id])[1].get(from_id, []) if source else []
     match_row = next((r for r in rows if r.get("target_id") == to_id), None)
     if not match_row:
         raise HTTPException(status_code=404, detail="match pair not found")
-    source = next((p for p in profiles_list if p.get("id") == from_id), None)
-    target = next((p for p in profiles_list if p.get("id") == to_id), None)
+    match_row = with_actions({from_id: [match_row]})[from_id][0]
+    fill_rationales([match_row], by_id, source_id=from_id)
     return {
         "from_profile": source or {},
         "to_profile": target or {},
@@ -614,60 +778,123 @@ def dashboard_segments() -> Dict[str, Any]:
     }
 
 
-@app.get("/api/dashboard")
-def dashboard() -> Dict[str, Any]:
+def _dashboard_match_part() -> Tuple[Tuple[int, int], Dict[str, Any]]:
+    # per_profile rows stay rationale-free; _dashboard_page fills only the rows a response returns.
+    enrichment_key = enrichment_signature()
     profiles_list = load_profiles()
-    per_profile = with_actions(generate_all_matches(profiles_list))
-    pairs = top_intro_pairs(profiles_list, limit=10)
-    non_obvious = top_non_obvious_pairs(profiles_list, limit=5)
-    actions = action_map()
-
-    for row in pairs:
-        key = f"{row['from_id']}::{row['to_id']}"
-        row["action"] = actions.get(
-            key,
-            {
-                "from_id": row["from_id"],
-                "to_id": row["to_id"],
-                "status": "pending",
-                "notes": "",
-                "updated_at": "",
-            },
-        )
-
-    for row in non_obvious:
-        key = f"{row['from_id']}::{row['to_id']}"
-        row["action"] = actions.get(
-            key,
-            {
-                "from_id": row["from_id"],
-                "to_id": row["to_id"],
-                "status": "pending",
-                "notes": "",
-                "updated_at": "",
-            },
-        )
+    version, ranked = _match_graph().matches()
 
     risk_counts = {"low": 0, "medium": 0, "high": 0}
-    for rows in per_profile.values():
+    for rows in ranked.values():
         for match in rows:
             level = match.get("risk_level", "medium")
             if level in risk_counts:
                 risk_counts[level] += 1
 
+    part = {
+        "attendee_count": len(profiles_list),
+        "ranked": ranked,
+        "top_intro_pairs": top_intro_pairs(profiles_list, limit=10),
+        "top_non_obvious_pairs": top_non_obvious_pairs(profiles_list, limit=5),
+        "risk_distribution": risk_counts,
+        "match_graph_version": version,
+    }
+    return (version, enrichment_key), part
+
+
+def _dashboard_with_actions(part: Dict[str, Any]) -> Dict[str, Any]:
+    pairs = [dict(row) for row in part["top_intro_pairs"]]
+    non_obvious = [dict(row) for row in part["top_non_obvious_pairs"]]
+    attach_pair_actions(pairs, non_obvious)
     return {
         "overview": {
-            "attendee_count": len(profiles_list),
+            "attendee_count": part["attendee_count"],
             "recommended_intro_count": len(pairs),
-            "actioned_intro_count": len(get_all_actions()),
-            "risk_distribution": risk_counts,
+            "actioned_intro_count": count_actions()["total"],
+            "risk_distribution": part["risk_distribution"],
         },
         "top_intro_pairs": pairs,
         "top_non_obvious_pairs": non_obvious,
-        "per_profile": per_profile,
+        "per_profile": with_actions(part["ranked"]),
+        "match_graph_version": part["match_graph_version"],
     }
 
 
+def _dashboard_snapshot() -> Tuple[str, Dict[str, Any]]:
+    """Cached rationale-free dashboard payload and its ETag; keys are read before any data they cover."""
+    action_key = action_signature()
+    match_key = (_match_graph().version, enrichment_signature())
+    return DASHBOARD_CACHE.snapshot(
+        "dashboard",
+        match_key,
+        action_key,
+        _dashboard_match_part,
+        _dashboard_with_actions,
+    )
+
+
+def _dashboard_page(
+    payload: Dict[str, Any],
+    limit: Optional[int],
+    cursor: Optional[str],
+    top_k: Optional[int],
+    fields: Optional[FrozenSet[str]],
+    include_rationale: bool,
+) -> Dict[str, Any]:
+    """A view of a cached snapshot: a page of per_profile sources, top_k rows each, projected.
+
+    Rationales are generated (through the rationale cache) for the returned
+    rows only, on copies, so the shared snapshot stays rationale-free.
+    """
+    version = payload["match_graph_version"]
+    offset = decode_cursor(cursor, version)
+    per_profile = payload["per_profile"]
+    page_ids, next_cursor = page_of(list(per_profile), offset, limit, version)
+    page = {source_id: [dict(row) for row in per_profile[source_id][:top_k]] for source_id in page_ids}
+    if include_rationale:
+        by_id = {str(p.get("id", "")): p for p in load_profiles()}
+        for source_id, rows in page.items():
+            fill_rationales(rows, by_id, source_id=source_id)
+    return {
+        **payload,
+        "per_profile": {source_id: project_rows(rows, fields) for source_id, rows in page.items()},
+        "next_cursor": next_cursor,
+    }
+
+
+@app.get("/api/dashboard")
+def dashboard(
+    request: Request,
+    include_rationale: bool = Query(default=True, description="Generate rationale text for per_profile rows."),
+    limit: Optional[int] = Query(default=None, ge=1, le=1000, description="Source profiles per page of per_profile."),
+    cursor: Optional[str] = Query(default=None, description="next_cursor of the previous page."),
+    top_k: Optional[int] = Query(default=None, ge=1, description="Only the top K per_profile rows per source."),
+    fields: Optional[str] = Query(default=None, description="Comma-separated per_profile row fields."),
+) -> Response:
+    try:
+        wanted = parse_fields(fields)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from None
+    rationale = include_rationale and wants(wanted, "rationale")
+    etag, payload = _dashboard_snapshot()
+    view = rationale or any(param is not None for param in (limit, cursor, top_k, wanted))
+    if view:
+        etag = variant_etag(etag, (rationale, limit, cursor, top_k, sorted(wanted or ())))
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    if view:
+        try:
+            payload = _dashboard_page(payload, limit, cursor, top_k, wanted, rationale)
+        except ValueError as exc:
+            raise _page_error(exc) from None
+    return JSONResponse(payload, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+@app.get("/api/dashboard/cache")
+def dashboard_cache_stats() -> Dict[str, Any]:
+    return {"dashboard_cache": DASHBOARD_CACHE.stats()}
+
+
 @app.get("/api/enrichment")
 def enrichment_overview() -> Dict[str, Any]:
     profiles_list = load_profiles()
@@ -690,15 +917,20 @@ def enrichment_overview() -> Dict[str, Any]:
 
 @app.post("/api/enrichment/refresh")
 def enrichment_refresh(payload: EnrichmentRefreshRequest) -> Dict[str, Any]:
+    """Re-run connectors and update the enrichment store; live_enabled=false clears stored results."""
     if payload.profile_id:
         raw = _raw_profile_by_id(payload.profile_id)
         if not raw:
             raise HTTPException(status_code=404, detail="profile not found")
-        enriched = enrich_profile(raw, live_enabled=payload.live_enabled, connectors_override=payload.connectors or None)
+        if not payload.live_enabled:
+            delete_enrichment_results(payload.profile_id)
+        enriched = refresh_enrichment(raw, live_enabled=payload.live_enabled, connectors_override=payload.connectors or None)
         return {"status": "ok", "profile": enriched, "connectors": payload.connectors}
 
+    if not payload.live_enabled:
+        delete_enrichment_results()
     enriched_all = [
-        enrich_profile(raw, live_enabled=payload.live_enabled, connectors_override=payload.connectors or None)
+        refresh_enrichment(raw, live_enabled=payload.live_enabled, connectors_override=payload.connectors or None)
         for raw in _read_raw_profiles()
     ]
     return {"status": "ok", "profiles": enriched_all, "count": len(enriched_all), "connectors": payload.connectors}
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+import json
+from typing import Any, Dict, IO, Iterable, Iterator, List, Optional, Tuple
+
+from app.matching import candidate_index, matches_for_profile, profile_features
+
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+SourceMatches = Tuple[str, List[Dict[str, Any]]]
+
+
+def iter_profile_matches(
+    profiles: List[Dict[str, Any]],
+    top_k: Optional[int] = None,
+    with_rationale: bool = True,
+    candidates: Optional[str] = None,
+) -> Iterator[SourceMatches]:
+    """Rank one source profile at a time, in profile order.
+
+    Rows are the same as generate_all_matches() produces for that source, but
+    only one source's rows are alive at a time, so memory grows with N instead
+    of N^2. Rationales (when requested) are batched per source.
+    """
+    index = candidate_index(profiles, top_k, candidates)
+    features = index.features if index is not None else [profile_features(p) for p in profiles]
+    for profile, source_features in zip(profiles, features):
+        yield profile["id"], matches_for_profile(
+            profile,
+            profiles,
+            top_k=top_k,
+            with_rationale=with_rationale,
+            index=index,
+            features=features,
+            source_features=source_features,
+        )
+
+
+def ndjson_lines(records: Iterable[SourceMatches], **extra: Any) -> Iterator[str]:
+    """One JSON object per source: {"profile_id": ..., **extra, "matches": [...]}."""
+    for source_id, rows in records:
+        yield json.dumps({"profile_id": source_id, **extra, "matches": rows}) + "\n"
+
+
+def write_ndjson(records: Iterable[SourceMatches], out: IO[str], flush_every: int = 1) -> int:
+    """Write records as NDJSON, flushing so readers can consume while ranking continues; returns lines written."""
+    written = 0
+    for line in ndjson_lines(records):
+        out.write(line)
+        written += 1
+        if written % max(1, flush_every) == 0:
+            out.flush()
+    out.flush()
+    return written
@@ -0,0 +1,177 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from array import array
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from app.matching import (
+    ProfileFeatures,
+    _match_row,
+    _match_score,
+    _pair_components,
+    _weighted_score,
+    compact_vocabulary,
+    profile_features,
+)
+
+# A rank key packs (-rounded score, target index) into one int64, so a row is
+# a flat array instead of N tuple objects. Scores are in [0, 1] and rounded
+# to 4 decimals, i.e. at most SCORE_STEPS distinct values.
+SCORE_STEPS = 10000
+INDEX_BITS = 32
+INDEX_MASK = (1 << INDEX_BITS) - 1
+
+
+class MatchGraph:
+    """Materialized per-profile ranking, kept in step with the profile list.
+
+    Each source keeps its targets sorted by (-rounded score, profile index), which
+    is the order generate_all_matches produces. When a profile changes or is
+    added, only its row is re-scored and its entry in every other row is moved
+    with a bisect, so an upsert costs O(N) scoring instead of O(N^2). Removals
+    and reorders fall back to a full rebuild.
+
+    Rows only hold packed rank keys; the score components of the rows a
+    reader asks for are recomputed from the cached ProfileFeatures. Pair scores
+    are symmetric, so a rebuild scores each pair once for both rows. Readers go
+    through matches(), which returns the graph version together with rows
+    built under the same lock.
+    """
+
+    def __init__(self, rebuild_fraction: float = 0.25) -> None:
+        self.rebuild_fraction = rebuild_fraction
+        self._lock = threading.RLock()
+        self._profiles: List[Dict[str, Any]] = []
+        self._ids: List[Any] = []
+        self._features: List[ProfileFeatures] = []
+        self._ranked: List[array] = []
+        self.version = 0
+        self.source_version: Optional[int] = None
+        self.rebuilds = 0
+        self.incremental_updates = 0
+
+    @staticmethod
+    def _score_rank(fa: ProfileFeatures, fb: ProfileFeatures) -> int:
+        """SCORE_STEPS minus the rounded pair score in steps: lower ranks first."""
+        return SCORE_STEPS - round(round(_weighted_score(*_pair_components(fa, fb)), 4) * SCORE_STEPS)
+
+    def _rebuild(self, profiles: List[Dict[str, Any]]) -> None:
+        self._profiles = list(profiles)
+        self._ids = [p["id"] for p in self._profiles]
+        # Re-encode against a fresh vocabulary so tokens of departed profile versions drop out.
+        compact_vocabulary()
+        self._features = [profile_features(p) for p in self._profiles]
+        n = len(self._profiles)
+        rows = [array("q") for _ in range(n)]
+        for i in range(n):
+            fi, row_i, id_i = self._features[i], rows[i], self._ids[i]
+            for j in range(i + 1, n):
+                if self._ids[j] == id_i:
+                    continue
+                rank = self._score_rank(fi, self._features[j]) << INDEX_BITS
+                row_i.append(rank | j)
+                rows[j].append(rank | i)
+            # Row i is complete once its own pass is done (j < i were added earlier).
+            rows[i] = array("q", sorted(row_i))
+        self._ranked = rows
+        self.rebuilds += 1
+
+    def _rescore(self, i: int, previous: Optional[ProfileFeatures]) -> None:
+        """Re-rank row i and move i within every other row; previous is i's features before the change."""
+        row: List[int] = []
+        features = self._features[i]
+        for j, other in enumerate(self._features):
+            if self._ids[j] == self._ids[i]:
+                continue
+            rank = self._score_rank(features, other) << INDEX_BITS
+            column = self._ranked[j]
+            if previous is not None:
+                old = (self._score_rank(previous, other) << INDEX_BITS) | i
+                del column[bisect.bisect_left(column, old)]
+            bisect.insort(column, rank | i)
+            row.append(rank | j)
+        self._ranked[i] = array("q", sorted(row))
+        self.incremental_updates += 1
+
+    def _append(self, profile: Dict[str, Any]) -> int:
+        self._profiles.append(profile)
+        self._ids.append(profile["id"])
+        self._features.append(profile_features(profile))
+        self._ranked.append(array("q"))
+        return len(self._profiles) - 1
+
+    def sync(self, profiles: List[Dict[str, Any]], source_version: Optional[int] = None) -> int:
+        """Bring the graph up to date with profiles and return the graph version.
+
+        A matching source_version skips the comparison entirely.
+        """
+        with self._lock:
+            if source_version is not None and source_version == self.source_version:
+                return self.version
+
+            ids = [p["id"] for p in profiles]
+            known = len(self._ids)
+            if ids[:known] != self._ids or len(set(ids)) != len(ids):
+                self._rebuild(profiles)
+            else:
+                changed = [i for i in range(known) if profiles[i] is not self._profiles[i]]
+                rescore = [i for i in changed if profile_features(profiles[i]).fingerprint != self._features[i].fingerprint]
+                added = len(ids) - known
+                if len(rescore) + added > max(1, int(len(ids) * self.rebuild_fraction)):
+                    self._rebuild(profiles)
+                elif changed or added:
+                    for i in changed:
+                        self._profiles[i] = profiles[i]
+                    for i in rescore:
+                        previous = self._features[i]
+                        self._features[i] = profile_features(profiles[i])
+                        self._rescore(i, previous)
+                    for profile in profiles[known:]:
+                        self._rescore(self._append(profile), None)
+                else:
+                    self.source_version = source_version
+                    return self.version
+
+            self.source_version = source_version
+            self.version += 1
+            return self.version
+
+    def _rows(self, i: int, top_k: Optional[int], offset: int = 0) -> List[Dict[str, Any]]:
+        end = None if top_k is None else offset + max(top_k, 0)
+        source, features = self._profiles[i], self._features[i]
+        rows = []
+        for rank, key in enumerate(self._ranked[i][offset:end], start=offset):
+            j = key & INDEX_MASK
+            components = _pair_components(features, self._features[j])
+            rows.append(_match_row(_match_score(source, self._profiles[j], *components), rank + 1))
+        return rows
+
+    def matches(
+        self, profile_ids: Optional[Iterable[str]] = None, top_k: Optional[int] = None, offset: int = 0
+    ) -> Tuple[int, Dict[str, List[Dict[str, Any]]]]:
+        """Ranked rows (rationale=None) for the given sources, or for every profile, with the graph version.
+
+        offset skips that many rows of each source's ranking; priority_rank stays absolute.
+        """
+        with self._lock:
+            if profile_ids is None:
+                indices: Iterable[int] = range(len(self._profiles))
+            else:
+                positions = {pid: i for i, pid in enumerate(self._ids)}
+                indices = [positions[pid] for pid in profile_ids if pid in positions]
+            return self.version, {self._ids[i]: self._rows(i, top_k, offset) for i in indices}
+
+    def source_ids(self) -> Tuple[int, List[str]]:
+        """Profile ids in ranking order of sources, with the graph version."""
+        with self._lock:
+            return self.version, list(self._ids)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "version": self.version,
+                "profiles": len(self._profiles),
+                "rebuilds": self.rebuilds,
+                "incremental_updates": self.incremental_updates,
+            }
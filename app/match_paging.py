@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import base64
+import binascii
+from typing import Any, Dict, FrozenSet, List, Optional, Sequence, Tuple
+
+MATCH_ROW_FIELDS = frozenset(
+    {
+        "target_id",
+        "target_name",
+        "priority_rank",
+        "score",
+        "fit_score",
+        "complementarity_score",
+        "readiness_score",
+        "confidence",
+        "risk_level",
+        "risk_reasons",
+        "rationale",
+        "action",
+    }
+)
+
+
+class StaleCursor(ValueError):
+    """The cursor was issued for an older match graph version."""
+
+
+def parse_fields(fields: Optional[str]) -> Optional[FrozenSet[str]]:
+    """Parse a fields= projection; None means every field. target_id is always kept."""
+    if fields is None or not fields.strip():
+        return None
+    wanted = {f.strip() for f in fields.split(",") if f.strip()}
+    unknown = sorted(wanted - MATCH_ROW_FIELDS)
+    if unknown:
+        raise ValueError(f"unknown match fields: {', '.join(unknown)}")
+    return frozenset(wanted | {"target_id"})
+
+
+def wants(fields: Optional[FrozenSet[str]], name: str) -> bool:
+    return fields is None or name in fields
+
+
+def project_rows(rows: List[Dict[str, Any]], fields: Optional[FrozenSet[str]]) -> List[Dict[str, Any]]:
+    if fields is None:
+        return rows
+    return [{k: v for k, v in row.items() if k in fields} for row in rows]
+
+
+def encode_cursor(version: int, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{version}:{offset}".encode("ascii")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str], version: int) -> int:
+    """Offset stored in cursor; raises StaleCursor when the graph moved since it was issued."""
+    if not cursor:
+        return 0
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode("ascii")
+        issued, offset = (int(part) for part in raw.split(":"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("invalid cursor") from None
+    if offset < 0:
+        raise ValueError("invalid cursor")
+    if issued != version:
+        raise StaleCursor("match graph changed since this cursor was issued; restart from the first page")
+    return offset
+
+
+def page_window(offset: int, limit: Optional[int], top_k: Optional[int]) -> Optional[int]:
+    """End index of a page starting at offset: limit rows, never past top_k; None for unbounded."""
+    ends = [end for end in (None if limit is None else offset + limit, top_k) if end is not None]
+    return min(ends) if ends else None
+
+
+def page_of(
+    items: Sequence[Any], offset: int, limit: Optional[int], version: int
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """Slice items for one page and the cursor of the next page (None on the last page)."""
+    end = None if limit is None else offset + limit
+    page = items[offset:end]
+    next_cursor = encode_cursor(version, end) if end is not None and end < len(items) else None
+    return page, next_cursor
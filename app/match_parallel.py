@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import tempfile
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from app.match_export import SourceMatches, write_ndjson
+from app.matching import candidate_index, fill_rationales, matches_for_profile, profile_features
+
+SHARDS_PER_WORKER = 4
+
+# Set in the parent before the pool starts. Forked workers inherit the
+# profiles, their features and the candidate index copy-on-write instead of
+# pickling the corpus for every task.
+_SHARED: Dict[str, Any] = {}
+
+
+def default_workers() -> int:
+    return max(1, os.cpu_count() or 1)
+
+
+def _share(profiles: List[Dict[str, Any]], top_k: Optional[int], candidates: Optional[str]) -> None:
+    index = candidate_index(profiles, top_k, candidates)
+    _SHARED["index"] = index
+    _SHARED["features"] = index.features if index is not None else [profile_features(p) for p in profiles]
+    _SHARED["profiles"] = profiles
+    _SHARED["top_k"] = top_k
+
+
+def _init_worker(profiles: List[Dict[str, Any]], top_k: Optional[int], candidates: Optional[str]) -> None:
+    # Only used when fork is unavailable: each spawned worker rebuilds features once.
+    _share(profiles, top_k, candidates)
+
+
+def _shard_bounds(count: int, shards: int) -> List[Tuple[int, int]]:
+    """Contiguous [start, end) source ranges, sizes differing by at most one."""
+    shards = max(1, min(shards, count))
+    size, extra = divmod(count, shards)
+    bounds: List[Tuple[int, int]] = []
+    start = 0
+    for shard in range(shards):
+        end = start + size + (1 if shard < extra else 0)
+        bounds.append((start, end))
+        start = end
+    return bounds
+
+
+def _rank_shard(task: Tuple[int, int, int, str]) -> str:
+    """Rank sources [start, end) without rationales and write them to one NDJSON shard file."""
+    shard, start, end, shard_dir = task
+    profiles = _SHARED["profiles"]
+    top_k = _SHARED["top_k"]
+    index = _SHARED["index"]
+    features = _SHARED["features"]
+    records = (
+        (
+            profiles[pos]["id"],
+            matches_for_profile(
+                profiles[pos],
+                profiles,
+                top_k=top_k,
+                with_rationale=False,
+                index=index,
+                features=features,
+                source_features=features[pos],
+            ),
+        )
+        for pos in range(start, end)
+    )
+    path = Path(shard_dir) / f"shard-{shard:05d}.ndjson"
+    with path.open("w", encoding="utf-8") as out:
+        write_ndjson(records, out, flush_every=1000)
+    return str(path)
+
+
+def _read_shard(path: str) -> Iterator[SourceMatches]:
+    with open(path, encoding="utf-8") as handle:
+        for line in handle:
+            record = json.loads(line)
+            yield record["profile_id"], record["matches"]
+
+
+def iter_parallel_matches(
+    profiles: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    top_k: Optional[int] = None,
+    with_rationale: bool = True,
+    shard_dir: Optional[str] = None,
+    candidates: Optional[str] = None,
+) -> Iterator[SourceMatches]:
+    """Rank source profiles across a process pool, yielding (id, rows) in profile order.
+
+    Sources are split into contiguous shards; each worker scores its shard with
+    the same per-source path as generate_all_matches() and writes it to
+    shard_dir. Shards are read back in order, so the output is identical to
+    the single-process run. Rationales are generated here in the parent, per
+    source, so workers never touch the rationale cache database or the LLM.
+    """
+    workers = default_workers() if workers is None else max(1, workers)
+    if not profiles:
+        return
+
+    owned_dir = shard_dir is None
+    directory = tempfile.mkdtemp(prefix="match-shards-") if owned_dir else shard_dir
+    os.makedirs(directory, exist_ok=True)
+    bounds = _shard_bounds(len(profiles), workers * SHARDS_PER_WORKER)
+    tasks = [(shard, start, end, directory) for shard, (start, end) in enumerate(bounds)]
+    by_id = {str(p.get("id", "")): p for p in profiles} if with_rationale else {}
+
+    _share(profiles, top_k, candidates)
+    if "fork" in multiprocessing.get_all_start_methods():
+        context = multiprocessing.get_context("fork")
+        pool = context.Pool(processes=min(workers, len(tasks)))
+    else:
+        context = multiprocessing.get_context("spawn")
+        pool = context.Pool(
+            processes=min(workers, len(tasks)), initializer=_init_worker, initargs=(profiles, top_k, candidates)
+        )
+    try:
+        with pool:
+            # imap keeps shard order while later shards are still being ranked.
+            for path in pool.imap(_rank_shard, tasks):
+                for source_id, rows in _read_shard(path):
+                    if with_rationale:
+                        fill_rationales(rows, by_id, source_id=source_id)
+                    yield source_id, rows
+    finally:
+        _SHARED.clear()
+        if owned_dir:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+def generate_all_matches_parallel(
+    profiles: List[Dict[str, Any]],
+    workers: Optional[int] = None,
+    top_k: Optional[int] = None,
+    with_rationale: bool = True,
+    shard_dir: Optional[str] = None,
+    candidates: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Same result as generate_all_matches(profiles, engine="python", ...), built on a process pool."""
+    return dict(
+        iter_parallel_matches(
+            profiles,
+            workers=workers,
+            top_k=top_k,
+            with_rationale=with_rationale,
+            shard_dir=shard_dir,
+            candidates=candidates,
+        )
+    )
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import hashlib
+import heapq
 import itertools
-from dataclasses import dataclass
-from typing import Any, Dict, List, Tuple
+import json
+import os
+import sys
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 
-from app.explanations import generate_match_rationale
+from app.explanations import RationaleItem
+from app.rationale_cache import cached_match_rationale, cached_match_rationales
 
 
 @dataclass
@@ -18,7 +26,115 @@ class MatchScore:
     confidence: float
     risk_level: str
     risk_reasons: List[str]
-    rationale: str
+    rationale: Optional[str] = None
+
+
+@dataclass(frozen=True)
+class ProfileFeatures:
+    """Scoring inputs derived from one profile version, computed once and reused for every pair."""
+
+    profile_id: str
+    fingerprint: str
+    tokens: FrozenSet[str]
+    bits: int
+    role_type: str
+    readiness: float
+    # The vocabulary bits was encoded with; bitsets from different vocabularies are not comparable.
+    vocabulary: "VocabularyIndex" = field(compare=False, repr=False)
+
+
+class VocabularyIndex:
+    """Token -> integer id map used to encode token bags as bitsets.
+
+    Ids are only ever appended, so bitsets encoded earlier stay valid as the
+    corpus grows. compact_vocabulary() replaces the process-wide instance so
+    tokens of removed or edited profiles stop widening every bitset.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def token_id(self, token: str) -> int:
+        found = self._ids.get(token)
+        if found is not None:
+            return found
+        with self._lock:
+            return self._ids.setdefault(token, len(self._ids))
+
+    def encode(self, tokens: FrozenSet[str]) -> int:
+        bits = 0
+        for token in tokens:
+            bits |= 1 << self.token_id(token)
+        return bits
+
+
+VOCABULARY = VocabularyIndex()
+
+
+def compact_vocabulary() -> None:
+    """Start a fresh process-wide vocabulary; called when the match graph rebuilds.
+
+    Features encoded earlier keep scoring correctly (pairs across vocabularies
+    compare token sets instead of bitsets) and are re-encoded the next time
+    profile_features() hands them out.
+    """
+    global VOCABULARY
+    VOCABULARY = VocabularyIndex()
+
+
+FEATURE_FIELDS = ("mandate", "product", "thesis", "focus", "looking_for", "organization", "title")
+
+
+class FeatureCache:
+    """LRU of ProfileFeatures keyed by profile id; one entry per id, replaced when the profile changes."""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, ProfileFeatures]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, profile_id: str) -> Optional[ProfileFeatures]:
+        with self._lock:
+            found = self._entries.get(profile_id)
+            if found is not None:
+                self._entries.move_to_end(profile_id)
+            return found
+
+    def put(self, features: ProfileFeatures) -> None:
+        with self._lock:
+            self._entries[features.profile_id] = features
+            self._entries.move_to_end(features.profile_id)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+def _feature_cache_size() -> int:
+    try:
+        return int(os.getenv("FEATURE_CACHE_SIZE", "20000"))
+    except ValueError:
+        return 20000
+
+
+_FEATURE_CACHE = FeatureCache(_feature_cache_size())
+
+MATCHING_ENGINES = ("python", "numpy")
+
+CANDIDATE_MODES = ("index", "exhaustive", "verify")
+
+
+class CandidateMismatch(RuntimeError):
+    """Pruned top-K differs from exhaustive scoring (raised in verify mode)."""
 
 
 def _to_bag(profile: Dict[str, Any]) -> List[str]:
@@ -62,6 +178,18 @@ def _jaccard(a: List[str], b: List[str]) -> float:
     return len(sa & sb) / len(sa | sb)
 
 
+def _jaccard_bits(a: int, b: int) -> float:
+    if not a or not b:
+        return 0.0
+    return (a & b).bit_count() / (a | b).bit_count()
+
+
+def _jaccard_sets(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
 def _role_type(profile: Dict[str, Any]) -> str:
     org = profile.get("organization", "").lower()
     title = profile.get("title", "").lower()
@@ -95,7 +223,10 @@ def _deal_readiness(profile: Dict[str, Any]) -> float:
 
 
 def _complementarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
-    ta, tb = _role_type(a), _role_type(b)
+    return _complementarity_roles(_role_type(a), _role_type(b))
+
+
+def _complementarity_roles(ta: str, tb: str) -> float:
     pair = {ta, tb}
     if pair == {"investor", "builder"}:
         return 1.0
@@ -110,6 +241,47 @@ def _complementarity(a: Dict[str, Any], b: Dict[str, Any]) -> float:
     return 0.45
 
 
+def _feature_fingerprint(profile: Dict[str, Any]) -> str:
+    relevant = {key: profile.get(key) for key in FEATURE_FIELDS}
+    raw = json.dumps(relevant, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+def profile_features(profile: Dict[str, Any]) -> ProfileFeatures:
+    profile_id = str(profile.get("id", ""))
+    fingerprint = _feature_fingerprint(profile)
+    vocabulary = VOCABULARY
+    cached = _FEATURE_CACHE.get(profile_id) if profile_id else None
+    if cached is not None and cached.fingerprint == fingerprint:
+        if cached.vocabulary is vocabulary:
+            return cached
+        features = replace(cached, bits=vocabulary.encode(cached.tokens), vocabulary=vocabulary)
+    else:
+        tokens = frozenset(sys.intern(t) for t in _to_bag(profile))
+        features = ProfileFeatures(
+            profile_id=profile_id,
+            fingerprint=fingerprint,
+            tokens=tokens,
+            bits=vocabulary.encode(tokens),
+            role_type=_role_type(profile),
+            readiness=_deal_readiness(profile),
+            vocabulary=vocabulary,
+        )
+    if profile_id:
+        _FEATURE_CACHE.put(features)
+    return features
+
+
+def _pair_components(fa: ProfileFeatures, fb: ProfileFeatures) -> Tuple[float, float, float]:
+    if fa.vocabulary is fb.vocabulary:
+        fit = _jaccard_bits(fa.bits, fb.bits)
+    else:
+        fit = _jaccard_sets(fa.tokens, fb.tokens)
+    comp = _complementarity_roles(fa.role_type, fb.role_type)
+    ready = (fa.readiness + fb.readiness) / 2
+    return fit, comp, ready
+
+
 def _risk_assessment(fit: float, readiness: float, confidence: float) -> Tuple[str, List[str]]:
     reasons: List[str] = []
     if fit < 0.06:
@@ -127,135 +299,395 @@ def _risk_assessment(fit: float, readiness: float, confidence: float) -> Tuple[s
 
 
 def _rationale(a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float) -> str:
-    return generate_match_rationale(a, b, fit, comp, ready)
+    return cached_match_rationale(a, b, fit, comp, ready)
+
+
+def _rationales(items: List[RationaleItem]) -> List[str]:
+    # One call for a whole shortlist so LLM mode can batch requests and share cache lookups.
+    return cached_match_rationales(items) if items else []
 
 
 def _confidence(fit: float, readiness: float) -> float:
     return min(0.55 + (0.35 * fit) + (0.1 * readiness), 0.98)
 
 
-def rank_for_profile(source: Dict[str, Any], targets: List[Dict[str, Any]]) -> List[MatchScore]:
-    source_bag = _to_bag(source)
-    source_ready = _deal_readiness(source)
-    results: List[MatchScore] = []
-
-    for target in targets:
-        target_bag = _to_bag(target)
-        fit = _jaccard(source_bag, target_bag)
-        comp = _complementarity(source, target)
-        ready = (source_ready + _deal_readiness(target)) / 2
-
-        weighted = (0.4 * fit) + (0.35 * comp) + (0.25 * ready)
-        confidence = _confidence(fit, ready)
-        risk_level, risk_reasons = _risk_assessment(fit, ready, confidence)
-
-        results.append(
-            MatchScore(
-                target_id=target["id"],
-                target_name=target["name"],
-                score=round(weighted, 4),
-                fit_score=round(fit, 4),
-                complementarity_score=round(comp, 4),
-                readiness_score=round(ready, 4),
-                confidence=round(confidence, 4),
-                risk_level=risk_level,
-                risk_reasons=risk_reasons,
-                rationale=_rationale(source, target, fit, comp, ready),
-            )
-        )
+def _weighted_score(fit: float, comp: float, ready: float) -> float:
+    return (0.4 * fit) + (0.35 * comp) + (0.25 * ready)
+
+
+def _match_score(
+    source: Dict[str, Any],
+    target: Dict[str, Any],
+    fit: float,
+    comp: float,
+    ready: float,
+    rationale: Optional[str] = None,
+) -> MatchScore:
+    weighted = _weighted_score(fit, comp, ready)
+    confidence = _confidence(fit, ready)
+    risk_level, risk_reasons = _risk_assessment(fit, ready, confidence)
+    return MatchScore(
+        target_id=target["id"],
+        target_name=target["name"],
+        score=round(weighted, 4),
+        fit_score=round(fit, 4),
+        complementarity_score=round(comp, 4),
+        readiness_score=round(ready, 4),
+        confidence=round(confidence, 4),
+        risk_level=risk_level,
+        risk_reasons=risk_reasons,
+        rationale=rationale,
+    )
+
+
+def _match_row(r: MatchScore, rank: int) -> Dict[str, Any]:
+    return {
+        "target_id": r.target_id,
+        "target_name": r.target_name,
+        "priority_rank": rank,
+        "score": r.score,
+        "fit_score": r.fit_score,
+        "complementarity_score": r.complementarity_score,
+        "readiness_score": r.readiness_score,
+        "confidence": r.confidence,
+        "risk_level": r.risk_level,
+        "risk_reasons": r.risk_reasons,
+        "rationale": r.rationale,
+    }
 
-    return sorted(results, key=lambda x: x.score, reverse=True)
 
+def _intro_pair_row(
+    a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float, rationale: Optional[str]
+) -> Dict[str, Any]:
+    score = _weighted_score(fit, comp, ready)
+    conf = _confidence(fit, ready)
+    risk_level, risk_reasons = _risk_assessment(fit, ready, conf)
+    return {
+        "from_id": a["id"],
+        "from_name": a["name"],
+        "to_id": b["id"],
+        "to_name": b["name"],
+        "score": round(score, 4),
+        "confidence": round(conf, 4),
+        "risk_level": risk_level,
+        "risk_reasons": risk_reasons,
+        "rationale": rationale,
+    }
 
-def generate_all_matches(profiles: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
-    by_profile: Dict[str, List[Dict[str, Any]]] = {}
 
-    for profile in profiles:
-        targets = [p for p in profiles if p["id"] != profile["id"]]
-        ranked = rank_for_profile(profile, targets)
-        by_profile[profile["id"]] = [
-            {
-                "target_id": r.target_id,
-                "target_name": r.target_name,
-                "priority_rank": idx + 1,
-                "score": r.score,
-                "fit_score": r.fit_score,
-                "complementarity_score": r.complementarity_score,
-                "readiness_score": r.readiness_score,
-                "confidence": r.confidence,
-                "risk_level": r.risk_level,
-                "risk_reasons": r.risk_reasons,
-                "rationale": r.rationale,
-            }
-            for idx, r in enumerate(ranked)
-        ]
+def _non_obvious_row(
+    a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float, rationale: Optional[str]
+) -> Dict[str, Any]:
+    final_score = _weighted_score(fit, comp, ready)
+    novelty_score = (1 - fit) * comp
+    conf = _confidence(fit, ready)
+    risk_level, risk_reasons = _risk_assessment(fit, ready, conf)
+    return {
+        "from_id": a["id"],
+        "from_name": a["name"],
+        "to_id": b["id"],
+        "to_name": b["name"],
+        "score": round(final_score, 4),
+        "novelty_score": round(novelty_score, 4),
+        "confidence": round(conf, 4),
+        "risk_level": risk_level,
+        "risk_reasons": risk_reasons,
+        "rationale": rationale,
+    }
 
-    return by_profile
 
+def _is_non_obvious(fit: float, comp: float, final_score: float) -> bool:
+    return fit <= 0.12 and comp >= 0.75 and final_score >= 0.4
+
+
+def _novelty_rank_score(fit: float, comp: float, final_score: float) -> float:
+    return ((1 - fit) * comp) * 0.55 + final_score * 0.45
+
+
+def _resolve_engine(engine: Optional[str]) -> str:
+    name = (engine or os.getenv("MATCHING_ENGINE", "python")).strip().lower()
+    if name not in MATCHING_ENGINES:
+        raise ValueError(f"Unsupported matching engine: {name}")
+    return name
+
+
+def _select_top(
+    scored: Iterable[Tuple[Any, ...]], key: Callable[[Tuple[Any, ...]], float], k: Optional[int]
+) -> List[Tuple[Any, ...]]:
+    # heapq.nlargest is stable like sorted(..., reverse=True), so ties keep input order.
+    if k is None:
+        return sorted(scored, key=key, reverse=True)
+    return heapq.nlargest(max(k, 0), scored, key=key)
+
+
+def _iter_pair_components(
+    profiles: List[Dict[str, Any]],
+) -> Iterator[Tuple[Dict[str, Any], Dict[str, Any], float, float, float]]:
+    features = [profile_features(p) for p in profiles]
+    for (a, fa), (b, fb) in itertools.combinations(zip(profiles, features), 2):
+        fit, comp, ready = _pair_components(fa, fb)
+        yield a, b, fit, comp, ready
+
+
+def _resolve_candidates(mode: Optional[str]) -> str:
+    name = (mode or os.getenv("MATCH_CANDIDATES", "index")).strip().lower()
+    if name not in CANDIDATE_MODES:
+        raise ValueError(f"Unsupported candidate mode: {name}")
+    return name
+
+
+class CandidateIndex:
+    """Picks the targets that can reach a source's top K without scoring all of them.
+
+    Two sources of candidates:
+    - an inverted index token -> profile positions over the _to_bag tokens,
+      giving every target that shares at least one token (fit > 0);
+    - per role type, targets ordered by readiness. A target with no shared
+      token scores 0.35 * comp + 0.25 * ready, which only depends on its role
+      bucket and readiness, so walking each bucket from the top until K
+      targets are taken bounds every zero-overlap target left behind.
+
+    A skipped target is always outranked by K candidates, including the
+    rounded-score tie-break on input order that _select_top applies, so top-K
+    over the candidates equals exhaustive top-K. With verify=True each source
+    is also scored exhaustively and CandidateMismatch is raised on any difference.
+    """
+
+    def __init__(self, profiles: List[Dict[str, Any]], verify: bool = False) -> None:
+        self.profiles = profiles
+        self.verify = verify
+        self.features = [profile_features(p) for p in profiles]
+        self._postings: Dict[str, List[int]] = {}
+        levels: Dict[str, Dict[float, List[int]]] = {}
+        for pos, features in enumerate(self.features):
+            for token in features.tokens:
+                self._postings.setdefault(token, []).append(pos)
+            levels.setdefault(features.role_type, {}).setdefault(features.readiness, []).append(pos)
+        # role type -> [(readiness, positions ascending)], highest readiness first
+        self._buckets = {role: sorted(by_ready.items(), reverse=True) for role, by_ready in levels.items()}
+
+    def _walk_bucket(
+        self,
+        levels: List[Tuple[float, List[int]]],
+        comp: float,
+        source_readiness: float,
+        source_id: Any,
+        k: int,
+        picked: Set[int],
+    ) -> None:
+        taken: List[Tuple[float, int]] = []
+        floor: Optional[float] = None
+        for readiness, positions in levels:
+            # Zero-overlap score is a lower bound on any target's score in this bucket.
+            score = round(_weighted_score(0.0, comp, (source_readiness + readiness) / 2), 4)
+            if floor is not None and score < floor:
+                return
+            for pos in positions:
+                if self.profiles[pos]["id"] == source_id:
+                    continue
+                if floor is not None:
+                    # score == floor here: a tie loses to taken targets earlier in input order.
+                    beaters = sum(1 for s, p in taken if s > floor or p < pos)
+                    if beaters >= k:
+                        break
+                picked.add(pos)
+                taken.append((score, pos))
+                if floor is None and len(taken) == k:
+                    floor = score
+
+    def candidate_positions(
+        self, source: Dict[str, Any], k: int, source_features: Optional[ProfileFeatures] = None
+    ) -> List[int]:
+        """Positions of the targets for source's top k, ascending and excluding the source id."""
+        if k <= 0:
+            return []
+        features = profile_features(source) if source_features is None else source_features
+        source_id = source["id"]
+        picked: Set[int] = set()
+        for token in features.tokens:
+            picked.update(self._postings.get(token, ()))
+        for role, levels in self._buckets.items():
+            comp = _complementarity_roles(features.role_type, role)
+            self._walk_bucket(levels, comp, features.readiness, source_id, k, picked)
+        return [pos for pos in sorted(picked) if self.profiles[pos]["id"] != source_id]
+
+    def candidates(self, source: Dict[str, Any], k: int) -> List[Dict[str, Any]]:
+        """Targets for source's top k, in input order and excluding the source id."""
+        return [self.profiles[pos] for pos in self.candidate_positions(source, k)]
+
+
+def candidate_index(
+    profiles: List[Dict[str, Any]], top_k: Optional[int], mode: Optional[str] = None
+) -> Optional[CandidateIndex]:
+    """Index for top-K pruning, or None when every target must be scored (no top_k, exhaustive mode)."""
+    name = _resolve_candidates(mode)
+    if top_k is None or name == "exhaustive":
+        return None
+    return CandidateIndex(profiles, verify=name == "verify")
+
+
+def rank_for_profile(
+    source: Dict[str, Any],
+    targets: List[Dict[str, Any]],
+    k: Optional[int] = None,
+    with_rationale: bool = True,
+    source_features: Optional[ProfileFeatures] = None,
+    target_features: Optional[List[ProfileFeatures]] = None,
+) -> List[MatchScore]:
+    """Top k targets for source. target_features, aligned with targets, skips the per-target cache check."""
+    if source_features is None:
+        source_features = profile_features(source)
+    if target_features is None:
+        target_features = [profile_features(target) for target in targets]
+
+    def scored() -> Iterator[Tuple[float, Dict[str, Any], float, float, float]]:
+        for target, features in zip(targets, target_features):
+            fit, comp, ready = _pair_components(source_features, features)
+            yield round(_weighted_score(fit, comp, ready), 4), target, fit, comp, ready
+
+    survivors = _select_top(scored(), key=lambda row: row[0], k=k)
+    items = [(source, target, fit, comp, ready) for _score, target, fit, comp, ready in survivors]
+    texts: List[Optional[str]] = list(_rationales(items)) if with_rationale else [None] * len(items)
+    return [_match_score(*item, rationale=text) for item, text in zip(items, texts)]
+
+
+def generate_all_matches(
+    profiles: List[Dict[str, Any]],
+    engine: Optional[str] = None,
+    top_k: Optional[int] = None,
+    with_rationale: bool = True,
+    candidates: Optional[str] = None,
+) -> Dict[str, List[Dict[str, Any]]]:
+    """Rank every profile against all others.
+
+    With with_rationale=False rows carry rationale=None; call fill_rationales on
+    the rows actually returned to a client instead of generating text for N^2 pairs.
+    With top_k, the python engine only scores CandidateIndex candidates unless
+    candidates (or MATCH_CANDIDATES) is "exhaustive"; "verify" checks both agree.
+    """
+    if _resolve_engine(engine) == "numpy":
+        from app.matching_numpy import generate_all_matches_numpy
+
+        return generate_all_matches_numpy(profiles, top_k=top_k, with_rationale=with_rationale)
 
-def top_intro_pairs(profiles: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
-    pairs: List[Tuple[float, Dict[str, Any]]] = []
-
-    for a, b in itertools.combinations(profiles, 2):
-        fit = _jaccard(_to_bag(a), _to_bag(b))
-        comp = _complementarity(a, b)
-        ready = (_deal_readiness(a) + _deal_readiness(b)) / 2
-        score = (0.4 * fit) + (0.35 * comp) + (0.25 * ready)
-        conf = _confidence(fit, ready)
-        risk_level, risk_reasons = _risk_assessment(fit, ready, conf)
-
-        pairs.append(
-            (
-                score,
-                {
-                    "from_id": a["id"],
-                    "from_name": a["name"],
-                    "to_id": b["id"],
-                    "to_name": b["name"],
-                    "score": round(score, 4),
-                    "confidence": round(conf, 4),
-                    "risk_level": risk_level,
-                    "risk_reasons": risk_reasons,
-                    "rationale": _rationale(a, b, fit, comp, ready),
-                },
-            )
+    by_profile: Dict[str, List[Dict[str, Any]]] = {}
+    index = candidate_index(profiles, top_k, candidates)
+    features = index.features if index is not None else [profile_features(p) for p in profiles]
+
+    for profile, source_features in zip(profiles, features):
+        by_profile[profile["id"]] = matches_for_profile(
+            profile,
+            profiles,
+            top_k=top_k,
+            with_rationale=with_rationale,
+            index=index,
+            features=features,
+            source_features=source_features,
         )
 
-    pairs.sort(key=lambda x: x[0], reverse=True)
-    return [p[1] for p in pairs[:limit]]
+    return by_profile
+
 
+def matches_for_profile(
+    source: Dict[str, Any],
+    profiles: List[Dict[str, Any]],
+    top_k: Optional[int] = None,
+    with_rationale: bool = True,
+    index: Optional[CandidateIndex] = None,
+    features: Optional[List[ProfileFeatures]] = None,
+    source_features: Optional[ProfileFeatures] = None,
+) -> List[Dict[str, Any]]:
+    """Ranked rows for source.
+
+    index (built over profiles) limits scoring to top_k candidates. Callers
+    that rank many sources pass features, aligned with profiles and computed
+    once, so targets are not re-fingerprinted for every source.
+    """
+    if features is None:
+        features = index.features if index is not None else [profile_features(p) for p in profiles]
+    if source_features is None:
+        source_features = profile_features(source)
+    if index is None or top_k is None:
+        positions = [pos for pos, p in enumerate(profiles) if p["id"] != source["id"]]
+    else:
+        positions = index.candidate_positions(source, top_k, source_features)
+    ranked = rank_for_profile(
+        source,
+        [profiles[pos] for pos in positions],
+        k=top_k,
+        with_rationale=with_rationale,
+        source_features=source_features,
+        target_features=[features[pos] for pos in positions],
+    )
+    rows = [_match_row(r, idx + 1) for idx, r in enumerate(ranked)]
+    if index is not None and index.verify and top_k is not None:
+        expected = matches_for_profile(
+            source, profiles, top_k=top_k, with_rationale=False, features=features, source_features=source_features
+        )
+        if [{**row, "rationale": None} for row in rows] != expected:
+            raise CandidateMismatch(f"candidate pruning changed top {top_k} for profile {source['id']}")
+    return rows
+
+
+def fill_rationales(
+    rows: List[Dict[str, Any]],
+    profiles_by_id: Dict[str, Dict[str, Any]],
+    source_id: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Generate rationale text in place for rows that were ranked without it.
+
+    Per-profile rows are resolved against source_id/target_id, pair rows against
+    from_id/to_id. Rows that already have a rationale are left untouched.
+    """
+    pending: List[Dict[str, Any]] = []
+    items: List[RationaleItem] = []
+    for row in rows:
+        if row.get("rationale") is not None:
+            continue
+        source = profiles_by_id.get(str(source_id or row.get("from_id", "")))
+        target = profiles_by_id.get(str(row.get("target_id") or row.get("to_id", "")))
+        if source and target:
+            fit, comp, ready = _pair_components(profile_features(source), profile_features(target))
+            pending.append(row)
+            items.append((source, target, fit, comp, ready))
+
+    for row, text in zip(pending, _rationales(items)):
+        row["rationale"] = text
+    return rows
+
+
+def top_intro_pairs(
+    profiles: List[Dict[str, Any]], limit: int = 10, engine: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    if _resolve_engine(engine) == "numpy":
+        from app.matching_numpy import top_intro_pairs_numpy
+
+        return top_intro_pairs_numpy(profiles, limit=limit)
+
+    scored = (
+        (_weighted_score(fit, comp, ready), a, b, fit, comp, ready)
+        for a, b, fit, comp, ready in _iter_pair_components(profiles)
+    )
+    survivors = _select_top(scored, key=lambda row: row[0], k=limit)
+    items = [(a, b, fit, comp, ready) for _score, a, b, fit, comp, ready in survivors]
+    return [_intro_pair_row(*item, rationale=text) for item, text in zip(items, _rationales(items))]
+
+
+def top_non_obvious_pairs(
+    profiles: List[Dict[str, Any]], limit: int = 5, engine: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    if _resolve_engine(engine) == "numpy":
+        from app.matching_numpy import top_non_obvious_pairs_numpy
+
+        return top_non_obvious_pairs_numpy(profiles, limit=limit)
 
-def top_non_obvious_pairs(profiles: List[Dict[str, Any]], limit: int = 5) -> List[Dict[str, Any]]:
     # Non-obvious pairs have lower lexical overlap but high complementarity and decent readiness.
-    candidates: List[Tuple[float, Dict[str, Any]]] = []
-
-    for a, b in itertools.combinations(profiles, 2):
-        fit = _jaccard(_to_bag(a), _to_bag(b))
-        comp = _complementarity(a, b)
-        ready = (_deal_readiness(a) + _deal_readiness(b)) / 2
-        final_score = (0.4 * fit) + (0.35 * comp) + (0.25 * ready)
-        novelty_score = (1 - fit) * comp
-
-        if fit <= 0.12 and comp >= 0.75 and final_score >= 0.4:
-            conf = _confidence(fit, ready)
-            risk_level, risk_reasons = _risk_assessment(fit, ready, conf)
-            candidates.append(
-                (
-                    novelty_score * 0.55 + final_score * 0.45,
-                    {
-                        "from_id": a["id"],
-                        "from_name": a["name"],
-                        "to_id": b["id"],
-                        "to_name": b["name"],
-                        "score": round(final_score, 4),
-                        "novelty_score": round(novelty_score, 4),
-                        "confidence": round(conf, 4),
-                        "risk_level": risk_level,
-                        "risk_reasons": risk_reasons,
-                        "rationale": _rationale(a, b, fit, comp, ready),
-                    },
-                )
-            )
-
-    candidates.sort(key=lambda x: x[0], reverse=True)
-    return [x[1] for x in candidates[:limit]]
+    def candidates() -> Iterator[Tuple[float, Dict[str, Any], Dict[str, Any], float, float, float]]:
+        for a, b, fit, comp, ready in _iter_pair_components(profiles):
+            final_score = _weighted_score(fit, comp, ready)
+            if _is_non_obvious(fit, comp, final_score):
+                yield _novelty_rank_score(fit, comp, final_score), a, b, fit, comp, ready
+
+    survivors = _select_top(candidates(), key=lambda row: row[0], k=limit)
+    items = [(a, b, fit, comp, ready) for _score, a, b, fit, comp, ready in survivors]
+    return [_non_obvious_row(*item, rationale=text) for item, text in zip(items, _rationales(items))]
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import heapq
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from app.explanations import RationaleItem
+from app.matching import (
+    _complementarity_roles,
+    _intro_pair_row,
+    _match_row,
+    _match_score,
+    _non_obvious_row,
+    _rationales,
+    profile_features,
+)
+
+ROLE_TYPES = ("investor", "regulator", "builder", "operator")
+
+
+def _numpy():
+    try:
+        import numpy as np
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "NumPy matching engine selected but dependency missing. Install numpy to use MATCHING_ENGINE=numpy."
+        ) from exc
+    return np
+
+
+# Rows scored per block: peak memory is a few SCORE_BLOCK_ROWS x N float64 arrays, not N x N.
+SCORE_BLOCK_ROWS = 512
+
+
+def iter_score_blocks(
+    profiles: List[Dict[str, Any]], block_rows: Optional[int] = None
+) -> Iterator[Tuple[int, Any, Any, Any, Any]]:
+    """Score source rows block by block and yield (start, fit, comp, ready, weighted).
+
+    Each array covers sources [start, start + block_rows) against every target
+    (block_rows defaults to SCORE_BLOCK_ROWS).
+    Token bags are encoded as a 0/1 incidence matrix, so the intersection sizes
+    for a block come out of one matrix product. All arithmetic is float64 and
+    follows the operation order of the pure-Python scorer, so values are
+    bit-identical.
+    """
+    np = _numpy()
+    features = [profile_features(p) for p in profiles]
+    n = len(features)
+
+    vocabulary: Dict[str, int] = {}
+    rows: List[int] = []
+    cols: List[int] = []
+    for idx, feat in enumerate(features):
+        for token in feat.tokens:
+            rows.append(idx)
+            cols.append(vocabulary.setdefault(token, len(vocabulary)))
+
+    incidence = np.zeros((n, max(len(vocabulary), 1)), dtype=np.float32)
+    incidence[rows, cols] = 1.0
+    sizes = incidence.sum(axis=1, dtype=np.float64)
+
+    role_index = {role: i for i, role in enumerate(ROLE_TYPES)}
+    table = np.array([[_complementarity_roles(ta, tb) for tb in ROLE_TYPES] for ta in ROLE_TYPES])
+    roles = np.array([role_index[f.role_type] for f in features], dtype=np.intp)
+    readiness = np.array([f.readiness for f in features], dtype=np.float64)
+
+    step = max(1, SCORE_BLOCK_ROWS if block_rows is None else block_rows)
+    for start in range(0, n, step):
+        stop = min(start + step, n)
+        inter = (incidence[start:stop] @ incidence.T).astype(np.float64)
+        union = sizes[start:stop, None] + sizes[None, :] - inter
+        with np.errstate(divide="ignore", invalid="ignore"):
+            fit = np.where(union > 0, inter / np.where(union > 0, union, 1.0), 0.0)
+        comp = table[roles[start:stop, None], roles[None, :]]
+        ready = (readiness[start:stop, None] + readiness[None, :]) / 2
+        weighted = (0.4 * fit) + (0.35 * comp) + (0.25 * ready)
+        yield start, fit, comp, ready, weighted
+
+
+def generate_all_matches_numpy(
+    profiles: List[Dict[str, Any]], top_k: Optional[int] = None, with_rationale: bool = True
+) -> Dict[str, List[Dict[str, Any]]]:
+    if not profiles:
+        return {}
+    ids = [p["id"] for p in profiles]
+    by_profile: Dict[str, List[Dict[str, Any]]] = {}
+
+    for start, fit, comp, ready, weighted in iter_score_blocks(profiles):
+        for row in range(fit.shape[0]):
+            i = start + row
+            source = profiles[i]
+            targets = [j for j, target_id in enumerate(ids) if target_id != ids[i]]
+            fit_row, comp_row, ready_row = fit[row].tolist(), comp[row].tolist(), ready[row].tolist()
+            weighted_row = weighted[row].tolist()
+            rounded = {j: round(weighted_row[j], 4) for j in targets}
+            if top_k is None:
+                ordered = sorted(targets, key=rounded.__getitem__, reverse=True)
+            else:
+                ordered = heapq.nlargest(max(top_k, 0), targets, key=rounded.__getitem__)
+            items = [(source, profiles[j], fit_row[j], comp_row[j], ready_row[j]) for j in ordered]
+            texts: List[Optional[str]] = list(_rationales(items)) if with_rationale else [None] * len(items)
+            by_profile[ids[i]] = [
+                _match_row(_match_score(*item, rationale=text), rank + 1)
+                for rank, (item, text) in enumerate(zip(items, texts))
+            ]
+
+    return by_profile
+
+
+def _top_pairs(
+    profiles: List[Dict[str, Any]], limit: int, rank: Callable[[Any, Any, Any], Tuple[Any, Any]]
+) -> List[RationaleItem]:
+    """The `limit` best pairs i < j by rank(fit, comp, weighted) -> (score, eligible).
+
+    Ties keep (i, j) order. Each block keeps only its own best `limit` pairs,
+    and blocks arrive in row order, so a stable sort of the survivors gives the
+    same pairs as sorting every pair at once.
+    """
+    np = _numpy()
+    limit = max(limit, 0)
+    n = len(profiles)
+    columns = np.arange(n)
+    kept: List[Tuple[Any, Any, Any, Any, Any, Any]] = []
+    for start, fit, comp, ready, weighted in iter_score_blocks(profiles):
+        score, eligible = rank(fit, comp, weighted)
+        upper = columns[None, :] > (start + np.arange(fit.shape[0]))[:, None]
+        rows, cols = np.nonzero(upper & eligible)
+        best = np.argsort(-score[rows, cols], kind="stable")[:limit]
+        rows, cols = rows[best], cols[best]
+        kept.append((rows + start, cols, score[rows, cols], fit[rows, cols], comp[rows, cols], ready[rows, cols]))
+
+    if not kept:
+        return []
+    pair_i, pair_j, pair_score, pair_fit, pair_comp, pair_ready = (np.concatenate(part) for part in zip(*kept))
+    order = np.argsort(-pair_score, kind="stable")[:limit]
+    return [
+        (profiles[int(pair_i[k])], profiles[int(pair_j[k])], float(pair_fit[k]), float(pair_comp[k]), float(pair_ready[k]))
+        for k in order.tolist()
+    ]
+
+
+def top_intro_pairs_numpy(profiles: List[Dict[str, Any]], limit: int = 10) -> List[Dict[str, Any]]:
+    if len(profiles) < 2:
+        return []
+    items = _top_pairs(profiles, limit, lambda fit, comp, weighted: (weighted, True))
+    return [_intro_pair_row(*item, rationale=text) for item, text in zip(items, _rationales(items))]
+
+
+def top_non_obvious_pairs_numpy(profiles: List[Dict[str, Any]], limit: int = 5) -> List[Dict[str, Any]]:
+    if len(profiles) < 2:
+        return []
+
+    def rank(fit: Any, comp: Any, weighted: Any) -> Tuple[Any, Any]:
+        eligible = (fit <= 0.12) & (comp >= 0.75) & (weighted >= 0.4)
+        return ((1 - fit) * comp) * 0.55 + weighted * 0.45, eligible
+
+    items = _top_pairs(profiles, limit, rank)
+    return [_non_obvious_row(*item, rationale=text) for item, text in zip(items, _rationales(items))]
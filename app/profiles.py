@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from app.db import clear_profiles, get_profile_store_state, list_profiles, replace_profiles, upsert_profiles
+
+ROOT = Path(__file__).resolve().parents[1]
+DATA_PATH = ROOT / "data" / "test_profiles.json"
+LEGACY_RUNTIME_PATH = ROOT / "data" / "runtime_profiles.json"
+RUNTIME_SOURCE = "profiles"
+
+FileSignature = Tuple[str, int, int]
+StoreSignature = Tuple[int, int, Optional[FileSignature]]
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def validate_profile_minimum(profile: Any) -> None:
+    """Reject profiles the store cannot key or display: non-objects, missing id or name."""
+    if not isinstance(profile, dict):
+        raise ValueError("profile must be a JSON object")
+    if not profile.get("id"):
+        raise ValueError("profile missing id")
+    if not profile.get("name"):
+        raise ValueError("profile missing name")
+
+
+def _profile_rows(profiles: Iterable[Dict[str, Any]]) -> Iterator[Tuple[str, str]]:
+    for profile in profiles:
+        yield str(profile["id"]), json.dumps(profile)
+
+
+def _merged(base: List[Dict[str, Any]], profiles: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    by_id = {str(p.get("id", "")): p for p in base}
+    for profile in profiles:
+        by_id[str(profile["id"])] = profile
+    return list(by_id.values())
+
+
+class ProfileRepository:
+    """Process-wide cache of the raw profile list with an id index.
+
+    Runtime profiles live in the database `profiles` table; until anything has
+    been written there (or after clear_runtime()) the seed file is served. Each
+    read costs one lookup of the table's revision counter, and the list is only
+    reloaded when another writer moved it. Writes from this process are applied
+    to the cached list directly when no other write happened in between.
+    Returned profiles are shared; callers copy before changing them.
+    """
+
+    def __init__(self, seed_path: Path, legacy_runtime_path: Optional[Path] = None) -> None:
+        self.seed_path = seed_path
+        self.legacy_runtime_path = legacy_runtime_path
+        self._lock = threading.Lock()
+        self._signature: Optional[StoreSignature] = None
+        self._profiles: List[Dict[str, Any]] = []
+        self._by_id: Dict[str, Dict[str, Any]] = {}
+        self.version = 0
+        self.loads = 0
+
+    def _seed_signature(self) -> FileSignature:
+        stat = self.seed_path.stat()
+        return (str(self.seed_path), stat.st_mtime_ns, stat.st_size)
+
+    def _current_signature(self) -> StoreSignature:
+        state = get_profile_store_state()
+        seed = None if state["active"] else self._seed_signature()
+        return (state["revision"], state["active"], seed)
+
+    def _install(self, profiles: List[Dict[str, Any]], signature: Optional[StoreSignature]) -> None:
+        self._profiles = list(profiles)
+        self._by_id = {str(p.get("id", "")): p for p in self._profiles}
+        self._signature = signature
+        self.version += 1
+
+    def _read_seed(self) -> List[Dict[str, Any]]:
+        with open(self.seed_path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, list):
+            raise ValueError("profiles source must be a JSON array")
+        return loaded
+
+    def _refresh(self) -> None:
+        signature = self._current_signature()
+        if signature == self._signature:
+            return
+        if signature[1]:
+            loaded = [json.loads(row["data"]) for row in list_profiles()]
+        else:
+            loaded = self._read_seed()
+        self.loads += 1
+        self._install(loaded, signature)
+
+    def profiles(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return list(self._profiles)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self._refresh()
+            return self._by_id.get(profile_id)
+
+    def snapshot(self) -> Tuple[int, List[Dict[str, Any]]]:
+        """The profile list together with the version it was loaded as."""
+        with self._lock:
+            self._refresh()
+            return self.version, list(self._profiles)
+
+    def current_version(self) -> int:
+        with self._lock:
+            self._refresh()
+            return self.version
+
+    def runtime_active(self) -> bool:
+        return bool(get_profile_store_state()["active"])
+
+    def source_name(self) -> str:
+        """Where profiles are served from, for API responses."""
+        return RUNTIME_SOURCE if self.runtime_active() else self.seed_path.name
+
+    def _after_write(self, revision: int, expected: Optional[List[Dict[str, Any]]]) -> None:
+        # Caller holds the lock. Reuse the written list only if ours was the sole write since the last load.
+        previous = self._signature
+        if expected is not None and previous is not None and previous[0] == revision - 1:
+            self._install(expected, (revision, 1, None))
+        else:
+            self._signature = None
+
+    def persist(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        """Replace all runtime profiles in one transaction; returns the stored count."""
+        profiles = list(profiles)
+        with self._lock:
+            result = replace_profiles(_profile_rows(profiles), _utc_now())
+            self._after_write(result["revision"], _merged([], profiles))
+        return result["stored"]
+
+    def persist_stream(self, profiles: Iterable[Dict[str, Any]]) -> int:
+        """Like persist() for a large iterable; the list is reloaded from the table on the next read."""
+        with self._lock:
+            result = replace_profiles(_profile_rows(profiles), _utc_now())
+            self._signature = None
+        return result["stored"]
+
+    def merge(self, profiles: Iterable[Dict[str, Any]], include_seed: bool = False, keep_in_memory: bool = True) -> int:
+        """Upsert profiles by id without rewriting the others; returns the stored count.
+
+        While no runtime profiles exist yet, include_seed=True starts from the
+        seed list and include_seed=False starts from an empty table, matching
+        persist(). keep_in_memory=False skips updating the cached list (for
+        streamed batches that should not be held in memory).
+        """
+        with self._lock:
+            if keep_in_memory:
+                profiles = list(profiles)
+            seed = self._read_seed() if include_seed and not self.runtime_active() else []
+            result = upsert_profiles(_profile_rows(profiles), _utc_now(), seed_rows=_profile_rows(seed))
+            expected = None
+            if keep_in_memory and self._signature is not None:
+                if result["was_active"]:
+                    base = self._profiles if self._signature[1] else None
+                else:
+                    base = seed
+                expected = _merged(base, profiles) if base is not None else None
+            self._after_write(result["revision"], expected)
+        return result["stored"]
+
+    def upsert(self, profile: Dict[str, Any]) -> None:
+        """Store one profile; the first write copies the seed profiles into the table."""
+        self.merge([profile], include_seed=True)
+
+    def clear_runtime(self) -> None:
+        with self._lock:
+            clear_profiles()
+            self._signature = None
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._signature = None
+
+    def import_json(self, path: Path, overwrite: bool = True) -> int:
+        """Load a JSON array of profiles into the table (replace, or merge by id)."""
+        with open(path, "r", encoding="utf-8") as f:
+            loaded = json.load(f)
+        if not isinstance(loaded, list):
+            raise ValueError("profiles source must be a JSON array")
+        if any(not isinstance(p, dict) or not p.get("id") for p in loaded):
+            raise ValueError("every profile needs an id")
+        return self.persist(loaded) if overwrite else self.merge(loaded)
+
+    def export_json(self, path: Path) -> int:
+        """Write the served profile list as a JSON array via temp file + rename."""
+        profiles = self.profiles()
+        tmp = path.with_name(f".{path.name}.tmp")
+        tmp.write_text(json.dumps(profiles, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
+        return len(profiles)
+
+    def import_legacy_runtime(self) -> bool:
+        """One-time move of a pre-database runtime_profiles.json into the table.
+
+        The file is renamed to *.imported afterwards; nothing happens once the
+        table is active.
+        """
+        legacy = self.legacy_runtime_path
+        if legacy is None or not legacy.exists() or self.runtime_active():
+            return False
+        self.import_json(legacy)
+        os.replace(legacy, legacy.with_name(legacy.name + ".imported"))
+        return True
+
+
+PROFILE_REPOSITORY = ProfileRepository(DATA_PATH, LEGACY_RUNTIME_PATH)
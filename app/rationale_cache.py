@@ -0,0 +1,226 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set
+
+from app.db import get_cached_rationale, prune_rationale_cache, put_cached_rationale, touch_cached_rationales
+from app.explanations import (
+    RationaleItem,
+    _llm_enabled,
+    _llm_rationale,
+    _llm_rationale_batch,
+    _template_rationale,
+)
+
+SCORE_QUANTUM = 0.05
+PRUNE_EVERY_PUTS = 100
+TOUCH_BATCH = 100
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, str(default)))
+    except ValueError:
+        return default
+
+
+def _utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _content_hash(a: Dict[str, Any], b: Dict[str, Any]) -> str:
+    # Enrichment output changes between refreshes without changing what the prompt says.
+    content = [{k: v for k, v in p.items() if k != "enrichment"} for p in (a, b)]
+    raw = json.dumps(content, sort_keys=True, default=str)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:16]
+
+
+def _bucket(value: float) -> str:
+    return f"{round(value / SCORE_QUANTUM) * SCORE_QUANTUM:.2f}"
+
+
+def rationale_cache_key(a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float) -> str:
+    return "::".join(
+        [
+            str(a.get("id", "")),
+            str(b.get("id", "")),
+            _content_hash(a, b),
+            f"{_bucket(fit)}:{_bucket(comp)}:{_bucket(ready)}",
+        ]
+    )
+
+
+class RationaleCache:
+    """Bounded LRU of generated rationales, backed by the rationale_cache table.
+
+    The in-memory layer answers repeat lookups within a process; the database
+    layer survives restarts and is shared between workers. Hits (from either
+    layer) are collected and written back as one last_used_at update per
+    TOUCH_BATCH distinct keys, and before every prune, so pruning evicts the
+    least recently used rows without a database write per lookup. Database
+    errors are counted and treated as misses so explanations never fail
+    because of the cache.
+    """
+
+    def __init__(self, max_entries: int = 5000, max_db_rows: int = 50000, persist: bool = True) -> None:
+        self.max_entries = max(max_entries, 1)
+        self.max_db_rows = max(max_db_rows, 1)
+        self.persist = persist
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._puts_since_prune = 0
+        self._touched: Set[str] = set()
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def _remember_locked(self, key: str, text: str) -> None:
+        self._entries[key] = text
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _touch_locked(self, key: str) -> List[str]:
+        """Queue a hit for the database; returns the batch to flush once it is full."""
+        if not self.persist:
+            return []
+        self._touched.add(key)
+        if len(self._touched) < TOUCH_BATCH:
+            return []
+        batch, self._touched = list(self._touched), set()
+        return batch
+
+    def _flush_touches(self, keys: List[str]) -> None:
+        if not keys:
+            return
+        try:
+            touch_cached_rationales(keys, _utc_now())
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            text = self._entries.get(key)
+            if text is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                flush = self._touch_locked(key)
+        if text is not None:
+            self._flush_touches(flush)
+            return text
+
+        text = None
+        if self.persist:
+            try:
+                text = get_cached_rationale(key)
+            except Exception:
+                with self._lock:
+                    self.errors += 1
+
+        with self._lock:
+            if text is None:
+                self.misses += 1
+                return None
+            # Promote to the in-memory LRU; the row's last use is written back in a batch.
+            self._remember_locked(key, text)
+            self.hits += 1
+            self.db_hits += 1
+            flush = self._touch_locked(key)
+        self._flush_touches(flush)
+        return text
+
+    def put(self, key: str, text: str) -> None:
+        with self._lock:
+            self._remember_locked(key, text)
+            if not self.persist:
+                return
+            self._puts_since_prune += 1
+            prune = self._puts_since_prune >= PRUNE_EVERY_PUTS
+            touched: List[str] = []
+            if prune:
+                self._puts_since_prune = 0
+                touched, self._touched = list(self._touched), set()
+        try:
+            put_cached_rationale(key, text, _utc_now())
+            if prune:
+                if touched:
+                    touch_cached_rationales(touched, _utc_now())
+                prune_rationale_cache(self.max_db_rows)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "db_hits": self.db_hits,
+                "misses": self.misses,
+                "errors": self.errors,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "max_db_rows": self.max_db_rows,
+                "persistent": self.persist,
+            }
+
+
+RATIONALE_CACHE = RationaleCache(
+    max_entries=_env_int("RATIONALE_CACHE_SIZE", 5000),
+    max_db_rows=_env_int("RATIONALE_CACHE_DB_ROWS", 50000),
+    persist=os.getenv("RATIONALE_CACHE_PERSIST", "1") == "1",
+)
+
+
+def cached_match_rationale(
+    a: Dict[str, Any], b: Dict[str, Any], fit: float, comp: float, ready: float
+) -> str:
+    """Same contract as generate_match_rationale, but LLM output is cached per pair and score bucket.
+
+    Template rationales are cheaper than a cache lookup and are not cached; LLM
+    failures fall back to the template without caching so they are retried.
+    """
+    if not _llm_enabled():
+        return _template_rationale(a, b, fit, comp, ready)
+
+    key = rationale_cache_key(a, b, fit, comp, ready)
+    cached = RATIONALE_CACHE.get(key)
+    if cached is not None:
+        return cached
+
+    text = _llm_rationale(a, b, fit, comp, ready)
+    if text is None:
+        return _template_rationale(a, b, fit, comp, ready)
+    RATIONALE_CACHE.put(key, text)
+    return text
+
+
+def cached_match_rationales(items: Sequence[RationaleItem]) -> List[str]:
+    """Batch variant of cached_match_rationale: cache misses go to the LLM in batched requests."""
+    if not _llm_enabled():
+        return [_template_rationale(*item) for item in items]
+
+    keys = [rationale_cache_key(*item) for item in items]
+    out: List[Optional[str]] = [RATIONALE_CACHE.get(key) for key in keys]
+    pending = [idx for idx, text in enumerate(out) if text is None]
+    if pending:
+        generated = _llm_rationale_batch([items[idx] for idx in pending])
+        for idx, text in zip(pending, generated):
+            if text is None:
+                out[idx] = _template_rationale(*items[idx])
+                continue
+            RATIONALE_CACHE.put(keys[idx], text)
+            out[idx] = text
+    return [text or "" for text in out]
@@ -1,26 +1,84 @@
 from __future__ import annotations
 
+import argparse
 import json
 import sys
 from pathlib import Path
+from typing import Any, Dict, Iterator, List
 
 ROOT = Path(__file__).resolve().parents[1]
 if str(ROOT) not in sys.path:
     sys.path.insert(0, str(ROOT))
 
 from app.enrichment import enrich_profile
-from app.matching import generate_all_matches, top_intro_pairs, top_non_obvious_pairs
+from app.match_export import SourceMatches, iter_profile_matches, write_ndjson
+from app.match_parallel import iter_parallel_matches
+from app.matching import CANDIDATE_MODES, generate_all_matches, top_intro_pairs, top_non_obvious_pairs
 
 DATA_PATH = ROOT / "data" / "test_profiles.json"
 OUT_PATH = ROOT / "data" / "match_results.json"
 
 
+def _ranked(enriched: List[Dict[str, Any]], args: argparse.Namespace) -> Iterator[SourceMatches]:
+    with_rationale = not args.no_rationale
+    if args.workers > 1:
+        return iter_parallel_matches(
+            enriched,
+            workers=args.workers,
+            top_k=args.top_k,
+            with_rationale=with_rationale,
+            shard_dir=args.shard_dir,
+            candidates=args.candidates,
+        )
+    return iter_profile_matches(enriched, top_k=args.top_k, with_rationale=with_rationale, candidates=args.candidates)
+
+
+def _write_ndjson(records: Iterator[SourceMatches], target: str) -> None:
+    if target == "-":
+        write_ndjson(records, sys.stdout)
+        return
+    with open(target, "w", encoding="utf-8") as out:
+        count = write_ndjson(records, out, flush_every=50)
+    print(f"Streamed ranked matches for {count} profiles to {target}", file=sys.stderr)
+
+
 def main() -> None:
-    profiles = json.loads(DATA_PATH.read_text(encoding="utf-8"))
+    parser = argparse.ArgumentParser(description="Generate ranked matches for the seed profiles")
+    parser.add_argument("--profiles", type=Path, default=DATA_PATH, help="JSON array of profiles to rank")
+    parser.add_argument(
+        "--ndjson",
+        metavar="PATH",
+        help="stream one line per source profile to PATH (- for stdout) instead of writing match_results.json",
+    )
+    parser.add_argument("--top-k", type=int, default=None, help="keep only the top K matches per profile")
+    parser.add_argument("--no-rationale", action="store_true", help="skip rationale text")
+    parser.add_argument(
+        "--workers", type=int, default=1, help="shard source profiles across N processes (output is unchanged)"
+    )
+    parser.add_argument(
+        "--candidates",
+        choices=CANDIDATE_MODES,
+        help="with --top-k: score only index candidates, every target, or both and fail on any difference "
+        "(default: MATCH_CANDIDATES or index)",
+    )
+    parser.add_argument("--shard-dir", help="keep per-worker shard files here instead of a temporary directory")
+    args = parser.parse_args()
+
+    profiles = json.loads(args.profiles.read_text(encoding="utf-8"))
     enriched = [enrich_profile(p) for p in profiles]
 
+    if args.ndjson:
+        _write_ndjson(_ranked(enriched, args), args.ndjson)
+        return
+
+    if args.workers > 1:
+        matches = dict(_ranked(enriched, args))
+    else:
+        matches = generate_all_matches(
+            enriched, top_k=args.top_k, with_rationale=not args.no_rationale, candidates=args.candidates
+        )
     out = {
-        "matches": generate_all_matches(enriched),
+        "matches": matches,
         "top_intro_pairs": top_intro_pairs(enriched, limit=10),
         "top_non_obvious_pairs": top_non_obvious_pairs(enriched, limit=5),
     }
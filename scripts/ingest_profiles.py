@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db import backend_summary, init_db
+from app.ingest import DEFAULT_PROGRESS_EVERY, ProfileStreamIngest
+from app.profiles import PROFILE_REPOSITORY
+
+
+def _print_progress(status) -> None:
+    print(f"  {status['received']} profiles read ({status['unique_ids']} unique)", file=sys.stderr)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream an NDJSON profile export into the profiles table")
+    parser.add_argument("source", help="NDJSON file with one profile per line, or - for stdin")
+    parser.add_argument("--merge", action="store_true", help="merge by id into the current runtime profiles")
+    parser.add_argument("--progress-every", type=int, default=DEFAULT_PROGRESS_EVERY)
+    args = parser.parse_args()
+    init_db()
+
+    with ProfileStreamIngest(
+        PROFILE_REPOSITORY,
+        overwrite=not args.merge,
+        progress=_print_progress,
+        progress_every=args.progress_every,
+    ) as ingest:
+        try:
+            if args.source == "-":
+                ingest.feed_lines(sys.stdin.buffer)
+            else:
+                with open(args.source, "rb") as f:
+                    ingest.feed_lines(f)
+            result = ingest.commit()
+        except ValueError as exc:
+            sys.exit(f"Ingest failed, stored profiles unchanged: {exc}")
+
+    print(f"Stored {result['stored_profiles']} profiles in the {backend_summary()['backend']} profiles table")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from app.db import init_db
+from app.profiles import PROFILE_REPOSITORY
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import or export the profiles table as a JSON array")
+    sub = parser.add_subparsers(dest="command", required=True)
+    import_cmd = sub.add_parser("import", help="load a JSON array of profiles into the profiles table")
+    import_cmd.add_argument("path", type=Path)
+    import_cmd.add_argument("--merge", action="store_true", help="merge by id instead of replacing all profiles")
+    export_cmd = sub.add_parser("export", help="write the served profiles to a JSON file")
+    export_cmd.add_argument("path", type=Path)
+    args = parser.parse_args()
+    init_db()
+
+    if args.command == "import":
+        try:
+            stored = PROFILE_REPOSITORY.import_json(args.path, overwrite=not args.merge)
+        except ValueError as exc:
+            sys.exit(f"Import failed, stored profiles unchanged: {exc}")
+        print(f"Stored {stored} profiles from {args.path}")
+        return
+
+    count = PROFILE_REPOSITORY.export_json(args.path)
+    print(f"Exported {count} profiles ({PROFILE_REPOSITORY.source_name()}) to {args.path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import json
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app.chat_peers import ChatPeerAllowlist
+from app.match_graph import MatchGraph
+from app.matching import generate_all_matches
+
+
+def _brute_force_allowed(user, profiles, users):
+    per_profile = generate_all_matches(profiles, top_k=4, with_rationale=False)
+    mine = {m["target_id"] for m in per_profile.get(user["profile_id"], [])}
+    allowed = set()
+    for u in users:
+        if u["id"] == user["id"]:
+            continue
+        theirs = {m["target_id"] for m in per_profile.get(u["profile_id"], [])}
+        if u["profile_id"] in mine or user["profile_id"] in theirs:
+            allowed.add(u["id"])
+    return allowed
+
+
+class ChatPeerAllowlistTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiles = json.loads(Path("data/test_profiles.json").read_text(encoding="utf-8"))
+        self.users = [{"id": f"u-{p['id']}", "profile_id": p["id"]} for p in self.profiles]
+        self.graph = MatchGraph()
+        self.graph.sync(self.profiles)
+
+    def test_matches_top_k_in_either_direction(self) -> None:
+        allowlist = ChatPeerAllowlist(top_k=4)
+        with patch("app.chat_peers.list_users", return_value=self.users):
+            for user in self.users:
+                expected = _brute_force_allowed(user, self.profiles, self.users)
+                self.assertEqual(allowlist.allowed_peer_ids(self.graph, user), expected)
+                for other in self.users:
+                    self.assertEqual(allowlist.is_allowed(self.graph, user, other["id"]), other["id"] in expected)
+        self.assertEqual(allowlist.rebuilds, 1)
+
+    def test_rebuilds_only_when_graph_version_moves(self) -> None:
+        allowlist = ChatPeerAllowlist(top_k=1)
+        user = self.users[0]
+        with patch("app.chat_peers.list_users", return_value=self.users) as users:
+            allowlist.is_allowed(self.graph, user, self.users[1]["id"])
+            allowlist.is_allowed(self.graph, user, self.users[2]["id"])
+            self.assertEqual(users.call_count, 1)
+
+            self.graph.sync([*self.profiles, {"id": "late", "name": "Late", "title": "CEO", "organization": "Rails"}])
+            allowlist.is_allowed(self.graph, user, self.users[1]["id"])
+            self.assertEqual(users.call_count, 2)
+
+    def test_refresh_reads_only_the_graph(self) -> None:
+        allowlist = ChatPeerAllowlist(top_k=2)
+        with patch("app.chat_peers.list_users", return_value=self.users) as users:
+            allowlist.refresh(self.graph)
+            self.assertEqual((allowlist.rebuilds, users.call_count), (1, 0))
+
+            with patch.object(self.graph, "matches", side_effect=AssertionError("graph read in lookup")):
+                allowlist.allowed_peer_ids(self.graph, self.users[0])
+            self.assertEqual((allowlist.rebuilds, users.call_count), (1, 1))
+
+    def test_users_without_profile_have_no_peers(self) -> None:
+        allowlist = ChatPeerAllowlist()
+        with patch("app.chat_peers.list_users", return_value=self.users):
+            self.assertEqual(allowlist.allowed_peer_ids(self.graph, {"id": "u-x", "profile_id": ""}), set())
+            self.assertFalse(allowlist.is_allowed(self.graph, self.users[0], self.users[0]["id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
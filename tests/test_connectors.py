@@ -1,11 +1,17 @@
 from __future__ import annotations
 
 import os
+import threading
+import time
 import unittest
 from pathlib import Path
 import json
+from unittest.mock import patch
+from urllib.error import URLError
 
 from app.connectors import (
+    CONNECTOR_REGISTRY,
+    _result,
     infer_company_website,
     parse_clearbit_payload,
     parse_crunchbase_payload,
@@ -117,6 +123,73 @@ class ConnectorsTest(unittest.TestCase):
         self.assertIn("funding_stage:series b", result["tags"])
         self.assertIn("social_presence:linkedin", result["tags"])
 
+    def test_run_live_connectors_runs_concurrently_with_timings(self) -> None:
+        def slow(name):
+            def handler(_profile):
+                time.sleep(0.3)
+                return _result(name, tags=[f"{name}_tag"], sources=[name])
+
+            return handler
+
+        registry = dict(CONNECTOR_REGISTRY, website=slow("website"), clearbit=slow("clearbit"))
+        with patch.dict("app.connectors.CONNECTOR_REGISTRY", registry):
+            started = time.perf_counter()
+            result = run_live_connectors({}, connectors=["website", "clearbit", "structured_funding"])
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.55)
+        self.assertEqual(result["tags"], ["clearbit_tag", "website_tag"])
+        self.assertEqual(
+            [r["connector"] for r in result["connector_results"]], ["website", "clearbit", "structured_funding"]
+        )
+        self.assertEqual(set(result["timings_ms"]), {"website", "clearbit", "structured_funding"})
+        self.assertGreaterEqual(result["timings_ms"]["website"], 250)
+
+    def test_run_live_connectors_deadline_returns_partial_results(self) -> None:
+        def hung(_profile):
+            time.sleep(1.0)
+            return _result("website", tags=["late"])
+
+        with patch.dict("app.connectors.CONNECTOR_REGISTRY", dict(CONNECTOR_REGISTRY, website=hung)):
+            started = time.perf_counter()
+            result = run_live_connectors(
+                {"stage": "Series B"}, connectors=["website", "structured_funding"], deadline_seconds=0.2
+            )
+            elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.6)
+        self.assertIn("website_deadline_exceeded", result["errors"])
+        self.assertIn("funding_stage:series b", result["tags"])
+        self.assertNotIn("late", result["tags"])
+        self.assertEqual(len(result["connector_results"]), 2)
+
+    def test_run_live_connectors_caps_http_timeouts_at_deadline_on_shared_pool(self) -> None:
+        timeouts = []
+
+        def fake_urlopen(_request, timeout):
+            timeouts.append(timeout)
+            raise URLError("offline")
+
+        with patch("app.connectors.urlopen", fake_urlopen):
+            for _ in range(3):
+                result = run_live_connectors(
+                    {"website": "https://example.com"}, connectors=["website"], deadline_seconds=0.5
+                )
+                self.assertEqual(result["errors"], ["website_fetch_failed:URLError"])
+
+        self.assertEqual(len(timeouts), 3)
+        self.assertTrue(all(0 < t <= 0.5 for t in timeouts))
+        workers = [t for t in threading.enumerate() if t.name.startswith("live-connector")]
+        self.assertLessEqual(len(workers), 16)
+
+    def test_unexpected_connector_exception_becomes_error(self) -> None:
+        def broken(_profile):
+            raise RuntimeError("boom")
+
+        with patch.dict("app.connectors.CONNECTOR_REGISTRY", dict(CONNECTOR_REGISTRY, website=broken)):
+            result = run_live_connectors({}, connectors=["website"])
+        self.assertEqual(result["errors"], ["website_failed:RuntimeError"])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+import unittest
+
+from app.dashboard_cache import DashboardCache, etag_matches
+
+
+class DashboardCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cache = DashboardCache(max_age_seconds=3600)
+        self.builds = []
+        self.overlays = []
+
+    def _snapshot(self, match_key, action_key, variant=True):
+        def build():
+            self.builds.append(match_key)
+            return match_key, {"rows": f"ranked@{match_key}"}
+
+        def overlay(part):
+            self.overlays.append(action_key)
+            return {"rows": part["rows"], "actions": action_key}
+
+        return self.cache.snapshot(variant, match_key, action_key, build, overlay)
+
+    def test_action_writes_only_rebuild_the_overlay(self) -> None:
+        etag1, payload1 = self._snapshot(1, "a1")
+        etag2, payload2 = self._snapshot(1, "a1")
+        self.assertEqual(etag1, etag2)
+        self.assertIs(payload1, payload2)
+
+        etag3, payload3 = self._snapshot(1, "a2")
+        self.assertNotEqual(etag3, etag1)
+        self.assertEqual(payload3, {"rows": "ranked@1", "actions": "a2"})
+        self.assertEqual(self.builds, [1])
+        self.assertEqual(self.overlays, ["a1", "a2"])
+
+        etag4, payload4 = self._snapshot(2, "a2")
+        self.assertNotEqual(etag4, etag3)
+        self.assertEqual(payload4["rows"], "ranked@2")
+        self.assertEqual(self.builds, [1, 2])
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    def test_variants_are_cached_separately_and_expire(self) -> None:
+        self._snapshot(1, "a1", variant=True)
+        self._snapshot(1, "a1", variant=False)
+        self.assertEqual(self.builds, [1, 1])
+
+        self.cache.max_age_seconds = -1
+        etag_old, _ = self._snapshot(1, "a1", variant=False)
+        etag_new, _ = self._snapshot(1, "a1", variant=False)
+        self.assertNotEqual(etag_old, etag_new)
+        self.assertEqual(len(self.builds), 4)
+
+    def test_etag_matching(self) -> None:
+        etag = '"dash-abc"'
+        self.assertTrue(etag_matches('"dash-abc"', etag))
+        self.assertTrue(etag_matches('W/"dash-abc"', etag))
+        self.assertTrue(etag_matches('"other", "dash-abc"', etag))
+        self.assertTrue(etag_matches("*", etag))
+        self.assertFalse(etag_matches('"other"', etag))
+        self.assertFalse(etag_matches(None, etag))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 import os
+import sqlite3
 import tempfile
+import threading
 import unittest
 from pathlib import Path
 
@@ -35,6 +37,90 @@ class DbTest(unittest.TestCase):
             self.assertEqual(rows[0]["to_id"], "p2")
             self.assertEqual(rows[0]["status"], "approved")
 
+    def test_sqlite_action_lookup_by_pairs_and_counts(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'actions.db'}"
+            db.init_db()
+            db.upsert_action("p1", "p2", "approved", "", "2026-02-17T00:00:00Z")
+            db.upsert_action("p2", "p1", "rejected", "", "2026-02-17T00:01:00Z")
+            db.upsert_action("p3", "p4", "approved", "", "2026-02-17T00:02:00Z")
+
+            found = db.get_actions_for_pairs([("p1", "p2"), ("p2", "p1"), ("p1", "p2"), ("p9", "p1")])
+            self.assertEqual(sorted(found), ["p1::p2", "p2::p1"])
+            self.assertEqual(found["p2::p1"]["status"], "rejected")
+            self.assertEqual(db.get_actions_for_pairs([]), {})
+            self.assertEqual(db.count_actions(), {"total": 3, "by_status": {"approved": 2, "rejected": 1}})
+
+            many = [(f"x{i}", "p2") for i in range(db.ACTION_LOOKUP_CHUNK + 5)] + [("p3", "p4")]
+            self.assertEqual(list(db.get_actions_for_pairs(many)), ["p3::p4"])
+
+            pairs = [{"from_id": "p3", "to_id": "p4"}, {"from_id": "p4", "to_id": "p3"}]
+            db.attach_pair_actions(pairs)
+            self.assertEqual([row["action"]["status"] for row in pairs], ["approved", "pending"])
+            ranked = {"p2": [{"target_id": "p1"}, {"target_id": "p5"}]}
+            merged = db.with_actions(ranked)
+            self.assertEqual([row["action"]["status"] for row in merged["p2"]], ["rejected", "pending"])
+            self.assertNotIn("action", ranked["p2"][0])
+
+    def test_sqlite_bulk_action_upsert_reports_per_row_results(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'bulk.db'}"
+            db.init_db()
+            db.upsert_action("p1", "p2", "pending", "", "2026-02-17T00:00:00Z")
+            results = db.upsert_actions_bulk(
+                [
+                    {"from_id": "p1", "to_id": "p2", "status": "approved", "notes": "go"},
+                    {"from_id": "p3", "to_id": "p4", "status": "rejected", "notes": ""},
+                    {"from_id": "p3", "to_id": "p4", "status": "approved", "notes": "changed mind"},
+                ],
+                "2026-02-18T00:00:00Z",
+            )
+            self.assertEqual([r["result"] for r in results], ["updated", "created", "updated"])
+            stored = db.action_map()
+            self.assertEqual(stored["p1::p2"]["status"], "approved")
+            self.assertEqual(stored["p3::p4"]["notes"], "changed mind")
+            self.assertEqual(db.upsert_actions_bulk([], "2026-02-18T00:00:00Z"), [])
+
+    def test_sqlite_concurrent_bulk_upserts_create_a_pair_once(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'race.db'}"
+            db.init_db()
+            barrier = threading.Barrier(6)
+            results = []
+
+            def write(n: int) -> None:
+                barrier.wait()
+                action = {"from_id": "p1", "to_id": "p2", "status": "approved", "notes": str(n)}
+                results.extend(db.upsert_actions_bulk([action], f"2026-02-18T00:00:0{n}Z"))
+
+            threads = [threading.Thread(target=write, args=(n,)) for n in range(6)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(sorted(r["result"] for r in results), ["created"] + ["updated"] * 5)
+
+    def test_sqlite_action_and_enrichment_signatures_move_on_writes(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'signatures.db'}"
+            db.init_db()
+            self.assertEqual(db.action_signature(), 0)
+            db.upsert_action("p1", "p2", "pending", "", "2026-02-17T00:00:00Z")
+            self.assertEqual(db.action_signature(), 1)
+            # Same row count and an unchanged timestamp still move the revision.
+            db.upsert_action("p1", "p2", "approved", "", "2026-02-17T00:00:00Z")
+            self.assertEqual(db.action_signature(), 2)
+            db.upsert_actions_bulk([{"from_id": "p1", "to_id": "p3", "status": "pending"}], "2026-02-17T00:01:00Z")
+            self.assertEqual(db.action_signature(), 3)
+
+            self.assertEqual(db.enrichment_signature(), 0)
+            row = {"connector": "website", "content_hash": "h", "result": "{}", "fetched_at": "2026-02-17T00:00:00Z"}
+            db.put_enrichment_results("p1", [row])
+            self.assertEqual(db.enrichment_signature(), 1)
+            db.delete_enrichment_results("p1")
+            self.assertEqual(db.enrichment_signature(), 2)
+            self.assertEqual(db.action_signature(), 3)
+
     def test_backend_summary_reports_current_backend(self) -> None:
         os.environ["DATABASE_URL"] = "sqlite:///tmp/summary.db"
         s = db.backend_summary()
@@ -79,6 +165,177 @@ class DbTest(unittest.TestCase):
             activity = db.get_recent_chat_activity_for_user("u1")
             self.assertGreaterEqual(len(activity), 2)
 
+    def test_sqlite_chat_paging_and_latest_per_peer(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'chat.db'}"
+            db.init_db()
+            ids = []
+            for i in range(6):
+                sender, receiver = ("u1", "u2") if i % 2 == 0 else ("u2", "u1")
+                ids.append(db.insert_chat_message(sender, receiver, f"m{i}", f"2026-02-18T01:0{i}:00Z")["id"])
+            db.insert_chat_message("u3", "u1", "other", "2026-02-18T02:00:00Z")
+
+            page = db.get_chat_messages_between("u1", "u2", limit=2, before_id=ids[4])
+            self.assertEqual([m["id"] for m in page], ids[2:4])
+            forward = db.get_chat_messages_between("u1", "u2", limit=10, after_id=ids[3])
+            self.assertEqual([m["id"] for m in forward], ids[4:])
+            self.assertEqual([m["id"] for m in db.get_chat_messages_between("u2", "u1", limit=2)], ids[:2])
+
+            latest = db.get_latest_chat_message_per_peer("u1")
+            self.assertEqual([(m["peer_id"], m["body"]) for m in latest], [("u3", "other"), ("u2", "m5")])
+            self.assertEqual(len(db.get_recent_chat_activity_for_user("u1", limit=3)), 3)
+
+            _kind, conn = db._connect()
+            names = {row["name"] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+            conn.close()
+            self.assertTrue({name for name, _cols in db.CHAT_MESSAGE_INDEXES} <= names)
+
+    def test_sqlite_conversation_summaries_and_backfill(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'inbox.db'}"
+            db.init_db()
+            db.insert_chat_message("u1", "u2", "hello", "2026-02-18T01:00:00Z")
+            db.insert_chat_message("u1", "u2", "are you there?", "2026-02-18T01:01:00Z")
+            db.insert_chat_message("u3", "u1", "intro?", "2026-02-18T01:02:00Z")
+
+            inbox = db.get_chat_inbox("u1")
+            summary = [(r["peer_id"], r["last_body"], r["unread_count"]) for r in inbox]
+            self.assertEqual(summary, [("u3", "intro?", 1), ("u2", "are you there?", 0)])
+            self.assertEqual(db.get_chat_inbox("u2")[0]["unread_count"], 2)
+            db.mark_conversation_read("u2", "u1")
+            self.assertEqual(db.get_chat_inbox("u2")[0]["unread_count"], 0)
+
+            _kind, conn = db._connect()
+            conn.execute("DELETE FROM chat_conversations")
+            conn.commit()
+            conn.close()
+            db.init_db()
+            rebuilt = db.get_chat_inbox("u1")
+            summary = [(r["peer_id"], r["last_body"], r["unread_count"]) for r in rebuilt]
+            self.assertEqual(summary, [("u3", "intro?", 0), ("u2", "are you there?", 0)])
+
+
+class _FakeServerConnection:
+    def __init__(self) -> None:
+        self.open = True
+        self.server_status = 0
+        self.healthy = True
+
+    def ping(self, reconnect: bool = False) -> None:
+        if not self.healthy:
+            raise ConnectionError("gone")
+
+    def close(self) -> None:
+        self.open = False
+
+
+class ConnectionPoolTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original = os.environ.get("DATABASE_URL")
+        self.created = []
+
+    def tearDown(self) -> None:
+        if self._original is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = self._original
+        db.reset_pools()
+
+    def _pool(self, **overrides) -> db.ConnectionPool:
+        settings = db.PoolSettings(size=2, timeout_seconds=0.05, recycle_seconds=60, ping_after_seconds=60)
+        for key, value in overrides.items():
+            setattr(settings, key, value)
+
+        def factory(cfg):
+            conn = _FakeServerConnection()
+            self.created.append(conn)
+            return conn
+
+        return db.ConnectionPool(db.DbConfig(kind="mysql", url="mysql://u:p@h/d"), factory, settings)
+
+    def test_reuses_connections_and_bounds_checkouts(self) -> None:
+        pool = self._pool()
+        first = pool.acquire()
+        first.close()
+        first.close()
+        again = pool.acquire()
+        other = pool.acquire()
+        self.assertEqual(len(self.created), 2)
+        with self.assertRaises(RuntimeError):
+            pool.acquire()
+        stats = pool.stats()
+        self.assertEqual((stats["in_use"], stats["created"]), (2, 2))
+        self.assertGreaterEqual(stats["waits"], 1)
+
+        pool.settings.timeout_seconds = 2
+        releaser = threading.Timer(0.01, again.close)
+        releaser.start()
+        self.assertIs(pool.acquire()._raw, again._raw)
+        releaser.join()
+        other.close()
+
+    def test_recycles_old_and_replaces_dead_connections(self) -> None:
+        pool = self._pool(recycle_seconds=0)
+        pool.acquire().close()
+        pool.acquire().close()
+        self.assertEqual(pool.stats()["recycled"], 1)
+        self.assertFalse(self.created[0].open)
+
+        pool = self._pool(ping_after_seconds=0)
+        conn = pool.acquire()
+        conn.close()
+        self.created[-1].healthy = False
+        pool.acquire()
+        self.assertEqual(pool.stats()["discarded"], 1)
+
+        broken = pool.acquire()
+        broken._raw.open = False
+        broken.close()
+        self.assertEqual(pool.stats()["idle"], 0)
+
+    def test_sqlite_reuses_one_connection_per_thread_and_rolls_back(self) -> None:
+        with tempfile.TemporaryDirectory() as td:
+            os.environ["DATABASE_URL"] = f"sqlite:///{Path(td) / 'pool.db'}"
+            db.init_db()
+            _kind, conn = db._connect()
+            raw = conn._raw
+            conn.execute("INSERT INTO intro_actions VALUES ('a', 'b', 'pending', '', 'now')")
+            conn.close()
+            self.assertEqual(db.get_all_actions(), [])
+
+            _kind, again = db._connect()
+            self.assertIs(again._raw, raw)
+            again.close()
+
+            seen = []
+
+            def checkout() -> None:
+                _kind, worker_conn = db._connect()
+                seen.append(worker_conn._raw)
+                worker_conn.close()
+
+            worker = threading.Thread(target=checkout)
+            worker.start()
+            worker.join()
+            self.assertIsNot(seen[0], raw)
+            self.assertEqual(db.pool_stats()["created"], 2)
+            self.assertEqual(db.pool_stats()["open"], 2)
+
+            # The next connection opened reaps the one owned by the exited worker.
+            other = threading.Thread(target=checkout)
+            other.start()
+            other.join()
+            stats = db.pool_stats()
+            self.assertEqual((stats["created"], stats["reaped"]), (3, 1))
+            with self.assertRaises(sqlite3.ProgrammingError):
+                seen[0].execute("SELECT 1")
+
+            os.remove(Path(td) / "pool.db")
+            db.init_db()
+            _kind, replaced = db._connect()
+            self.assertIsNot(replaced._raw, raw)
+            replaced.close()
+
 
 if __name__ == "__main__":
     unittest.main()
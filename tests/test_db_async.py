@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+from app import db, db_async
+
+
+class DbAsyncTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original = os.environ.get("DATABASE_URL")
+        self._td = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(self._td.name) / 'async.db'}"
+        db.init_db()
+
+    def tearDown(self) -> None:
+        if self._original is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = self._original
+        self._td.cleanup()
+
+    def test_wrappers_round_trip_through_executor(self) -> None:
+        async def scenario():
+            await db_async.upsert_action("p1", "p2", "approved", "", "2026-02-17T00:00:00Z")
+            await db_async.insert_chat_message("u1", "u2", "hello", "2026-02-17T00:00:01Z")
+            return await asyncio.gather(db_async.get_all_actions(), db_async.get_chat_inbox("u2"))
+
+        actions, inbox = asyncio.run(scenario())
+        self.assertEqual([(a["from_id"], a["status"]) for a in actions], [("p1", "approved")])
+        self.assertEqual(inbox[0]["peer_id"], "u1")
+        self.assertEqual(inbox[0]["unread_count"], 1)
+        self.assertEqual(db_async.get_all_actions.__name__, "get_all_actions")
+
+    def test_concurrency_is_bounded_by_worker_count(self) -> None:
+        executor = db_async.DbExecutor(workers=2)
+        lock = threading.Lock()
+        active = {"now": 0, "max": 0}
+
+        def slow() -> None:
+            with lock:
+                active["now"] += 1
+                active["max"] = max(active["max"], active["now"])
+            time.sleep(0.02)
+            with lock:
+                active["now"] -= 1
+
+        async def scenario():
+            await asyncio.gather(*(executor.run(slow) for _ in range(6)))
+
+        try:
+            asyncio.run(scenario())
+        finally:
+            executor.shutdown()
+        self.assertEqual(active["max"], 2)
+        stats = executor.stats()
+        self.assertEqual(stats["calls"], 6)
+        self.assertEqual(stats["peak_running"], 2)
+        self.assertEqual((stats["running"], stats["queued"]), (0, 0))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from unittest.mock import patch
+
+from app import db
+from app.connectors import _result
+from app.enrichment import enrich_profile, enrich_profiles_cached, refresh_enrichment
+
+
+def _fake_connector(name, tags, calls):
+    def run(profile):
+        calls.append(name)
+        return _result(name, tags=tags, confidence_delta=0.05, sources=[f"{name}_live"])
+
+    return run
+
+
+class EnrichmentStoreTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._prev = {k: os.environ.get(k) for k in ["DATABASE_URL", "ENRICHMENT_TTL_WEBSITE"]}
+        self._td = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(self._td.name) / 'enrich.db'}"
+        db.init_db()
+        self.calls = []
+        self.registry = {
+            "website": _fake_connector("website", ["website_signal"], self.calls),
+            "clearbit": _fake_connector("clearbit", ["clearbit_signal"], self.calls),
+        }
+        self.profile = {"id": "p1", "name": "Amara", "focus": "custody"}
+
+    def tearDown(self) -> None:
+        for key, value in self._prev.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._td.cleanup()
+
+    def _refresh(self, profile=None, connectors=("website", "clearbit")):
+        with patch.dict("app.connectors.CONNECTOR_REGISTRY", self.registry, clear=True):
+            return refresh_enrichment(profile or self.profile, live_enabled=True, connectors_override=list(connectors))
+
+    def test_empty_store_matches_offline_enrichment(self) -> None:
+        cached = enrich_profiles_cached([self.profile])[0]
+        offline = enrich_profile(self.profile, live_enabled=False)
+        self.assertEqual(cached, offline)
+        self.assertEqual(self.calls, [])
+
+    def test_cached_read_serves_stored_results_without_running_connectors(self) -> None:
+        refreshed = self._refresh()
+        self.calls.clear()
+        cached = enrich_profiles_cached([self.profile])[0]
+        self.assertEqual(self.calls, [])
+        self.assertIn("website_signal", cached["enrichment"]["inferred_tags"])
+        self.assertIn("clearbit_signal", cached["enrichment"]["inferred_tags"])
+        self.assertEqual(cached["enrichment"]["source_confidence"], refreshed["enrichment"]["source_confidence"])
+        self.assertEqual(cached["enrichment"]["active_connectors"], ["clearbit", "website"])
+
+    def test_content_change_and_ttl_expiry_hide_stored_results(self) -> None:
+        self._refresh()
+        edited = dict(self.profile, focus="tokenized funds")
+        self.assertFalse(enrich_profiles_cached([edited])[0]["enrichment"]["live_connectors_enabled"])
+
+        os.environ["ENRICHMENT_TTL_WEBSITE"] = "0"
+        stale = datetime.now(timezone.utc) + timedelta(seconds=1)
+        with patch("app.enrichment.datetime") as fake_dt:
+            fake_dt.now.return_value = stale
+            fake_dt.fromisoformat = datetime.fromisoformat
+            cached = enrich_profiles_cached([self.profile])[0]
+        self.assertEqual(cached["enrichment"]["active_connectors"], ["clearbit"])
+
+    def test_failed_connector_keeps_previous_result(self) -> None:
+        self._refresh()
+
+        def broken(profile):
+            raise RuntimeError("down")
+
+        self.registry["website"] = broken
+        refreshed = self._refresh()
+        self.assertIn("website_failed:RuntimeError", refreshed["enrichment"]["live_connector_errors"])
+        cached = enrich_profiles_cached([self.profile])[0]
+        self.assertIn("website_signal", cached["enrichment"]["inferred_tags"])
+        self.assertEqual(cached["enrichment"]["live_connector_errors"], [])
+
+    def test_delete_invalidates_store(self) -> None:
+        self._refresh()
+        db.delete_enrichment_results("p1")
+        self.assertEqual(db.get_enrichment_results(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,10 +2,12 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from unittest.mock import patch
 
-from app.explanations import generate_match_rationale
+from app.explanations import generate_match_rationale, generate_match_rationales
 
 
 class _FakeResponse:
@@ -22,14 +24,42 @@ class _FakeResponse:
         return False
 
 
+class _StubResponsesHandler(BaseHTTPRequestHandler):
+    requests: list = []
+
+    def do_POST(self) -> None:
+        length = int(self.headers.get("Content-Length", "0"))
+        payload = json.loads(self.rfile.read(length).decode("utf-8"))
+        prompt = json.loads(payload["input"][1]["content"])
+        type(self).requests.append(prompt)
+        # Answer every pair except the last one to exercise per-item fallback.
+        answers = [{"index": p["index"], "rationale": f"batched {p['source']['name']}"} for p in prompt["pairs"][:-1]]
+        body = json.dumps({"output_text": "```json\n" + json.dumps(answers) + "\n```"}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args) -> None:
+        return
+
+
 class ExplanationsTest(unittest.TestCase):
     def setUp(self) -> None:
         self._prev_enable = os.environ.get("ENABLE_LLM_RATIONALE")
         self._prev_key = os.environ.get("OPENAI_API_KEY")
         os.environ["ENABLE_LLM_RATIONALE"] = "1"
         os.environ["OPENAI_API_KEY"] = "test-key"
+        self._prev_base = os.environ.get("OPENAI_BASE_URL")
+        self._prev_batch = os.environ.get("OPENAI_RATIONALE_BATCH_SIZE")
 
     def tearDown(self) -> None:
+        for key, value in [("OPENAI_BASE_URL", self._prev_base), ("OPENAI_RATIONALE_BATCH_SIZE", self._prev_batch)]:
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
         if self._prev_enable is None:
             os.environ.pop("ENABLE_LLM_RATIONALE", None)
         else:
@@ -71,6 +101,41 @@ class ExplanationsTest(unittest.TestCase):
         text = generate_match_rationale(a, b, 0.2, 0.85, 0.75)
         self.assertIn("high strategic complementarity", text)
 
+    def test_batch_against_stub_server_with_partial_failure(self) -> None:
+        _StubResponsesHandler.requests = []
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _StubResponsesHandler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{server.server_address[1]}/v1"
+            os.environ["OPENAI_RATIONALE_BATCH_SIZE"] = "3"
+            a, b = self._profiles()
+            items = [(dict(a, name=f"A{i}"), b, 0.3, 0.9, 0.8) for i in range(5)]
+            texts = generate_match_rationales(items)
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        self.assertEqual(len(_StubResponsesHandler.requests), 2)
+        self.assertEqual([len(r["pairs"]) for r in _StubResponsesHandler.requests], [3, 2])
+        self.assertEqual(texts[0], "batched A0")
+        self.assertEqual(texts[1], "batched A1")
+        self.assertIn("Recommended for a high-value intro", texts[2])
+        self.assertEqual(texts[3], "batched A3")
+        self.assertIn("A4", texts[4])
+
+    @patch("app.explanations.urlopen", side_effect=TimeoutError("timeout"))
+    def test_batch_request_failure_falls_back_per_item(self, _mock_urlopen) -> None:
+        a, b = self._profiles()
+        texts = generate_match_rationales([(a, b, 0.2, 0.85, 0.75), (b, a, 0.1, 0.4, 0.2)])
+        self.assertIn("high strategic complementarity", texts[0])
+        self.assertIn("Marcus", texts[1])
+
+    def test_batch_disabled_uses_template(self) -> None:
+        os.environ["ENABLE_LLM_RATIONALE"] = "0"
+        a, b = self._profiles()
+        self.assertEqual(generate_match_rationales([(a, b, 0.2, 0.85, 0.75)]), [generate_match_rationale(a, b, 0.2, 0.85, 0.75)])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import db
+from app.ingest import ProfileStreamIngest
+from app.profiles import ProfileRepository
+
+
+def _ndjson(profiles) -> bytes:
+    return b"".join(json.dumps(p).encode("utf-8") + b"\n" for p in profiles)
+
+
+class ProfileStreamIngestTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original = os.environ.get("DATABASE_URL")
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        os.environ["DATABASE_URL"] = f"sqlite:///{self.root / 'ingest.db'}"
+        db.init_db()
+        seed = self.root / "seed.json"
+        seed.write_text(json.dumps([{"id": "s1", "name": "Seed"}]), encoding="utf-8")
+        self.repo = ProfileRepository(seed)
+
+    def tearDown(self) -> None:
+        if self._original is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = self._original
+        self._td.cleanup()
+
+    def _leftovers(self):
+        return sorted(p.name for p in self.root.iterdir() if p.name.startswith("."))
+
+    def test_chunked_feed_matches_in_memory_merge(self) -> None:
+        self.repo.persist([{"id": "a", "name": "A"}, {"id": "b", "name": "B"}, {"id": "c", "name": "C"}])
+        incoming = [{"id": "d", "name": "D"}, {"id": "b", "name": "B2"}, {"id": "d", "name": "D2"}]
+        body = _ndjson(incoming)
+        progress = []
+        with ProfileStreamIngest(
+            self.repo, overwrite=False, progress=progress.append, progress_every=2, spool_dir=self.root
+        ) as ingest:
+            for start in range(0, len(body), 7):
+                ingest.feed(body[start : start + 7])
+            result = ingest.commit()
+
+        by_id = {p["id"]: p for p in [{"id": "a", "name": "A"}, {"id": "b", "name": "B"}, {"id": "c", "name": "C"}]}
+        for p in incoming:
+            by_id[p["id"]] = p
+        self.assertEqual(self.repo.profiles(), list(by_id.values()))
+        self.assertEqual(result["stored_profiles"], 4)
+        self.assertEqual(result["received"], 3)
+        self.assertEqual([p["received"] for p in progress], [2, 3])
+        self.assertEqual(self._leftovers(), [])
+
+    def test_overwrite_and_trailing_line_without_newline(self) -> None:
+        self.repo.persist([{"id": "old", "name": "Old"}])
+        with ProfileStreamIngest(self.repo, spool_dir=self.root) as ingest:
+            ingest.feed(b'{"id": "x1", "name": "X"}\n\n{"id": "x2", "name": "Y"}')
+            ingest.commit()
+        self.assertEqual([p["id"] for p in self.repo.profiles()], ["x1", "x2"])
+
+    def test_invalid_line_leaves_stored_profiles_untouched(self) -> None:
+        self.repo.persist([{"id": "old", "name": "Old"}])
+        before = db.list_profiles()
+        with ProfileStreamIngest(self.repo, spool_dir=self.root) as ingest:
+            ingest.feed_line('{"id": "ok", "name": "Fine"}')
+            with self.assertRaisesRegex(ValueError, "line 2: profile missing name"):
+                ingest.feed_line('{"id": "bad"}')
+            with self.assertRaisesRegex(ValueError, "line 3: invalid JSON"):
+                ingest.feed_line("{not json")
+        self.assertEqual(db.list_profiles(), before)
+        self.assertEqual(self._leftovers(), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
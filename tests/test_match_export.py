@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+import io
+import json
+import unittest
+from pathlib import Path
+
+from app.match_export import iter_profile_matches, ndjson_lines, write_ndjson
+from app.matching import generate_all_matches
+
+
+class MatchExportTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiles = json.loads(Path("data/test_profiles.json").read_text(encoding="utf-8"))
+
+    def test_stream_matches_generate_all_matches(self) -> None:
+        out = io.StringIO()
+        count = write_ndjson(iter_profile_matches(self.profiles, top_k=3, with_rationale=False), out)
+        lines = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(count, len(self.profiles))
+        self.assertEqual(
+            {line["profile_id"]: line["matches"] for line in lines},
+            generate_all_matches(self.profiles, top_k=3, with_rationale=False),
+        )
+        self.assertEqual([line["profile_id"] for line in lines], [p["id"] for p in self.profiles])
+
+    def test_records_are_produced_lazily(self) -> None:
+        records = iter_profile_matches(self.profiles, with_rationale=False)
+        first = json.loads(next(ndjson_lines(records, match_graph_version=4)))
+        self.assertEqual(first["profile_id"], self.profiles[0]["id"])
+        self.assertEqual(first["match_graph_version"], 4)
+        self.assertEqual(len(list(records)), len(self.profiles) - 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
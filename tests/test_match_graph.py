@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import json
+import unittest
+from pathlib import Path
+
+from app.match_graph import MatchGraph
+from app.matching import generate_all_matches
+
+
+class MatchGraphTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self.profiles = json.loads(Path("data/test_profiles.json").read_text(encoding="utf-8"))
+
+    def assertMatchesFullRanking(self, graph: MatchGraph, profiles) -> None:
+        _version, rows = graph.matches()
+        self.assertEqual(rows, generate_all_matches(profiles, with_rationale=False))
+        _version, limited = graph.matches(top_k=2)
+        self.assertEqual(limited, generate_all_matches(profiles, top_k=2, with_rationale=False))
+
+    def test_full_build_matches_generate_all_matches(self) -> None:
+        graph = MatchGraph()
+        graph.sync(self.profiles)
+        self.assertMatchesFullRanking(graph, self.profiles)
+
+    def test_upsert_rescores_only_the_changed_profile(self) -> None:
+        graph = MatchGraph()
+        graph.sync(self.profiles, source_version=1)
+        edited = dict(self.profiles[0], title="General Partner", mandate="deploy into tokenized custody pilots")
+        profiles = [edited, *self.profiles[1:]]
+        version = graph.sync(profiles, source_version=2)
+
+        self.assertEqual(graph.rebuilds, 1)
+        self.assertEqual(graph.incremental_updates, 1)
+        self.assertEqual(graph.matches()[0], version)
+        self.assertMatchesFullRanking(graph, profiles)
+
+        added = {"id": "new-1", "name": "Noor", "title": "CTO", "organization": "Rails", "looking_for": ["custody"]}
+        profiles = [*profiles, added]
+        graph.sync(profiles, source_version=3)
+        self.assertEqual(graph.rebuilds, 1)
+        self.assertMatchesFullRanking(graph, profiles)
+
+    def test_repeated_edits_of_several_profiles_stay_consistent(self) -> None:
+        graph = MatchGraph(rebuild_fraction=1.0)
+        profiles = list(self.profiles)
+        graph.sync(profiles, source_version=1)
+        edits = [(0, "CTO"), (3, "Managing Partner"), (0, "Regulator"), (1, "Director"), (3, "CEO")]
+        for version, (i, title) in enumerate(edits, start=2):
+            profiles = list(profiles)
+            profiles[i] = dict(profiles[i], title=title)
+            profiles[(i + 2) % len(profiles)] = dict(profiles[(i + 2) % len(profiles)], focus=[f"edit{version}"])
+            graph.sync(profiles, source_version=version)
+            self.assertMatchesFullRanking(graph, profiles)
+        self.assertEqual(graph.rebuilds, 0)
+        self.assertGreater(graph.incremental_updates, len(profiles))
+
+    def test_same_source_version_is_a_no_op_and_removal_rebuilds(self) -> None:
+        graph = MatchGraph()
+        version = graph.sync(self.profiles, source_version=7)
+        self.assertEqual(graph.sync(self.profiles[:2], source_version=7), version)
+
+        graph.sync(self.profiles[1:], source_version=8)
+        self.assertEqual(graph.rebuilds, 2)
+        self.assertMatchesFullRanking(graph, self.profiles[1:])
+
+    def test_matches_for_selected_sources(self) -> None:
+        graph = MatchGraph()
+        graph.sync(self.profiles)
+        source_id = self.profiles[2]["id"]
+        _version, rows = graph.matches([source_id, "missing"])
+        self.assertEqual(list(rows), [source_id])
+        self.assertEqual(rows[source_id], generate_all_matches(self.profiles, with_rationale=False)[source_id])
+
+    def test_offset_pages_keep_absolute_ranks(self) -> None:
+        graph = MatchGraph()
+        graph.sync(self.profiles)
+        source_id = self.profiles[0]["id"]
+        full = graph.matches([source_id])[1][source_id]
+        pages = [graph.matches([source_id], top_k=2, offset=offset)[1][source_id] for offset in range(0, len(full), 2)]
+        self.assertEqual([row for page in pages for row in page], full)
+        self.assertEqual(pages[1][0]["priority_rank"], 3)
+        version, ids = graph.source_ids()
+        self.assertEqual(version, graph.version)
+        self.assertEqual(ids, [p["id"] for p in self.profiles])
+
+
+if __name__ == "__main__":
+    unittest.main()
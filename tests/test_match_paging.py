@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import unittest
+
+from app.match_paging import (
+    StaleCursor,
+    decode_cursor,
+    encode_cursor,
+    page_of,
+    page_window,
+    parse_fields,
+    project_rows,
+    wants,
+)
+
+
+class MatchPagingTest(unittest.TestCase):
+    def test_fields_projection_keeps_target_id(self) -> None:
+        self.assertIsNone(parse_fields(None))
+        self.assertIsNone(parse_fields(" "))
+        fields = parse_fields("score, risk_level")
+        self.assertEqual(fields, {"target_id", "score", "risk_level"})
+        self.assertFalse(wants(fields, "rationale"))
+        self.assertTrue(wants(None, "rationale"))
+        rows = [{"target_id": "p2", "score": 0.5, "risk_level": "low", "rationale": "long text", "risk_reasons": []}]
+        self.assertEqual(project_rows(rows, fields), [{"target_id": "p2", "score": 0.5, "risk_level": "low"}])
+        with self.assertRaisesRegex(ValueError, "unknown match fields: bogus"):
+            parse_fields("score,bogus")
+
+    def test_cursor_round_trip_and_staleness(self) -> None:
+        cursor = encode_cursor(7, 40)
+        self.assertEqual(decode_cursor(cursor, 7), 40)
+        self.assertEqual(decode_cursor(None, 7), 0)
+        with self.assertRaises(StaleCursor):
+            decode_cursor(cursor, 8)
+        for bad in ["not-a-cursor", encode_cursor(7, -1)]:
+            with self.assertRaisesRegex(ValueError, "invalid cursor"):
+                decode_cursor(bad, 7)
+
+    def test_pages_cover_items_once(self) -> None:
+        items = list(range(7))
+        seen, offset = [], 0
+        while True:
+            page, cursor = page_of(items, offset, 3, version=1)
+            seen.extend(page)
+            if cursor is None:
+                break
+            offset = decode_cursor(cursor, 1)
+        self.assertEqual(seen, items)
+        self.assertEqual(page_of(items, 0, None, version=1), (items, None))
+
+    def test_page_window_respects_top_k(self) -> None:
+        self.assertIsNone(page_window(0, None, None))
+        self.assertEqual(page_window(0, 10, None), 10)
+        self.assertEqual(page_window(10, 10, 15), 15)
+        self.assertEqual(page_window(0, None, 5), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import copy
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app.match_parallel import _shard_bounds, generate_all_matches_parallel
+from app.matching import generate_all_matches
+
+
+def _corpus(copies: int):
+    seed = json.loads(Path("data/test_profiles.json").read_text(encoding="utf-8"))
+    profiles = []
+    for n in range(copies):
+        for profile in seed:
+            clone = copy.deepcopy(profile)
+            clone["id"] = f"{profile['id']}-{n}"
+            clone["name"] = f"{profile['name']} {n}"
+            clone["looking_for"] = list(profile.get("looking_for", [])) + [f"cohort{n % 3}"]
+            profiles.append(clone)
+    return profiles
+
+
+class MatchParallelTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._prev_url = os.environ.get("DATABASE_URL")
+        self._tmp = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{self._tmp.name}/test.db"
+
+    def tearDown(self) -> None:
+        if self._prev_url is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = self._prev_url
+        self._tmp.cleanup()
+
+    def test_shard_bounds_cover_every_source_once(self) -> None:
+        bounds = _shard_bounds(11, 4)
+        self.assertEqual(bounds, [(0, 3), (3, 6), (6, 9), (9, 11)])
+        self.assertEqual(_shard_bounds(2, 8), [(0, 1), (1, 2)])
+
+    def test_parallel_output_equals_single_process(self) -> None:
+        profiles = _corpus(6)
+        expected = generate_all_matches(profiles, engine="python", top_k=5, with_rationale=False)
+        actual = generate_all_matches_parallel(profiles, workers=3, top_k=5, with_rationale=False)
+        self.assertEqual(list(actual), list(expected))
+        self.assertEqual(actual, expected)
+
+    def test_parallel_rationales_and_kept_shards(self) -> None:
+        profiles = _corpus(2)
+        shard_dir = os.path.join(self._tmp.name, "shards")
+        expected = generate_all_matches(profiles, engine="python", top_k=3)
+        actual = generate_all_matches_parallel(profiles, workers=2, top_k=3, shard_dir=shard_dir)
+        self.assertEqual(actual, expected)
+        self.assertEqual(len(os.listdir(shard_dir)), len(_shard_bounds(len(profiles), 8)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,11 +1,50 @@
 from __future__ import annotations
 
+import importlib.util
 import json
 import unittest
 from pathlib import Path
+from unittest.mock import patch
 
 from app.enrichment import enrich_profile
-from app.matching import generate_all_matches, top_non_obvious_pairs
+from app.matching import (
+    CandidateIndex,
+    CandidateMismatch,
+    FeatureCache,
+    VocabularyIndex,
+    _jaccard,
+    _jaccard_bits,
+    _pair_components,
+    _to_bag,
+    compact_vocabulary,
+    fill_rationales,
+    generate_all_matches,
+    matches_for_profile,
+    profile_features,
+    rank_for_profile,
+    top_intro_pairs,
+    top_non_obvious_pairs,
+)
+
+HAS_NUMPY = importlib.util.find_spec("numpy") is not None
+
+
+def _sparse_corpus(count: int):
+    # Few shared tokens and repeated readiness levels, so pruning and rank ties both occur.
+    orgs = ["Summit Fund", "Harbor Ventures", "State Bank", "Nimbus Labs", "Orbit Corp"]
+    titles = ["Partner", "CTO", "CEO", "Regulator", "Director"]
+    extras = ["deploy capital", "series a raised", "pilot partnership", "", "live product"]
+    return [
+        {
+            "id": f"s{i}",
+            "name": f"Sparse {i}",
+            "organization": orgs[i % 5],
+            "title": titles[(i // 5) % 5],
+            "mandate": f"topic{i % 11} area{i % 7} {extras[(i // 3) % 5]}",
+            "looking_for": [f"need{i % 13}"] if i % 4 else [],
+        }
+        for i in range(count)
+    ]
 
 
 class MatchingLevel3Test(unittest.TestCase):
@@ -31,6 +70,127 @@ class MatchingLevel3Test(unittest.TestCase):
         self.assertIn("risk_level", sample)
         self.assertGreaterEqual(sample["novelty_score"], 0.0)
 
+    def test_profile_features_cached_per_version(self) -> None:
+        profile = dict(self.enriched[0])
+        first = profile_features(profile)
+        self.assertIs(profile_features(dict(profile)), first)
+        self.assertEqual(first.tokens, frozenset(_to_bag(profile)))
+
+        profile["looking_for"] = ["entirely new priorities"]
+        updated = profile_features(profile)
+        self.assertIsNot(updated, first)
+        self.assertIn("priorities", updated.tokens)
+
+    def test_feature_fit_matches_list_jaccard(self) -> None:
+        a, b = self.enriched[0], self.enriched[1]
+        fa, fb = profile_features(a), profile_features(b)
+        self.assertEqual(_jaccard_bits(fa.bits, fb.bits), _jaccard(_to_bag(a), _to_bag(b)))
+        self.assertEqual(_jaccard_bits(fa.bits, 0), 0.0)
+
+    def test_feature_cache_is_a_bounded_lru_keyed_by_id(self) -> None:
+        cache = FeatureCache(max_entries=2)
+        a, b, c = (profile_features(dict(p, id=f"lru-{i}")) for i, p in enumerate(self.enriched[:3]))
+        cache.put(a)
+        cache.put(b)
+        self.assertIs(cache.get("lru-0"), a)
+        cache.put(c)
+        self.assertIsNone(cache.get("lru-1"))
+        self.assertEqual(len(cache), 2)
+
+        edited = profile_features(dict(self.enriched[0], id="lru-0", title="CTO"))
+        cache.put(edited)
+        self.assertIs(cache.get("lru-0"), edited)
+        self.assertEqual(len(cache), 2)
+
+    def test_compacted_vocabulary_reencodes_and_scores_across_vocabularies(self) -> None:
+        a, b = self.enriched[0], self.enriched[1]
+        old_a, old_b = profile_features(a), profile_features(b)
+        compact_vocabulary()
+        new_a = profile_features(a)
+        self.assertIsNot(new_a.vocabulary, old_a.vocabulary)
+        self.assertEqual(new_a.tokens, old_a.tokens)
+        self.assertEqual(_pair_components(new_a, old_b), _pair_components(old_a, old_b))
+        self.assertEqual(_pair_components(new_a, profile_features(b)), _pair_components(old_a, old_b))
+
+    def test_vocabulary_index_bitsets(self) -> None:
+        vocab = VocabularyIndex()
+        a = vocab.encode(frozenset({"custody", "defi", "pilot"}))
+        b = vocab.encode(frozenset({"custody", "pilot", "yield"}))
+        self.assertEqual(len(vocab), 4)
+        self.assertEqual(vocab.token_id("custody"), vocab.token_id("custody"))
+        self.assertEqual(_jaccard_bits(a, b), 0.5)
+
+    def test_top_k_selection_matches_full_sort(self) -> None:
+        source, targets = self.enriched[0], self.enriched[1:]
+        full = rank_for_profile(source, targets)
+        self.assertEqual(rank_for_profile(source, targets, k=2), full[:2])
+        limited = generate_all_matches(self.enriched, top_k=3)
+        complete = generate_all_matches(self.enriched)
+        for pid, rows in limited.items():
+            self.assertEqual(rows, complete[pid][:3])
+        self.assertEqual(top_intro_pairs(self.enriched, limit=3), top_intro_pairs(self.enriched, limit=10)[:3])
+
+    def test_lazy_rationales_filled_on_demand(self) -> None:
+        lazy = generate_all_matches(self.enriched, with_rationale=False)
+        eager = generate_all_matches(self.enriched)
+        source_id = self.enriched[0]["id"]
+        self.assertTrue(all(row["rationale"] is None for row in lazy[source_id]))
+
+        by_id = {p["id"]: p for p in self.enriched}
+        window = lazy[source_id][:2]
+        fill_rationales(window, by_id, source_id=source_id)
+        self.assertEqual(window, eager[source_id][:2])
+        self.assertIsNone(lazy[source_id][2]["rationale"])
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_engine_matches_python_engine(self) -> None:
+        self.assertEqual(
+            generate_all_matches(self.enriched, engine="numpy"),
+            generate_all_matches(self.enriched, engine="python"),
+        )
+        self.assertEqual(top_intro_pairs(self.enriched, engine="numpy"), top_intro_pairs(self.enriched))
+        self.assertEqual(top_non_obvious_pairs(self.enriched, engine="numpy"), top_non_obvious_pairs(self.enriched))
+
+    @unittest.skipUnless(HAS_NUMPY, "numpy not installed")
+    def test_numpy_engine_block_scoring_matches_python_engine(self) -> None:
+        profiles = _sparse_corpus(60)
+        with patch("app.matching_numpy.SCORE_BLOCK_ROWS", 7):
+            self.assertEqual(
+                generate_all_matches(profiles, engine="numpy", with_rationale=False),
+                generate_all_matches(profiles, engine="python", with_rationale=False),
+            )
+            self.assertEqual(top_intro_pairs(profiles, engine="numpy"), top_intro_pairs(profiles))
+            self.assertEqual(top_non_obvious_pairs(profiles, engine="numpy"), top_non_obvious_pairs(profiles))
+
+    def test_candidate_index_matches_exhaustive_top_k(self) -> None:
+        profiles = _sparse_corpus(120)
+        for k in (1, 4, 15):
+            self.assertEqual(
+                generate_all_matches(profiles, top_k=k, with_rationale=False, candidates="index"),
+                generate_all_matches(profiles, top_k=k, with_rationale=False, candidates="exhaustive"),
+            )
+        verified = generate_all_matches(profiles, top_k=5, candidates="verify")
+        self.assertEqual(verified, generate_all_matches(profiles, top_k=5, candidates="exhaustive"))
+
+        index = CandidateIndex(profiles)
+        pruned = index.candidates(profiles[0], 4)
+        self.assertLess(len(pruned), len(profiles) - 1)
+        self.assertNotIn(profiles[0], pruned)
+        self.assertEqual(index.candidates(profiles[0], 0), [])
+
+    def test_verify_mode_detects_missing_candidates(self) -> None:
+        profiles = _sparse_corpus(40)
+        index = CandidateIndex(profiles, verify=True)
+        index.candidate_positions = lambda source, k, _features=None: list(range(1, len(profiles)))[-k:]
+        with self.assertRaises(CandidateMismatch):
+            matches_for_profile(profiles[0], profiles, top_k=3, with_rationale=False, index=index)
+        with self.assertRaises(ValueError):
+            generate_all_matches(profiles, top_k=3, candidates="approximate")
+
+    def test_unknown_engine_rejected(self) -> None:
+        with self.assertRaises(ValueError):
+            generate_all_matches(self.enriched, engine="gpu")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from app import db
+from app.profiles import ProfileRepository
+
+
+class ProfileRepositoryTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._original = os.environ.get("DATABASE_URL")
+        self._td = tempfile.TemporaryDirectory()
+        self.root = Path(self._td.name)
+        os.environ["DATABASE_URL"] = f"sqlite:///{self.root / 'profiles.db'}"
+        db.init_db()
+        self.seed = self.root / "seed.json"
+        self.legacy = self.root / "runtime.json"
+        self.seed.write_text(json.dumps([{"id": "p1", "name": "Amara"}, {"id": "p2", "name": "Marcus"}]), encoding="utf-8")
+        self.repo = ProfileRepository(self.seed, self.legacy)
+
+    def tearDown(self) -> None:
+        if self._original is None:
+            os.environ.pop("DATABASE_URL", None)
+        else:
+            os.environ["DATABASE_URL"] = self._original
+        self._td.cleanup()
+
+    def test_parses_seed_once_until_file_changes(self) -> None:
+        self.assertEqual([p["id"] for p in self.repo.profiles()], ["p1", "p2"])
+        self.assertEqual(self.repo.get("p2")["name"], "Marcus")
+        self.assertIsNone(self.repo.get("missing"))
+        self.assertEqual(self.repo.loads, 1)
+        self.assertEqual(self.repo.source_name(), "seed.json")
+
+        self.seed.write_text(json.dumps([{"id": "p3", "name": "Lena Fischer"}]), encoding="utf-8")
+        stat = self.seed.stat()
+        os.utime(self.seed, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        self.assertEqual(self.repo.get("p3")["name"], "Lena Fischer")
+        self.assertEqual(self.repo.loads, 2)
+
+    def test_persist_and_clear_runtime_switch_sources_without_rereading(self) -> None:
+        version = self.repo.current_version()
+        self.assertEqual(self.repo.persist([{"id": "r1", "name": "Runtime"}]), 1)
+        self.assertEqual(self.repo.source_name(), "profiles")
+        self.assertEqual([p["id"] for p in self.repo.profiles()], ["r1"])
+        self.assertEqual(self.repo.loads, 1)
+        self.assertGreater(self.repo.current_version(), version)
+
+        self.repo.clear_runtime()
+        self.assertEqual(db.list_profiles(), [])
+        self.assertEqual([p["id"] for p in self.repo.profiles()], ["p1", "p2"])
+
+    def test_upsert_extends_seed_and_updates_single_rows(self) -> None:
+        self.repo.upsert({"id": "p3", "name": "Lena"})
+        self.repo.upsert({"id": "p1", "name": "Amara Okafor"})
+        self.assertEqual([p["id"] for p in self.repo.profiles()], ["p1", "p2", "p3"])
+        self.assertEqual(self.repo.get("p1")["name"], "Amara Okafor")
+        self.assertEqual(self.repo.loads, 1)
+        rows = {row["id"]: row for row in db.list_profiles()}
+        self.assertEqual(rows["p1"]["version"], 2)
+        self.assertEqual(rows["p3"]["version"], 1)
+
+    def test_writes_from_another_repository_are_picked_up(self) -> None:
+        other = ProfileRepository(self.seed)
+        self.assertEqual(len(self.repo.profiles()), 2)
+        other.upsert({"id": "p9", "name": "Elsewhere"})
+        self.assertEqual(self.repo.get("p9")["name"], "Elsewhere")
+        self.repo.upsert({"id": "p10", "name": "Here"})
+        self.assertEqual([p["id"] for p in other.profiles()], ["p1", "p2", "p9", "p10"])
+
+    def test_json_import_export_and_legacy_file(self) -> None:
+        self.legacy.write_text(json.dumps([{"id": "l1", "name": "Legacy"}]), encoding="utf-8")
+        self.assertTrue(self.repo.import_legacy_runtime())
+        self.assertFalse(self.legacy.exists())
+        self.assertFalse(self.repo.import_legacy_runtime())
+        self.assertEqual([p["id"] for p in self.repo.profiles()], ["l1"])
+
+        out = self.root / "export.json"
+        self.assertEqual(self.repo.export_json(out), 1)
+        self.assertEqual(json.loads(out.read_text(encoding="utf-8")), [{"id": "l1", "name": "Legacy"}])
+        self.assertEqual(self.repo.import_json(self.seed, overwrite=False), 3)
+
+    def test_rejects_non_list_source(self) -> None:
+        self.seed.write_text(json.dumps({"id": "p1"}), encoding="utf-8")
+        with self.assertRaises(ValueError):
+            self.repo.profiles()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from app import db
+from app import rationale_cache
+from app.rationale_cache import RationaleCache, cached_match_rationale, cached_match_rationales, rationale_cache_key
+
+
+class RationaleCacheTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._prev = {k: os.environ.get(k) for k in ["DATABASE_URL", "ENABLE_LLM_RATIONALE", "OPENAI_API_KEY"]}
+        self._td = tempfile.TemporaryDirectory()
+        os.environ["DATABASE_URL"] = f"sqlite:///{Path(self._td.name) / 'cache.db'}"
+        db.init_db()
+
+    def tearDown(self) -> None:
+        for key, value in self._prev.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+        self._td.cleanup()
+
+    def _profiles(self):
+        a = {"id": "p1", "name": "Amara", "title": "Director", "organization": "SWF"}
+        b = {"id": "p2", "name": "Marcus", "title": "CEO", "organization": "VaultBridge"}
+        return a, b
+
+    def test_key_quantizes_scores_and_tracks_content(self) -> None:
+        a, b = self._profiles()
+        self.assertEqual(rationale_cache_key(a, b, 0.301, 0.9, 0.81), rationale_cache_key(a, b, 0.309, 0.9, 0.81))
+        self.assertNotEqual(rationale_cache_key(a, b, 0.30, 0.9, 0.81), rationale_cache_key(a, b, 0.50, 0.9, 0.81))
+        changed = dict(b, title="CTO")
+        self.assertNotEqual(rationale_cache_key(a, b, 0.3, 0.9, 0.8), rationale_cache_key(a, changed, 0.3, 0.9, 0.8))
+        enriched = dict(b, enrichment={"source_confidence": 0.9})
+        self.assertEqual(rationale_cache_key(a, b, 0.3, 0.9, 0.8), rationale_cache_key(a, enriched, 0.3, 0.9, 0.8))
+
+    def test_lru_eviction_and_counters(self) -> None:
+        cache = RationaleCache(max_entries=2, persist=False)
+        cache.put("a", "A")
+        cache.put("b", "B")
+        self.assertEqual(cache.get("a"), "A")
+        cache.put("c", "C")
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual(cache.get("c"), "C")
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 2)
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["size"], 2)
+
+    def test_persisted_entries_survive_new_process_cache(self) -> None:
+        RationaleCache().put("k1", "cached text")
+        fresh = RationaleCache()
+        self.assertEqual(fresh.get("k1"), "cached text")
+        self.assertEqual(fresh.stats()["db_hits"], 1)
+
+    def test_db_hit_is_promoted_without_rewriting_the_row(self) -> None:
+        RationaleCache().put("k1", "cached text")
+        fresh = RationaleCache()
+        with patch("app.rationale_cache.put_cached_rationale") as put:
+            self.assertEqual(fresh.get("k1"), "cached text")
+            self.assertEqual(fresh.get("k1"), "cached text")
+        put.assert_not_called()
+        self.assertEqual((fresh.stats()["hits"], fresh.stats()["db_hits"], fresh.stats()["size"]), (2, 1, 1))
+
+    def test_hits_are_touched_in_batches_so_hot_rows_survive_prune(self) -> None:
+        db.put_cached_rationale("hot", "text", "2026-01-01T00:00:00Z")
+        for idx in range(3):
+            db.put_cached_rationale(f"cold{idx}", "text", f"2026-02-0{idx + 1}T00:00:00Z")
+        cache = RationaleCache()
+        with patch.object(rationale_cache, "TOUCH_BATCH", 2), patch(
+            "app.rationale_cache.touch_cached_rationales", wraps=db.touch_cached_rationales
+        ) as touch:
+            cache.get("hot")
+            touch.assert_not_called()
+            cache.get("cold0")
+        touch.assert_called_once()
+        db.prune_rationale_cache(2)
+        self.assertEqual(db.get_cached_rationale("hot"), "text")
+        self.assertIsNone(db.get_cached_rationale("cold1"))
+
+    def test_prune_keeps_most_recently_used_rows(self) -> None:
+        for idx in range(5):
+            db.put_cached_rationale(f"k{idx}", "text", f"2026-02-18T00:00:0{idx}Z")
+        db.prune_rationale_cache(2)
+        self.assertIsNone(db.get_cached_rationale("k2"))
+        self.assertEqual(db.get_cached_rationale("k4"), "text")
+        self.assertEqual(db.get_cached_rationale("k3"), "text")
+
+    def test_llm_called_once_per_pair_bucket(self) -> None:
+        os.environ["ENABLE_LLM_RATIONALE"] = "1"
+        os.environ["OPENAI_API_KEY"] = "test-key"
+        a, b = self._profiles()
+        with patch.object(rationale_cache, "RATIONALE_CACHE", RationaleCache()), patch(
+            "app.rationale_cache._llm_rationale", return_value="LLM text"
+        ) as mock_llm:
+            self.assertEqual(cached_match_rationale(a, b, 0.31, 0.9, 0.81), "LLM text")
+            self.assertEqual(cached_match_rationale(a, b, 0.32, 0.9, 0.81), "LLM text")
+            self.assertEqual(mock_llm.call_count, 1)
+
+    def test_llm_failure_is_not_cached(self) -> None:
+        os.environ["ENABLE_LLM_RATIONALE"] = "1"
+        os.environ["OPENAI_API_KEY"] = "test-key"
+        a, b = self._profiles()
+        cache = RationaleCache()
+        with patch.object(rationale_cache, "RATIONALE_CACHE", cache), patch(
+            "app.rationale_cache._llm_rationale", return_value=None
+        ):
+            text = cached_match_rationale(a, b, 0.31, 0.9, 0.81)
+        self.assertIn("Recommended for a high-value intro", text)
+        self.assertEqual(cache.stats()["size"], 0)
+
+    def test_batch_only_sends_cache_misses(self) -> None:
+        os.environ["ENABLE_LLM_RATIONALE"] = "1"
+        os.environ["OPENAI_API_KEY"] = "test-key"
+        a, b = self._profiles()
+        items = [(a, b, 0.3, 0.9, 0.8), (b, a, 0.3, 0.9, 0.8)]
+        with patch.object(rationale_cache, "RATIONALE_CACHE", RationaleCache()), patch(
+            "app.rationale_cache._llm_rationale_batch", side_effect=lambda batch: [f"LLM {len(batch)}"] * len(batch)
+        ) as mock_batch:
+            self.assertEqual(cached_match_rationales(items), ["LLM 2", "LLM 2"])
+            self.assertEqual(cached_match_rationales(items + [(a, b, 0.6, 0.9, 0.8)]), ["LLM 2", "LLM 2", "LLM 1"])
+            self.assertEqual(mock_batch.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()